@@ -1,10 +1,23 @@
 import ast
+import hashlib
 import os
+import sys
+import time
 import fnmatch
-from typing import Dict, List, Set
-from pathlib import Path
+from collections import deque
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from backend.core.function_summaries import record, get
+from backend.core.function_summaries import is_ref, ref
+from backend.core.name_trie import DottedNameTrie
+from backend.core.parse_cache import ParseCache
+from backend.core.pattern_matcher import PatternSet
+from backend.core.timeout import NO_DEADLINE, Deadline, DeadlineExceeded
+from backend.core.tracing import NULL_TRACER
+
+# Bump whenever the emitted IR changes shape or meaning;
+# it is part of every parse-cache key.
+PARSER_VERSION = "9"
 
 # =====================================================
 # IGNORE DIRECTORIES
@@ -16,6 +29,8 @@ DEFAULT_IGNORE_DIRS = {
 
 # =====================================================
 # TAINT SOURCES
+# Defaults only; the orchestrator derives the parser's
+# sources and sinks from the loaded taint rules.
 # =====================================================
 TAINT_SOURCES = {
     "input",
@@ -48,15 +63,42 @@ TAINT_SINKS = {
     "yaml.load",
 }
 
+def taint_vocabulary(rules: List[Dict]) -> Tuple[List[str], List[str]]:
+    """
+    (sources, sinks) declared by taint rules, sorted and deduplicated.
+    """
+    sources, sinks = set(), set()
+    for rule in rules:
+        if rule.get("type") != "taint":
+            continue
+        sources.update(rule.get("sources", []))
+        sinks.update(rule.get("sinks", []))
+    return sorted(sources), sorted(sinks)
+
+
+def ir_version(
+    sources: List[str],
+    sinks: List[str],
+    patterns: Optional[PatternSet] = None,
+) -> str:
+    """
+    Parse-cache version: the IR depends on the tracked sources/sinks
+    and on the structural patterns matched during the walk.
+    """
+    h = hashlib.sha1("\n".join(sources + ["--"] + sinks).encode())
+    if patterns:
+        h.update(patterns.fingerprint.encode())
+    return f"{PARSER_VERSION}:{h.hexdigest()[:12]}"
+
 # =====================================================
 # IGNORE HELPERS
 # =====================================================
 def load_ignore_patterns(base_path: str) -> Set[str]:
     patterns = set(DEFAULT_IGNORE_DIRS)
-    ignore_file = Path(base_path) / ".turing-owlignore"
+    ignore_file = os.path.join(base_path, ".turing-owlignore")
 
-    if ignore_file.exists():
-        with ignore_file.open(encoding="utf-8") as f:
+    if os.path.exists(ignore_file):
+        with open(ignore_file, encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if line and not line.startswith("#"):
@@ -73,9 +115,39 @@ def is_ignored(rel_path: str, patterns: Set[str]) -> bool:
 class CodeParsingAgent(ast.NodeVisitor):
     """
     Python AST parser with correct taint propagation.
+
+    Files are parsed independently of each other; calls to other
+    functions are kept as summary references for the whole-program
+    summary phase (core.function_summaries), so serial and parallel
+    runs emit the same IR.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        jobs: int = 1,
+        cache: Optional[ParseCache] = None,
+        sources: Optional[List[str]] = None,
+        sinks: Optional[List[str]] = None,
+        patterns: Optional[PatternSet] = None,
+        file_timeout: Optional[float] = None,
+    ):
+        self.jobs = jobs
+        self.cache = cache
+        self.patterns = patterns if patterns else None
+        # per-file parse deadline, checked at every call and function
+        self.file_timeout = file_timeout
+        self.deadline = NO_DEADLINE
+
+        self.sources = sorted(TAINT_SOURCES) if sources is None else list(sources)
+        self.sinks = sorted(TAINT_SINKS) if sinks is None else list(sinks)
+        self.source_index = DottedNameTrie(self.sources)
+        self.sink_index = DottedNameTrie(self.sinks, reverse=True)
+        self.cache_stats = {"hits": 0, "misses": 0, "bytesWritten": 0}
+        self.taint_stats = {"hits": 0, "misses": 0}
+        # {file, stage, reason} for files given up on
+        self.skipped: List[Dict] = []
+        # set per scan by the orchestrator
+        self.tracer = NULL_TRACER
         self.reset()
 
     # ----------------------
@@ -84,6 +156,9 @@ class CodeParsingAgent(ast.NodeVisitor):
     def reset(self):
         self.current_file = ""
         self.current_function = None
+        # def line of current_function: same-named functions (methods of
+        # different classes, nested or redefined functions) differ in it
+        self.current_function_line = None
 
         self.functions: List[Dict] = []
         self.calls: List[Dict] = []
@@ -92,23 +167,134 @@ class CodeParsingAgent(ast.NodeVisitor):
 
         self.taint_env: Dict[str, Set[str]] = {}
         self.taint_flows: List[Dict] = []
+        self.pending_flows: List[Dict] = []
+        self.summaries: Dict[str, Set[str]] = {}
+
+        # expression node -> taints; only valid while its tree is alive
+        self.taint_cache: Dict[ast.AST, Set[str]] = {}
+
+        self.ancestors: List[ast.AST] = []
+        self.pattern_matches: List[Dict] = []
 
     # ----------------------
     # ENTRY
     # ----------------------
     def parse(self, target_path: str) -> List[Dict]:
-        results = []
+        return self.parse_paths(self.discover(target_path))
+
+    def parse_paths(self, paths: List[str], deadline: Deadline = NO_DEADLINE) -> List[Dict]:
+        return list(self.iter_paths(paths, deadline))
+
+    def iter_paths(self, paths: List[str], deadline: Deadline = NO_DEADLINE) -> Iterator[Dict]:
+        """
+        Yield each file's IR, in path order, as soon as it is parsed.
+        Pending flows are resolved later by the summary phase.
+
+        Once `deadline` expires no new files are started; they are
+        recorded in `skipped` instead.
+        """
+        self.cache_stats = {"hits": 0, "misses": 0, "bytesWritten": 0}
+        self.taint_stats = {"hits": 0, "misses": 0}
+        self.skipped = []
+
+        if self.jobs > 1 and len(paths) > 1:
+            parsed = self._iter_pool(paths, deadline)
+        elif self.tracer.enabled:
+            parsed = self._iter_traced(paths, deadline)
+        else:
+            parsed = self._iter_serial(paths, deadline)
+
+        for ir in parsed:
+            if ir is not None:
+                yield ir
+
+        if self.cache:
+            self.cache.evict(self.cache_stats["bytesWritten"])
+
+    def _iter_serial(self, paths: List[str], deadline: Deadline) -> Iterator[Optional[Dict]]:
+        for n, path in enumerate(paths):
+            if deadline.expired():
+                self._skip(paths[n:], "parse", deadline.reason)
+                return
+            yield self.parse_file(path)
+
+    def _iter_traced(self, paths: List[str], deadline: Deadline) -> Iterator[Optional[Dict]]:
+        for n, path in enumerate(paths):
+            if deadline.expired():
+                self._skip(paths[n:], "parse", deadline.reason)
+                return
+            with self.tracer.span("parse", file=path):
+                ir = self.parse_file(path)
+            yield ir
+
+    def _skip(self, paths: List[str], stage: str, reason: str):
+        self.skipped.extend(
+            {"file": p, "stage": stage, "reason": reason} for p in paths
+        )
+
+    def _iter_pool(self, paths: List[str], deadline: Deadline) -> Iterator[Optional[Dict]]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Only a few chunks are in flight at once, so a slow consumer
+        # never makes the pool buffer the whole repository.
+        size = max(1, min(64, len(paths) // (self.jobs * 8)))
+        chunks = iter([paths[i:i + size] for i in range(0, len(paths), size)])
+
+        worker = partial(
+            _parse_chunk,
+            cache=self.cache,
+            sources=self.sources,
+            sinks=self.sinks,
+            patterns=self.patterns,
+            file_timeout=self.file_timeout,
+            trace=self.tracer.enabled,
+        )
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            inflight = deque(
+                pool.submit(worker, c)
+                for _, c in zip(range(self.jobs * 2), chunks)
+            )
+            while inflight:
+                results, cache_stats, taint_stats, skipped, spans = inflight.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    if deadline.expired():
+                        # chunks in flight finish; the rest are skipped
+                        self._skip(chunk, "parse", deadline.reason)
+                        for rest in chunks:
+                            self._skip(rest, "parse", deadline.reason)
+                    else:
+                        inflight.append(pool.submit(worker, chunk))
+
+                for k, v in cache_stats.items():
+                    self.cache_stats[k] += v
+                for k, v in taint_stats.items():
+                    self.taint_stats[k] += v
+                self.skipped.extend(skipped)
+                for path, start, duration, pid in spans:
+                    self.tracer.add("parse", "file", start, duration, pid=pid, tid=0,
+                                    args={"file": path})
+                yield from results
+
+    def discover(self, target_path: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Python files under target_path, in deterministic walk order.
+        With `limit`, the walk stops after limit + 1 files, so a caller
+        can tell the budget was exceeded without walking the rest.
+        """
+        paths = []
         base = os.path.abspath(target_path)
         ignores = load_ignore_patterns(base)
 
         for root, dirs, files in os.walk(base):
             rel_root = os.path.relpath(root, base)
-            dirs[:] = [
+            dirs[:] = sorted(
                 d for d in dirs
                 if not is_ignored(os.path.join(rel_root, d), ignores)
-            ]
+            )
 
-            for file in files:
+            for file in sorted(files):
                 if not file.endswith(".py"):
                     continue
 
@@ -116,28 +302,94 @@ class CodeParsingAgent(ast.NodeVisitor):
                 if is_ignored(rel_file, ignores):
                     continue
 
-                self.reset()
-                self.current_file = os.path.join(root, file)
-
-                try:
-                    with open(self.current_file, encoding="utf-8") as f:
-                        tree = ast.parse(f.read())
-                    self.visit(tree)
-                except Exception:
-                    continue
+                paths.append(os.path.join(root, file))
+                if limit is not None and len(paths) > limit:
+                    return paths
 
-                results.append(self._emit())
+        return paths
 
-        return results
+    def parse_file(self, path: str) -> Optional[Dict]:
+        """
+        IR of one file; None when it cannot be read or parsed, or runs
+        past file_timeout (then also recorded in `skipped`).
+        """
+        self.reset()
+        self.current_file = path
+
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError:
+            return None
+
+        key = None
+        if self.cache:
+            key = self.cache.key(source)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_stats["hits"] += 1
+                cached["filePath"] = path
+                return cached
+            self.cache_stats["misses"] += 1
+
+        if self.file_timeout is not None:
+            self.deadline = Deadline(self.file_timeout, f"parsing exceeded {self.file_timeout}s")
+
+        try:
+            tree = ast.parse(source.decode("utf-8"))
+            self.deadline.check()
+            self.visit(tree)
+        except DeadlineExceeded as e:
+            self._skip([path], "parse", str(e))
+            return None
+        except Exception:
+            return None
+        finally:
+            self.taint_cache.clear()
+            self.deadline = NO_DEADLINE
+
+        result = self._emit()
+        if key:
+            self.cache_stats["bytesWritten"] += self.cache.put(key, result)
+        return result
 
     # ----------------------
     # VISITORS
     # ----------------------
+    def visit(self, node):
+        # same dispatch as NodeVisitor.visit, without the extra frame
+        # on nodes no pattern cares about
+        if self.patterns is not None and type(node) in self.patterns.hooked:
+            return self._visit_hooked(node)
+        return getattr(self, "visit_" + node.__class__.__name__, self.generic_visit)(node)
+
+    def _visit_hooked(self, node):
+        # only pattern-inside node types are kept as ancestors
+        tracked = type(node) in self.patterns.inside_types
+        if tracked:
+            self.ancestors.append(node)
+
+        try:
+            for rule_id, bindings in self.patterns.match(node, self.ancestors):
+                self.pattern_matches.append({
+                    "rule": rule_id,
+                    "line": node.lineno,
+                    "function": self.current_function,
+                    "bindings": bindings,
+                })
+            return getattr(self, "visit_" + node.__class__.__name__, self.generic_visit)(node)
+        finally:
+            if tracked:
+                self.ancestors.pop()
+
     def visit_FunctionDef(self, node):
+        self.deadline.check()
         prev_fn = self.current_function
+        prev_line = self.current_function_line
         prev_env = self.taint_env.copy()
 
         self.current_function = node.name
+        self.current_function_line = node.lineno
         self.taint_env = {arg.arg: set() for arg in node.args.args}
 
         self.functions.append({
@@ -148,6 +400,7 @@ class CodeParsingAgent(ast.NodeVisitor):
         self.generic_visit(node)
 
         self.current_function = prev_fn
+        self.current_function_line = prev_line
         self.taint_env = prev_env
 
     def visit_Return(self, node):
@@ -156,7 +409,7 @@ class CodeParsingAgent(ast.NodeVisitor):
 
         taints = self._expr_taint(node.value)
         if taints:
-            record(self.current_function, taints)
+            self.summaries.setdefault(self.current_function, set()).update(taints)
 
     def visit_Assign(self, node):
         taints = self._expr_taint(node.value)
@@ -165,26 +418,55 @@ class CodeParsingAgent(ast.NodeVisitor):
             if isinstance(target, ast.Name):
                 self.taint_env[target.id] = taints.copy()
 
+            if isinstance(target, (ast.Name, ast.Attribute)):
+                value_kind, value = self._arg_record(node.value)
+                self.assignments.append({
+                    "target": _intern(self._resolve_callee(target)),
+                    "valueKind": value_kind,
+                    "value": value,
+                    "line": node.lineno,
+                    "function": self.current_function,
+                    "functionLine": self.current_function_line,
+                })
+
         self.generic_visit(node)
 
     def visit_Call(self, node):
+        self.deadline.check()
         callee = self._resolve_callee(node.func)
         arg_taints = [self._expr_taint(arg) for arg in node.args]
 
         self.calls.append({
-            "callee": callee,
+            "callee": _intern(callee),
             "line": node.lineno,
             "function": self.current_function,
-            "args": [ast.dump(a) for a in node.args],
+            "functionLine": self.current_function_line,
+            "args": [self._arg_record(a) for a in node.args],
+            "keywords": [
+                (_intern(kw.arg),) + self._arg_record(kw.value)
+                for kw in node.keywords
+            ],
         })
 
         # ---------- TAINT → SINK ----------
-        if self._is_sink(callee):
+        sink = self.sink_index.match(callee)
+        if sink:
             for taints in arg_taints:
-                for src in taints:
+                for src in sorted(taints):
+                    if is_ref(src):
+                        self.pending_flows.append({
+                            "ref": src[1:],
+                            "sink": sink,
+                            "callee": callee,
+                            "line": node.lineno,
+                            "function": self.current_function,
+                        })
+                        continue
+
                     self.taint_flows.append({
                         "source": src,
-                        "sink": callee,
+                        "sink": sink,
+                        "callee": callee,
                         "line": node.lineno,
                         "function": self.current_function,
                         "path": [src, callee],
@@ -204,37 +486,55 @@ class CodeParsingAgent(ast.NodeVisitor):
     # ----------------------
     # TAINT ENGINE
     # ----------------------
+    # Compound expressions whose taint is memoized. visit_Call evaluates
+    # every argument and generic_visit then reaches the nested calls,
+    # which would otherwise re-walk the same subtrees.
+    MEMO_NODES = (
+        ast.Subscript, ast.Attribute, ast.Call,
+        ast.BinOp, ast.JoinedStr, ast.FormattedValue,
+    )
+
     def _expr_taint(self, node) -> Set[str]:
         # variable
         if isinstance(node, ast.Name):
             return self.taint_env.get(node.id, set())
 
+        if not isinstance(node, self.MEMO_NODES):
+            return set()
+
+        cached = self.taint_cache.get(node)
+        if cached is not None:
+            self.taint_stats["hits"] += 1
+            return cached
+
+        self.taint_stats["misses"] += 1
+        taints = self._compute_taint(node)
+        self.taint_cache[node] = taints
+        return taints
+
+    def _compute_taint(self, node) -> Set[str]:
+        # Results may be shared through taint_cache: never mutate them.
+
         # sys.argv[1]
         if isinstance(node, ast.Subscript):
             return self._expr_taint(node.value)
 
         # request.args / request.form / etc
         if isinstance(node, ast.Attribute):
-            name = self._resolve_callee(node)
-            for src in TAINT_SOURCES:
-                if name.startswith(src):
-                    return {src}
-            return set()
+            src = self.source_index.match(self._resolve_callee(node))
+            return {src} if src else set()
 
         # function calls
         if isinstance(node, ast.Call):
             callee = self._resolve_callee(node.func)
 
-            # direct source
-            if callee in TAINT_SOURCES:
-                return {callee}
-
-            taints = set()
+            # direct source: input(), request.args.get(...)
+            src = self.source_index.match(callee)
+            if src:
+                return {src}
 
-            # interprocedural summary
-            summary = get(callee)
-            if summary:
-                taints |= summary
+            # interprocedural summary, resolved after all files are parsed
+            taints = {ref(callee)}
 
             for arg in node.args:
                 taints |= self._expr_taint(arg)
@@ -266,19 +566,37 @@ class CodeParsingAgent(ast.NodeVisitor):
             return func.id
         return "unknown"
 
-    def _is_sink(self, callee: str) -> bool:
-        # Explicitly ignore SQL cursor execution
-        if callee.endswith(".execute") or callee.endswith(".executemany"):
-            return False
+    def _arg_record(self, node) -> Tuple[str, object]:
+        """
+        Compact (kind, value) description of a call argument:
+          const   - literal value (bytes as repr)
+          name    - variable name
+          attr    - dotted attribute path
+          call    - callee of a nested call
+          starred - *args / **kwargs target
+          other   - AST node type
+        """
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, str):
+                return ("const", _intern(value))
+            if value is None or isinstance(value, (bool, int, float)):
+                return ("const", value)
+            return ("const", repr(value))
+
+        if isinstance(node, ast.Name):
+            return ("name", _intern(node.id))
+
+        if isinstance(node, ast.Attribute):
+            return ("attr", _intern(self._resolve_callee(node)))
 
-        if callee in TAINT_SINKS:
-            return True
+        if isinstance(node, ast.Call):
+            return ("call", _intern(self._resolve_callee(node.func)))
 
-        for s in TAINT_SINKS:
-            if callee.endswith("." + s):
-                return True
+        if isinstance(node, ast.Starred):
+            return ("starred", self._arg_record(node.value)[1])
 
-        return False
+        return ("other", type(node).__name__)
 
     # ----------------------
     # OUTPUT
@@ -291,5 +609,58 @@ class CodeParsingAgent(ast.NodeVisitor):
             "calls": self.calls,
             "assignments": self.assignments,
             "literals": self.literals,
-            "taint": {"flows": self.taint_flows},
+            "taint": {
+                "flows": self.taint_flows,
+                "pending": self.pending_flows,
+            },
+            "summaries": {
+                name: sorted(taints)
+                for name, taints in self.summaries.items()
+            },
+            "matches": self.pattern_matches,
         }
+
+
+# =====================================================
+# INTERNING
+# =====================================================
+MAX_INTERN_LENGTH = 128
+
+
+def _intern(value):
+    """
+    Share repeated identifiers and short literals across the scan.
+    """
+    if isinstance(value, str) and len(value) <= MAX_INTERN_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+# =====================================================
+# PROCESS POOL WORKER
+# =====================================================
+def _parse_chunk(
+    paths: List[str],
+    cache: Optional[ParseCache] = None,
+    sources: Optional[List[str]] = None,
+    sinks: Optional[List[str]] = None,
+    patterns: Optional[PatternSet] = None,
+    file_timeout: Optional[float] = None,
+    trace: bool = False,
+) -> Tuple[List[Optional[Dict]], Dict[str, int], Dict[str, int], List[Dict], List[Tuple]]:
+    agent = CodeParsingAgent(
+        cache=cache, sources=sources, sinks=sinks, patterns=patterns,
+        file_timeout=file_timeout,
+    )
+    if not trace:
+        results = [agent.parse_file(p) for p in paths]
+        return results, agent.cache_stats, agent.taint_stats, agent.skipped, []
+
+    # (path, start ns, duration ns, pid), replayed into the parent's tracer
+    results, spans = [], []
+    pid = os.getpid()
+    for path in paths:
+        start = time.perf_counter_ns()
+        results.append(agent.parse_file(path))
+        spans.append((path, start, time.perf_counter_ns() - start, pid))
+    return results, agent.cache_stats, agent.taint_stats, agent.skipped, spans
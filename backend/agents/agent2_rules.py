@@ -1,4 +1,8 @@
-from typing import Dict, List
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from backend.core.rule_profile import RuleProfile
+from backend.core.timeout import NO_DEADLINE, Deadline
 
 MIN_CONFIDENCE = 0.75
 
@@ -11,6 +15,33 @@ class RuleEngineAgent:
 
     def __init__(self, rules: List[Dict]):
         self.rules = rules
+        self.index = self._compile(rules)
+        # set per scan by the orchestrator with --rule-profile
+        self.profile: Optional[RuleProfile] = None
+
+    # ======================
+    # COMPILE
+    # ======================
+    def _compile(
+        self, rules: List[Dict]
+    ) -> Dict[Tuple[str, str], List[Tuple[Dict, FrozenSet[str]]]]:
+        """
+        (source, sink) -> [(rule, sanitizers)], in rule order, so each
+        flow only visits the rules that can match it.
+        """
+        index: Dict[Tuple[str, str], List[Tuple[Dict, FrozenSet[str]]]] = {}
+
+        for rule in rules:
+            sanitizers = frozenset(rule.get("sanitizers", []))
+            pairs = {
+                (src, sink)
+                for src in rule.get("sources", [])
+                for sink in rule.get("sinks", [])
+            }
+            for pair in sorted(pairs):
+                index.setdefault(pair, []).append((rule, sanitizers))
+
+        return index
 
     # ======================
     # ANALYZE
@@ -19,40 +50,51 @@ class RuleEngineAgent:
         findings: List[Dict] = []
 
         for file in parsed_files:
-            flows = file.get("taint", {}).get("flows", [])
-            if not flows:
-                continue
+            findings.extend(self.analyze_file(file))
+
+        return findings
 
-            for rule in self.rules:
-                for flow in flows:
-                    if not self._match(rule, flow):
-                        continue
+    def analyze_file(self, file: Dict, deadline: Deadline = NO_DEADLINE) -> List[Dict]:
+        findings: List[Dict] = []
+
+        flows = file.get("taint", {}).get("flows", [])
+        if not flows:
+            return findings
 
-                    confidence = self._confidence(rule, flow)
-                    if confidence < MIN_CONFIDENCE:
-                        continue
+        profile = self.profile
+        for flow in flows:
+            deadline.check()
+            candidates = self.index.get((flow["source"], flow["sink"]))
+            if not candidates:
+                continue
 
-                    findings.append(
-                        self._emit(rule, file, flow, confidence)
+            for rule, sanitizers in candidates:
+                if profile is None:
+                    finding = self._evaluate(rule, sanitizers, file, flow)
+                else:
+                    start = time.perf_counter_ns()
+                    finding = self._evaluate(rule, sanitizers, file, flow)
+                    profile.record(
+                        rule["id"], "taint", time.perf_counter_ns() - start,
+                        matches=finding is not None,
                     )
 
-        return findings
+                if finding is not None:
+                    findings.append(finding)
 
-    # ======================
-    # MATCHING
-    # ======================
-    def _match(self, rule: Dict, flow: Dict) -> bool:
-        if flow["source"] not in rule.get("sources", []):
-            return False
+        return findings
 
-        if flow["sink"] not in rule.get("sinks", []):
-            return False
+    def _evaluate(
+        self, rule: Dict, sanitizers: FrozenSet[str], file: Dict, flow: Dict
+    ) -> Optional[Dict]:
+        if sanitizers and not sanitizers.isdisjoint(flow.get("path", [])):
+            return None
 
-        sanitizers = rule.get("sanitizers", [])
-        if sanitizers and any(s in flow.get("path", []) for s in sanitizers):
-            return False
+        confidence = self._confidence(rule, flow)
+        if confidence < MIN_CONFIDENCE:
+            return None
 
-        return True
+        return self._emit(rule, file, flow, confidence)
 
     # ======================
     # CONFIDENCE
@@ -1,17 +1,68 @@
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional
+import hashlib
+import json
 import math
 import re
+import time
+
+from backend.core.entropy import batch_entropy, entropy_floor
+from backend.core.literal_cache import Classification, LiteralCache
+from backend.core.rule_profile import RuleProfile
+from backend.core.timeout import NO_DEADLINE, Deadline
+
+NOT_SENSITIVE: Classification = (False, frozenset())
+
+
+def fuse_patterns(regexes: List[re.Pattern]) -> re.Pattern:
+    """
+    One alternation of all regexes. A leading (?i) is spelled out as
+    [aA]-style classes: a global IGNORECASE would cover every
+    alternative, and `re` is much slower with it than with classes.
+    """
+    def case_insensitive(pattern: str) -> str:
+        out = []
+        escaped = in_class = False
+        for ch in pattern:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == "[":
+                in_class = True
+            elif ch == "]":
+                in_class = False
+            elif ch.isalpha() and not in_class:
+                ch = f"[{ch.lower()}{ch.upper()}]"
+            out.append(ch)
+        return "".join(out)
+
+    return re.compile("|".join(
+        f"(?:{case_insensitive(r.pattern[4:]) if r.pattern.startswith('(?i)') else r.pattern})"
+        for r in regexes
+    ))
 
 
 class SemanticRuleEngine:
     """
     Semgrep-grade semantic (non-taint) rule engine.
     Handles secrets, config issues, crypto misuse, framework patterns.
+
+    Only rules using its heuristics (HEURISTIC_KEYS) are handled here;
+    a rule checks functions, calls or literals only when it sets the
+    keys for that target. Literal classification does not depend on the
+    rule and is memoized across files in a LiteralCache.
     """
 
     ENTROPY_THRESHOLD = 3.2
     MIN_CONFIDENCE = 0.7
 
+    HEURISTIC_KEYS = (
+        "function_name_contains",
+        "call_name_contains",
+        "string_contains",
+        "min_string_length",
+    )
+
     SECRET_REGEXES = [
         re.compile(r"AKIA[0-9A-Z]{16}"),               # AWS
         re.compile(r"sk_live_[0-9a-zA-Z]{10,}"),       # Stripe
@@ -22,38 +73,100 @@ class SemanticRuleEngine:
         re.compile(r"(?i)token"),
     ]
 
-    def __init__(self, rules: List[Dict]):
-        self.rules = [r for r in rules if r.get("type") == "semantic"]
+    # all detectors in one scan
+    SECRET_PATTERN = fuse_patterns(SECRET_REGEXES)
+
+    # n distinct characters carry at most log2(n) bits each, so shorter
+    # or less varied strings can never reach the entropy threshold
+    MIN_ENTROPY_CHARS = math.ceil(2 ** ENTROPY_THRESHOLD)
+
+    def __init__(self, rules: List[Dict], literal_cache: Optional[LiteralCache] = None):
+        self.rules = [
+            r for r in rules
+            if r.get("type") == "semantic"
+            and any(k in r for k in self.HEURISTIC_KEYS)
+        ]
+        self.literal_rules = [
+            r for r in self.rules
+            if "string_contains" in r or "min_string_length" in r
+        ]
+        self.literal_cache = literal_cache if literal_cache is not None else LiteralCache()
+        # set per scan by the orchestrator with --rule-profile
+        self.profile: Optional[RuleProfile] = None
+
+        # literals shorter than every rule's minimum are never reported
+        self.min_string_length = min(
+            (r.get("min_string_length", 6) for r in self.literal_rules), default=6
+        )
+        # keyword hits are part of the cached classification
+        self.keywords = sorted({
+            k for r in self.literal_rules for k in self._lower(r.get("string_contains", []))
+        })
+
+    @property
+    def classifier_version(self) -> str:
+        """
+        Changes whenever a cached classification could change.
+        """
+        h = hashlib.sha1(json.dumps([
+            self.SECRET_PATTERN.pattern, self.ENTROPY_THRESHOLD, self.keywords,
+        ]).encode())
+        return h.hexdigest()[:12]
 
     # ======================
     # ENTRY
     # ======================
     def analyze(self, parsed_files: List[Dict]) -> List[Dict]:
         findings = []
-        seen = set()
 
         for file in parsed_files:
-            for rule in self.rules:
-                for f in self._apply(rule, file):
-                    key = (
-                        f["rule_id"],
-                        f["file"],
-                        f["line"],
-                        f.get("function"),
-                    )
-                    if key in seen:
-                        continue
-                    seen.add(key)
-
-                    if f["confidence"] >= self.MIN_CONFIDENCE:
-                        findings.append(f)
+            findings.extend(self.analyze_file(file))
+
+        return findings
+
+    def analyze_file(self, file: Dict, deadline: Deadline = NO_DEADLINE) -> List[Dict]:
+        findings = []
+        seen = set()
+
+        classified = self._classify_literals(file) if self.literal_rules else None
+        for rule in self.rules:
+            deadline.check()
+            if self.profile is None:
+                results = self._apply(rule, file, classified)
+            else:
+                start = time.perf_counter_ns()
+                results = self._apply(rule, file, classified)
+                self.profile.record(
+                    rule["id"], "secrets", time.perf_counter_ns() - start,
+                    matches=len(results),
+                )
+
+            for f in results:
+                key = (
+                    f["rule_id"],
+                    f["file"],
+                    f["line"],
+                    f.get("function"),
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                if f["confidence"] >= self.MIN_CONFIDENCE:
+                    findings.append(f)
 
         return findings
 
     # ======================
     # APPLY
     # ======================
-    def _apply(self, rule: Dict, file: Dict) -> List[Dict]:
+    def _apply(
+        self, rule: Dict, file: Dict, classified: Optional[List] = None
+    ) -> List[Dict]:
+        """
+        `classified` is the per-file _classify_literals result; rules
+        only add their own length and keyword filters on top of it.
+        """
         results = []
 
         fn_keywords = self._lower(rule.get("function_name_contains", []))
@@ -61,9 +174,9 @@ class SemanticRuleEngine:
         min_len = rule.get("min_string_length", 6)
 
         # ---------- FUNCTIONS ----------
-        for fn in file.get("functions", []):
+        for fn in file.get("functions", []) if fn_keywords else ():
             name = fn["name"].lower()
-            if fn_keywords and not self._contains(name, fn_keywords):
+            if not self._contains(name, fn_keywords):
                 continue
 
             results.append(
@@ -71,9 +184,9 @@ class SemanticRuleEngine:
             )
 
         # ---------- CALLS ----------
-        for call in file.get("calls", []):
+        for call in file.get("calls", []) if call_keywords else ():
             callee = (call.get("callee") or "").lower()
-            if call_keywords and not self._contains(callee, call_keywords):
+            if not self._contains(callee, call_keywords):
                 continue
 
             results.append(
@@ -81,13 +194,22 @@ class SemanticRuleEngine:
             )
 
         # ---------- STRING LITERALS ----------
-        for lit in file.get("literals", []):
-            value = lit["value"]
+        if "string_contains" not in rule and "min_string_length" not in rule:
+            return results
+
+        literals = file.get("literals", [])
+        if classified is None:
+            classified = self._classify_literals(file)
+        keywords = set(self._lower(rule.get("string_contains", [])))
+
+        for lit, (sensitive, hits) in zip(literals, classified):
+            if not sensitive:
+                continue
 
-            if len(value) < min_len:
+            if len(lit["value"]) < min_len:
                 continue
 
-            if not self._looks_sensitive(value, rule):
+            if keywords and keywords.isdisjoint(hits):
                 continue
 
             results.append(
@@ -99,38 +221,79 @@ class SemanticRuleEngine:
     # ======================
     # HEURISTICS
     # ======================
-    def _looks_sensitive(self, value: str, rule: Dict) -> bool:
-        value_l = value.lower()
+    def _classify_literals(self, file: Dict) -> List[Classification]:
+        """
+        (looks sensitive, keyword hits) for every literal of a file.
 
-        # keyword hint
-        keywords = self._lower(rule.get("string_contains", []))
-        if keywords and not self._contains(value_l, keywords):
-            return False
+        Each distinct value long enough for some rule is looked up once
+        in the literal cache. The rest pass one fused regex scan, then
+        entropy for those varied enough to reach the threshold, computed
+        in one batch.
+        """
+        literals = file.get("literals", [])
+        classified: List[Classification] = [NOT_SENSITIVE] * len(literals)
 
-        # regex match (Semgrep-style)
-        for r in self.SECRET_REGEXES:
-            if r.search(value):
-                return True
+        # distinct values -> indexes of the literals holding them
+        positions: Dict[str, List[int]] = {}
+        min_length = self.min_string_length
+        for i, lit in enumerate(literals):
+            value = lit["value"]
+            if len(value) < min_length:
+                continue
+            at = positions.get(value)
+            if at is None:
+                positions[value] = [i]
+            else:
+                at.append(i)
+        if not positions:
+            return classified
 
-        # entropy fallback
-        return self._entropy(value) >= self.ENTROPY_THRESHOLD
+        results: Dict[str, Classification] = {}
+        candidates: List[str] = []
+        search = self.SECRET_PATTERN.search
+        keywords = self.keywords
+        min_chars = self.MIN_ENTROPY_CHARS
+        # margin: the floor and shannon_entropy round differently
+        floor_threshold = self.ENTROPY_THRESHOLD + 1e-9
+        no_hits: FrozenSet[str] = frozenset()
 
-    # ======================
-    # HELPERS
-    # ======================
-    def _entropy(self, s: str) -> float:
-        freq = {}
-        for c in s:
-            freq[c] = freq.get(c, 0) + 1
+        for value, cached in zip(positions, self.literal_cache.get_many(positions)):
+            if cached is not None:
+                for i in positions[value]:
+                    classified[i] = cached
+                continue
+
+            if search(value):
+                results[value] = (True, no_hits)
+                continue
+
+            distinct = len(set(value)) if len(value) >= min_chars else 0
+            if distinct < min_chars:
+                results[value] = NOT_SENSITIVE
+            elif entropy_floor(len(value), distinct) > floor_threshold:
+                # varied enough that no character counts can fall short
+                results[value] = (True, no_hits)
+            else:
+                candidates.append(value)
 
-        entropy = 0.0
-        length = len(s)
-        for c in freq:
-            p = freq[c] / length
-            entropy -= p * math.log2(p)
+        for value, entropy in zip(candidates, batch_entropy(candidates)):
+            results[value] = (True, no_hits) if entropy >= self.ENTROPY_THRESHOLD else NOT_SENSITIVE
 
-        return entropy
+        if keywords:
+            for value, (sensitive, _) in results.items():
+                lowered = value.lower()
+                results[value] = (sensitive, frozenset(k for k in keywords if k in lowered))
 
+        self.literal_cache.put_many(results)
+        for value, result in results.items():
+            for i in positions[value]:
+                classified[i] = result
+
+        return classified
+
+    # ======================
+    # HELPERS
+    # ======================
     def _contains(self, text: str, keywords: List[str]) -> bool:
         return any(k in text for k in keywords)
 
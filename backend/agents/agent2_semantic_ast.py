@@ -1,47 +1,198 @@
-from typing import Dict, List
-from backend.core.ast_matcher import match_call
+import time
+from typing import Dict, List, Optional, Set
+from backend.core.aho_corasick import AhoCorasick
+from backend.core.ast_matcher import arg_texts, match_arg_value, match_keyword
+from backend.core.rule_profile import RuleProfile
+from backend.core.timeout import NO_DEADLINE, Deadline
 
 class SemanticASTEngine:
     """
     Semgrep-style semantic AST engine with deduplication.
+
+    `match:` rules are compiled once into an exact-callee index and two
+    substring automata (callee / argument text), so every call is
+    matched against the whole rule set in a single pass.
+
+    `pattern` / `pattern-either` / `pattern-inside` rules need the AST,
+    so the parser matches them during its walk (core.pattern_matcher);
+    this engine turns the recorded matches into findings.
     """
 
     def __init__(self, rules: List[Dict]):
         self.rules = rules
+        self.rules_by_id = {r["id"]: r for r in rules}
+        self._compile(rules)
+        # set per scan by the orchestrator with --rule-profile
+        self.profile: Optional[RuleProfile] = None
+
+    # ======================
+    # COMPILE
+    # ======================
+    def _compile(self, rules: List[Dict]):
+        self.by_callee: Dict[str, List[int]] = {}
+        self.unanchored: List[int] = []       # no callee predicate at all
+
+        callee_needles: List[str] = []
+        self.callee_needle_rules: List[int] = []
+
+        arg_needles: Dict[str, int] = {}
+        self.arg_predicates: Dict[int, List[Set[int]]] = {}
+
+        for i, rule in enumerate(rules):
+            pattern = rule.get("match") or {}
+            if not pattern:
+                continue
+
+            if "callee" in pattern:
+                callees = pattern["callee"]
+                if isinstance(callees, str):
+                    callees = [callees]
+                for callee in callees:
+                    self.by_callee.setdefault(callee, []).append(i)
+            elif "callee_contains" in pattern:
+                callee_needles.append(pattern["callee_contains"])
+                self.callee_needle_rules.append(i)
+            else:
+                self.unanchored.append(i)
+
+            # every set must hit at least one of its needle ids
+            predicates = []
+            if "arg_contains" in pattern:
+                predicates.append([pattern["arg_contains"]])
+            if "any_arg_contains" in pattern:
+                predicates.append(list(pattern["any_arg_contains"]))
+            if predicates:
+                self.arg_predicates[i] = [
+                    {arg_needles.setdefault(n, len(arg_needles)) for n in needles}
+                    for needles in predicates
+                ]
 
+        self.callee_automaton = AhoCorasick(callee_needles)
+        self.arg_automaton = AhoCorasick(list(arg_needles))
+
+    # ======================
+    # ANALYZE
+    # ======================
     def analyze(self, parsed_files: List[Dict]) -> List[Dict]:
         findings = []
-        seen = set()
 
         for file in parsed_files:
-            calls = file.get("calls", [])
-            for rule in self.rules:
-                for call in calls:
-                    if not match_call(call, rule.get("match", {})):
-                        continue
-
-                    key = (
-                        rule["id"],
-                        file["filePath"],
-                        call["line"],
-                        call.get("function"),
-                    )
-                    if key in seen:
-                        continue
-
-                    seen.add(key)
-                    findings.append({
-                        "rule_id": rule["id"],
-                        "title": rule["title"],
-                        "severity": rule["severity"],
-                        "cwe": rule.get("cwe"),
-                        "category": rule.get("category"),
-                        "file": file["filePath"],
-                        "line": call["line"],
-                        "function": call.get("function"),
-                        "description": rule["description"],
-                        "confidence": round(rule["confidence"] - 0.05, 2),
-                        "remediation": rule.get("remediation"),
-                    })
+            findings.extend(self.analyze_file(file))
 
         return findings
+
+    def analyze_file(self, file: Dict, deadline: Deadline = NO_DEADLINE) -> List[Dict]:
+        findings = []
+        seen = set()
+
+        hits = []
+        for call in file.get("calls", []):
+            deadline.check()
+            hits.extend(
+                (self.rules[i], call["line"], call.get("function"))
+                for i in self._match(call)
+            )
+        pattern_hits = [
+            (self.rules_by_id[m["rule"]], m["line"], m.get("function"))
+            for m in file.get("matches", [])
+            if m["rule"] in self.rules_by_id
+        ]
+        if self.profile is not None:
+            # evaluated (and timed) in the parser's walk
+            for rule, _, _ in pattern_hits:
+                self.profile.record(rule["id"], "pattern", matches=1, evaluations=0)
+        hits.extend(pattern_hits)
+
+        for rule, line, function in hits:
+            # findings are per file, so the file is implied in the key
+            key = (rule["id"], line, function)
+            if key in seen:
+                continue
+
+            seen.add(key)
+            findings.append({
+                "rule_id": rule["id"],
+                "title": rule["title"],
+                "severity": rule["severity"],
+                "cwe": rule.get("cwe"),
+                "category": rule.get("category"),
+                "file": file["filePath"],
+                "line": line,
+                "function": function,
+                "description": rule["description"],
+                "confidence": round(rule["confidence"] - 0.05, 2),
+                "remediation": rule.get("remediation"),
+            })
+
+        return findings
+
+    # ======================
+    # MATCHING
+    # ======================
+    def _match(self, call: Dict) -> List[int]:
+        """
+        Indexes of all rules matching this call, in rule order.
+        """
+        callee = call.get("callee", "")
+
+        candidates = list(self.by_callee.get(callee, ()))
+        if self.callee_needle_rules:
+            candidates.extend(
+                self.callee_needle_rules[n]
+                for n in self.callee_automaton.find(callee)
+            )
+        candidates.extend(self.unanchored)
+        if not candidates:
+            return []
+
+        # argument needle hits, computed once per call on first need
+        found: List[Optional[Set[int]]] = [None]
+        profile = self.profile
+        if profile is None:
+            return [
+                i for i in sorted(set(candidates))
+                if self._check(i, call, callee, found)
+            ]
+
+        matched = []
+        for i in sorted(set(candidates)):
+            start = time.perf_counter_ns()
+            ok = self._check(i, call, callee, found)
+            profile.record(
+                self.rules[i]["id"], "semantic", time.perf_counter_ns() - start,
+                matches=ok,
+            )
+            if ok:
+                matched.append(i)
+        return matched
+
+    def _check(
+        self, i: int, call: Dict, callee: str, found: List[Optional[Set[int]]]
+    ) -> bool:
+        pattern = self.rules[i]["match"]
+
+        # callee_contains alongside an exact callee is not indexed
+        if "callee" in pattern and "callee_contains" in pattern:
+            if pattern["callee_contains"] not in callee:
+                return False
+
+        if "argument_count" in pattern:
+            if len(call.get("args", [])) != pattern["argument_count"]:
+                return False
+
+        if "argument" in pattern and not match_keyword(call, pattern["argument"]):
+            return False
+
+        if "arg_value" in pattern and not match_arg_value(call, pattern["arg_value"]):
+            return False
+
+        predicates = self.arg_predicates.get(i)
+        if predicates:
+            if found[0] is None:
+                found[0] = set()
+                for text in arg_texts(call):
+                    found[0] |= self.arg_automaton.find(text)
+            if not all(needles & found[0] for needles in predicates):
+                return False
+
+        return True
@@ -1,5 +1,77 @@
-import hashlib
-from typing import List, Dict
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# NumPy is optional: large stores are scored column-wise when it is
+# installed and through a memo of distinct inputs otherwise.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# below this many findings the NumPy setup costs more than it saves
+NUMPY_MIN_BATCH = 4096
+
+# ======================
+# POLICY
+# ======================
+# cwe -> scoring, applied to the engine's confidence:
+#   adjust     added to the confidence
+#   validated  True / False, or the minimum adjusted confidence
+#   trace      decision trace entry
+#   env        replaces the entry when the rule's description mentions
+#              the environment; `confidence` is then set, not adjusted
+CWE_POLICY: Dict[str, Dict] = {
+    "CWE-77": {  # Command Injection
+        "adjust": 0.05,
+        "validated": True,
+        "trace": "Command execution sink → high exploitability",
+    },
+    "CWE-89": {  # SQL Injection
+        "adjust": 0.03,
+        "validated": True,
+        "trace": "SQL injection pattern detected",
+    },
+    "CWE-22": {  # Path Traversal
+        "adjust": 0.02,
+        "validated": True,
+        "trace": "Filesystem path traversal risk",
+    },
+    "CWE-79": {  # XSS
+        "adjust": -0.05,
+        "validated": 0.85,
+        "trace": "XSS context-sensitive → reduced certainty",
+    },
+    "CWE-798": {  # Secrets
+        "validated": True,
+        "env": {
+            "confidence": 0.4,
+            "validated": False,
+            "trace": "Secret appears environment-based",
+        },
+    },
+}
+
+# ---------- REACHABILITY ----------
+FUNCTION_ADJUST = 0.02
+FUNCTION_TRACE = "Reachable via function scope"
+
+# findings above this line are likely initialization code
+INIT_LINE = 5
+INIT_ADJUST = -0.03
+INIT_TRACE = "Likely initialization code"
+
+# trace entry ids; 0 is no entry
+TRACES: List[Optional[str]] = [None] + [
+    entry["trace"]
+    for policy in CWE_POLICY.values()
+    for entry in (policy, policy.get("env", {}))
+    if "trace" in entry
+]
+
+DECISION_SOURCE = "deterministic"
+
+# resolved per rule: (set confidence or None, adjust, min confidence, trace id)
+Policy = Tuple[Optional[float], float, float, int]
 
 
 class ReasoningAgent3A:
@@ -7,96 +79,174 @@ class ReasoningAgent3A:
     Agent-3A (Authoritative)
     Deterministic validation & confidence normalization.
     SOURCE OF TRUTH.
+
+    Scoring is driven by CWE_POLICY. A finding's outcome depends only
+    on its rule, confidence, whether it is in a function and whether it
+    is above INIT_LINE, so stores are scored in one batch over their
+    columns, and a decision trace is only a small code until a report
+    asks for it.
     """
 
     CONFIDENCE_MIN = 0.0
     CONFIDENCE_MAX = 1.0
 
     def __init__(self):
-        self.cache: Dict[str, Dict] = {}
-
+        # (cwe, description) -> Policy
+        self.policies: Dict[Tuple, Policy] = {}
+        # trace code -> decision trace
+        self.trace_table = [
+            self.decision_trace(code) for code in range(len(TRACES) << 2)
+        ]
+
+    # ======================
+    # VALIDATE
+    # ======================
     def validate(self, findings: List[Dict]) -> List[Dict]:
         validated = []
 
         for v in findings:
-            key = self._fingerprint(v)
-
-            if key in self.cache:
-                validated.append(self.cache[key])
-                continue
-
-            result = self._validate_single(v)
-            self.cache[key] = result
-            validated.append(result)
+            ok, confidence, code = self._score(
+                self._policy(v.get("cwe"), v.get("description")),
+                float(v.get("confidence", 0.9)),
+                bool(v.get("function")),
+                v.get("line", 0) < INIT_LINE,
+            )
+            validated.append({
+                **v,
+                "validated": ok,
+                "confidence": confidence,
+                "decisionSource": DECISION_SOURCE,
+                "decisionTrace": self.decision_trace(code),
+            })
 
         return validated
 
-    def _validate_single(self, v: Dict) -> Dict:
-        confidence = float(v.get("confidence", 0.9))
-        validated = False
-        trace = []
-
-        cwe = v.get("cwe")
-        severity = v.get("severity", "").lower()
-
-        # ---------- CWE-AWARE LOGIC ----------
-        if cwe == "CWE-77":  # Command Injection
-            confidence += 0.05
-            validated = True
-            trace.append("Command execution sink → high exploitability")
-
-        elif cwe == "CWE-89":  # SQL Injection
-            confidence += 0.03
-            validated = True
-            trace.append("SQL injection pattern detected")
-
-        elif cwe == "CWE-22":  # Path Traversal
-            confidence += 0.02
-            validated = True
-            trace.append("Filesystem path traversal risk")
-
-        elif cwe == "CWE-79":  # XSS
-            confidence -= 0.05
-            validated = confidence >= 0.85
-            trace.append("XSS context-sensitive → reduced certainty")
-
-        elif cwe == "CWE-798":  # Secrets
-            if "env" in v.get("description", "").lower():
-                confidence = 0.4
-                validated = False
-                trace.append("Secret appears environment-based")
+    def validate_store(self, store) -> int:
+        """
+        Validate a core.finding_store.FindingStore in place: verdicts and
+        trace codes become columns, confidence is overwritten. Returns
+        the number of findings validated.
+        """
+        policies = [self._policy(r["cwe"], r["description"]) for r in store.rules]
+
+        if np is not None and len(store) >= NUMPY_MIN_BATCH:
+            validated, codes = self._score_numpy(store, policies)
+        else:
+            validated, codes = self._score_columns(store, policies)
+
+        store.validated = validated
+        store.trace_codes = codes
+        store.trace_table = self.trace_table
+        store.decision_source = DECISION_SOURCE
+        return len(store)
+
+    # ======================
+    # SCORING
+    # ======================
+    def _policy(self, cwe: Optional[str], description: Optional[str]) -> Policy:
+        key = (cwe, description)
+        policy = self.policies.get(key)
+        if policy is None:
+            entry = CWE_POLICY.get(cwe, {})
+            if "env" in entry and "env" in (description or "").lower():
+                entry = entry["env"]
+
+            verdict = entry.get("validated", False)
+            if verdict is True:
+                threshold = float("-inf")
+            elif verdict is False:
+                threshold = float("inf")
             else:
-                validated = True
-
-        # ---------- REACHABILITY ----------
-        if v.get("function"):
-            confidence += 0.02
-            trace.append("Reachable via function scope")
-
-        if v.get("line", 0) < 5:
-            confidence -= 0.03
-            trace.append("Likely initialization code")
+                threshold = float(verdict)
+
+            policy = self.policies[key] = (
+                entry.get("confidence"),
+                entry.get("adjust", 0.0),
+                threshold,
+                TRACES.index(entry["trace"]) if "trace" in entry else 0,
+            )
+        return policy
+
+    def _score(
+        self, policy: Policy, confidence: float, in_function: bool, init: bool
+    ) -> Tuple[bool, float, int]:
+        """
+        (validated, confidence, trace code) for one finding.
+        """
+        set_to, adjust, threshold, trace = policy
+
+        confidence = set_to if set_to is not None else confidence + adjust
+        validated = confidence >= threshold
+
+        if in_function:
+            confidence += FUNCTION_ADJUST
+        if init:
+            confidence += INIT_ADJUST
 
         confidence = round(
             max(self.CONFIDENCE_MIN, min(self.CONFIDENCE_MAX, confidence)), 2
         )
-
-        return {
-            **v,
-            "validated": validated,
-            "confidence": confidence,
-            "decisionSource": "deterministic",
-            "decisionTrace": trace
-        }
-
-    def _fingerprint(self, v: Dict) -> str:
-        h = hashlib.sha1()
-        h.update(
-            (
-                v.get("rule_id", "")
-                + v.get("file", "")
-                + str(v.get("line", ""))
-                + str(v.get("cwe", ""))
-            ).encode()
+        return validated, confidence, trace << 2 | in_function << 1 | init
+
+    def _score_columns(self, store, policies: List[Policy]):
+        """
+        Score each distinct (rule, confidence, in function, init) once.
+        """
+        n = len(store)
+        validated = bytearray(n)
+        codes = array("H", bytes(2 * n))
+        rule, confidence, function, line = (
+            store.rule, store.confidence, store.function, store.line
         )
-        return h.hexdigest()
+
+        memo: Dict[Tuple, Tuple[bool, float, int]] = {}
+        for slot in range(n):
+            key = (rule[slot], confidence[slot], bool(function[slot]), line[slot] < INIT_LINE)
+            result = memo.get(key)
+            if result is None:
+                result = memo[key] = self._score(policies[key[0]], *key[1:])
+            validated[slot], confidence[slot], codes[slot] = result
+
+        return validated, codes
+
+    def _score_numpy(self, store, policies: List[Policy]):
+        n = len(store)
+        rule = np.frombuffer(store.rule, dtype=np.intc)
+        # a view: confidence is updated in place
+        confidence = np.frombuffer(store.confidence, dtype=np.float64)
+
+        set_to = np.array(
+            [np.nan if p[0] is None else p[0] for p in policies], dtype=np.float64
+        )[rule]
+        adjust = np.array([p[1] for p in policies], dtype=np.float64)[rule]
+        threshold = np.array([p[2] for p in policies], dtype=np.float64)[rule]
+        trace = np.array([p[3] for p in policies], dtype=np.uint16)[rule]
+
+        in_function = np.fromiter(map(bool, store.function), dtype=bool, count=n)
+        init = np.frombuffer(store.line, dtype=np.intc) < INIT_LINE
+
+        # same operations, in the same order, as _score
+        scored = np.where(np.isnan(set_to), confidence + adjust, set_to)
+        validated = scored >= threshold
+        scored = scored + np.where(in_function, FUNCTION_ADJUST, 0.0)
+        scored = scored + np.where(init, INIT_ADJUST, 0.0)
+        scored = np.clip(scored, self.CONFIDENCE_MIN, self.CONFIDENCE_MAX)
+
+        # np.round is not Python's round; there are few distinct values
+        values, inverse = np.unique(scored, return_inverse=True)
+        rounded = np.array([round(v, 2) for v in values.tolist()], dtype=np.float64)
+        confidence[:] = rounded[inverse.reshape(-1)]
+
+        codes = (trace << 2) | (in_function.astype(np.uint16) << 1) | init.astype(np.uint16)
+        return bytearray(validated.tobytes()), array("H", codes.astype(np.uint16).tobytes())
+
+    # ======================
+    # TRACES
+    # ======================
+    def decision_trace(self, code: int) -> List[str]:
+        trace = [TRACES[code >> 2]] if code >> 2 else []
+        if code & 2:
+            trace.append(FUNCTION_TRACE)
+        if code & 1:
+            trace.append(INIT_TRACE)
+        return trace
@@ -1,6 +1,5 @@
 import os
 from typing import List, Dict
-from openai import OpenAI
 
 
 class FixGenerationAgent3B:
@@ -14,10 +13,12 @@ class FixGenerationAgent3B:
 
     def __init__(self):
         self.enabled = os.getenv("TURING_OWL_LLM") == "1"
-        self.client = (
-            OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            if self.enabled else None
-        )
+        self.client = None
+
+        # openai is slow to import; scans without the LLM never load it
+        if self.enabled:
+            from openai import OpenAI
+            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     def generate_fixes(self, findings: List[Dict]) -> List[Dict]:
         if not self.client:
@@ -28,29 +29,44 @@ class FixGenerationAgent3B:
         for v in findings:
             item = dict(v)  # COPY (important)
 
-            if not item.get("validated"):
-                enhanced.append(item)
-                continue
-
-            try:
-                fix = self._generate_fix(item)
-
-                if fix and len(fix) <= self.MAX_FIX_LENGTH:
-                    item["generatedFix"] = fix
-                    item["fixType"] = "llm"
-                    item["fixConfidence"] = 0.9
-                else:
-                    raise ValueError("Invalid fix")
-
-            except Exception:
-                item["generatedFix"] = self._fallback_fix(item)
-                item["fixType"] = "fallback"
-                item["fixConfidence"] = 0.6
+            if item.get("validated"):
+                item.update(self._fix_fields(item))
 
             enhanced.append(item)
 
         return enhanced
 
+    def generate_store_fixes(self, store):
+        """
+        generate_fixes for a core.finding_store.FindingStore; the fix
+        fields are kept per slot and merged in when findings are built.
+        """
+        if not self.client or store.validated is None:
+            return
+
+        for slot in store.order():
+            if store.validated[slot]:
+                store.extra[slot] = self._fix_fields(store.finding(slot))
+
+    def _fix_fields(self, v: Dict) -> Dict:
+        try:
+            fix = self._generate_fix(v)
+
+            if fix and len(fix) <= self.MAX_FIX_LENGTH:
+                return {
+                    "generatedFix": fix,
+                    "fixType": "llm",
+                    "fixConfidence": 0.9,
+                }
+            raise ValueError("Invalid fix")
+
+        except Exception:
+            return {
+                "generatedFix": self._fallback_fix(v),
+                "fixType": "fallback",
+                "fixConfidence": 0.6,
+            }
+
     def _generate_fix(self, v: Dict) -> str:
         response = self.client.chat.completions.create(
             model="gpt-4o-mini",
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List
 from collections import Counter
 import hashlib
 
@@ -14,15 +14,26 @@ class ReportingAgent:
     """
 
     def generate_sarif(self, findings: List[Dict]) -> Dict:
-        rules_index = {}
-        sarif_results = []
+        findings = self.sarif_order(findings)
+        return self.sarif_document(
+            self.sarif_rules(findings),
+            [self.sarif_result(f) for f in findings],
+        )
 
+    # ----------------------
+    # SARIF PARTS
+    # (used one result at a time by core.report_writer)
+    # ----------------------
+    def sarif_order(self, findings: List[Dict]) -> List[Dict]:
         # deterministic ordering (important for CI)
-        findings = sorted(
+        return sorted(
             findings,
             key=lambda f: (f["file"], f["line"], f["rule_id"])
         )
 
+    def sarif_rules(self, findings: Iterable[Dict]) -> List[Dict]:
+        rules_index = {}
+
         for f in findings:
             rid = f["rule_id"]
 
@@ -40,32 +51,37 @@ class ReportingAgent:
                     },
                 }
 
-            sarif_results.append({
-                "ruleId": rid,
-                "level": self._level(f["severity"]),
-                "message": {"text": f["description"]},
-                "locations": [{
-                    "physicalLocation": {
-                        "artifactLocation": {
-                            "uri": f["file"]
-                        },
-                        "region": {
-                            "startLine": f["line"]
-                        }
+        return list(rules_index.values())
+
+    def sarif_result(self, f: Dict) -> Dict:
+        rid = f["rule_id"]
+        return {
+            "ruleId": rid,
+            "level": self._level(f["severity"]),
+            "message": {"text": f["description"]},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {
+                        "uri": f["file"]
+                    },
+                    "region": {
+                        "startLine": f["line"]
                     }
-                }],
-                "properties": {
-                    "confidence": f.get("confidence"),
-                    "category": f.get("category"),
-                    "stableId": stable_finding_id(
-                        rid,
-                        f["file"],
-                        f["line"],
-                        f.get("function"),
-                    ),
                 }
-            })
+            }],
+            "properties": {
+                "confidence": f.get("confidence"),
+                "category": f.get("category"),
+                "stableId": stable_finding_id(
+                    rid,
+                    f["file"],
+                    f["line"],
+                    f.get("function"),
+                ),
+            }
+        }
 
+    def sarif_document(self, rules: List[Dict], results) -> Dict:
         return {
             "version": "2.1.0",
             "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
@@ -74,17 +90,20 @@ class ReportingAgent:
                     "driver": {
                         "name": "Turing-Owl",
                         "version": "2.4.0",
-                        "rules": list(rules_index.values())
+                        "rules": rules
                     }
                 },
-                "results": sarif_results
+                "results": results
             }]
         }
 
     def generate_dashboard_summary(self, findings: List[Dict]) -> Dict:
+        return self.dashboard_summary([f["severity"] for f in findings])
+
+    def dashboard_summary(self, severities: List[str]) -> Dict:
         return {
-            "totalVulnerabilities": len(findings),
-            "bySeverity": dict(Counter(f["severity"] for f in findings))
+            "totalVulnerabilities": len(severities),
+            "bySeverity": dict(Counter(severities))
         }
 
     def _level(self, sev: str) -> str:
@@ -1,25 +1,201 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from backend.core.ast_matcher import match_call
+from backend.core.rule_profile import RuleProfile
+from backend.core.timeout import NO_DEADLINE, Deadline
+
+GAP = "..."
+
+CALL = "call"
+ASSIGN = "assign"
+
+
 class SemanticSequenceEngine:
     """
     Matches ordered AST event sequences (Semgrep pattern-seq equivalent).
+
+    A `sequence:` rule lists steps that must occur in order inside one
+    function (one def: same-named methods or nested functions are
+    separate streams). Each step is a call pattern (same keys as `match:`) or,
+    with `kind: assign`, an assignment pattern compared field by field
+    (target, valueKind, value). Consecutive steps must be consecutive
+    events; a "..." step allows any events in between:
+
+        sequence:
+          - callee: open
+          - "..."
+          - callee: os.chmod
+            arg_value: 511      # 0o777
+
+    All sequence rules are compiled into one automaton whose states are
+    (rule, next step). Each function's call and assignment events are
+    consumed once, and every rule advances on the same pass.
     """
 
-    def analyze(self, ast_events, rule):
-        sequence = rule.get("sequence")
-        if not sequence:
+    def __init__(self, rules: List[Dict]):
+        self.rules = [r for r in rules if r.get("sequence")]
+        self._compile()
+        # set per scan by the orchestrator with --rule-profile
+        self.profile: Optional[RuleProfile] = None
+
+    # ======================
+    # COMPILE
+    # ======================
+    def _compile(self):
+        predicates: Dict[Tuple[str, str], int] = {}
+        self.predicates: List[Tuple[str, Dict]] = []
+
+        # state (rule, step) -> predicate id; sticky states follow a "..."
+        self.steps: List[List[int]] = []
+        self.sticky: Set[Tuple[int, int]] = set()
+
+        for r, rule in enumerate(self.rules):
+            steps: List[int] = []
+            gap = False
+            for step in rule["sequence"]:
+                if step == GAP:
+                    gap = True
+                    continue
+
+                kind = step.get("kind", CALL)
+                pattern = {k: v for k, v in step.items() if k != "kind"}
+                key = (kind, repr(sorted(pattern.items())))
+                if key not in predicates:
+                    predicates[key] = len(self.predicates)
+                    self.predicates.append((kind, pattern))
+
+                if gap and steps:
+                    self.sticky.add((r, len(steps)))
+                steps.append(predicates[key])
+                gap = False
+            self.steps.append(steps)
+
+        # predicate -> states it advances; entry states are always live
+        self.waiting: Dict[int, List[Tuple[int, int]]] = {}
+        for r, steps in enumerate(self.steps):
+            for i, pid in enumerate(steps):
+                self.waiting.setdefault(pid, []).append((r, i))
+
+        # call predicates are indexed by exact callee where possible
+        self.by_callee: Dict[str, List[int]] = {}
+        self.unanchored_calls: List[int] = []
+        self.assign_predicates: List[int] = []
+
+        for pid, (kind, pattern) in enumerate(self.predicates):
+            if kind == ASSIGN:
+                self.assign_predicates.append(pid)
+                continue
+
+            callees = pattern.get("callee")
+            if callees is None:
+                self.unanchored_calls.append(pid)
+                continue
+            for callee in [callees] if isinstance(callees, str) else callees:
+                self.by_callee.setdefault(callee, []).append(pid)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    # ======================
+    # ANALYZE
+    # ======================
+    def analyze(self, parsed_files: List[Dict]) -> List[Dict]:
+        findings = []
+
+        for file in parsed_files:
+            findings.extend(self.analyze_file(file))
+
+        return findings
+
+    def analyze_file(self, file: Dict, deadline: Deadline = NO_DEADLINE) -> List[Dict]:
+        if not self.rules:
             return []
 
-        matches = []
-        seq_len = len(sequence)
+        findings = []
+        seen = set()
+
+        for events in self._events(file).values():
+            deadline.check()
+            for r, (_, event) in self.match_events(events):
+                rule = self.rules[r]
+                if self.profile is not None:
+                    self.profile.record(rule["id"], "sequence", matches=1, evaluations=0)
+                key = (rule["id"], event["line"], event.get("function"))
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                findings.append({
+                    "rule_id": rule["id"],
+                    "title": rule["title"],
+                    "severity": rule["severity"],
+                    "cwe": rule.get("cwe"),
+                    "category": rule.get("category"),
+                    "file": file["filePath"],
+                    "line": event["line"],
+                    "function": event.get("function"),
+                    "description": rule["description"],
+                    "confidence": round(rule["confidence"] - 0.05, 2),
+                    "remediation": rule.get("remediation"),
+                })
+
+        return findings
+
+    def _events(self, file: Dict) -> Dict[Tuple, List[Tuple[str, Dict]]]:
+        """
+        (function, def line) -> its (kind, record) events in execution
+        order. On one line the call runs before its result is assigned.
+        """
+        events = [(CALL, c) for c in file.get("calls", [])]
+        events.extend((ASSIGN, a) for a in file.get("assignments", []))
+        events.sort(key=lambda e: (e[1]["line"], e[0] == ASSIGN))
+
+        by_function: Dict[Tuple, List[Tuple[str, Dict]]] = {}
+        for event in events:
+            record = event[1]
+            key = (record.get("function"), record.get("functionLine"))
+            by_function.setdefault(key, []).append(event)
+        return by_function
+
+    # ======================
+    # AUTOMATON
+    # ======================
+    def match_events(
+        self, events: Iterable[Tuple[str, Dict]]
+    ) -> Iterator[Tuple[int, Tuple[str, Dict]]]:
+        """
+        Consume events once; yield (rule index, event) whenever an event
+        completes a rule's sequence.
+        """
+        active: Set[Tuple[int, int]] = set()
+
+        for event in events:
+            advanced: Set[Tuple[int, int]] = {s for s in active if s in self.sticky}
+
+            for pid in self._classify(event):
+                for r, i in self.waiting[pid]:
+                    if i and (r, i) not in active:
+                        continue
+                    if i + 1 == len(self.steps[r]):
+                        yield r, event
+                    else:
+                        advanced.add((r, i + 1))
+
+            active = advanced
 
-        for i in range(len(ast_events) - seq_len + 1):
-            window = ast_events[i:i + seq_len]
-            if all(self._match(p, n) for p, n in zip(sequence, window)):
-                matches.append(window[-1])
+    def _classify(self, event: Tuple[str, Dict]) -> List[int]:
+        """
+        Ids of every step predicate this event satisfies.
+        """
+        kind, record = event
 
-        return matches
+        if kind == ASSIGN:
+            return [
+                pid for pid in self.assign_predicates
+                if all(record.get(k) == v for k, v in self.predicates[pid][1].items())
+            ]
 
-    def _match(self, pattern, node):
-        for key, value in pattern.items():
-            if node.get(key) != value:
-                return False
-        return True
+        candidates = self.by_callee.get(record.get("callee", ""), [])
+        return [
+            pid for pid in candidates + self.unanchored_calls
+            if match_call(record, self.predicates[pid][1])
+        ]
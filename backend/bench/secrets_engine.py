@@ -0,0 +1,138 @@
+"""
+Throughput benchmark for the secrets heuristics of SemanticRuleEngine.
+
+    python -m backend.bench.secrets_engine [--literals N] [--files F]
+
+Generates a synthetic literal mix (identifiers, prose, paths, keys and
+random tokens), checks that the fused scan agrees with the original
+per-regex / per-literal implementation, and reports literals per second
+for both, plus a second pass served from the literal cache. Finally
+runs the whole engine over the same files with the shipped rule pack's
+literal rules.
+"""
+
+import argparse
+import math
+import os
+import random
+import string
+import time
+from typing import Dict, List
+
+from backend.agents.agent2_semantic import SemanticRuleEngine
+from backend.core import entropy
+from backend.core.literal_cache import LiteralCache
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules")
+
+WORDS = "user name config value default error request response handler data".split()
+
+
+def make_literal(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.35:
+        return "_".join(rng.sample(WORDS, rng.randint(1, 3)))
+    if kind < 0.6:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+    if kind < 0.75:
+        return "/" + "/".join(rng.sample(WORDS, rng.randint(2, 4))) + ".py"
+    if kind < 0.8:
+        return "AKIA" + "".join(rng.choices(string.ascii_uppercase + string.digits, k=16))
+    if kind < 0.85:
+        return rng.choice(["api_key", "client_secret", "Password", "auth token"]) + "=x"
+    alphabet = string.ascii_letters + string.digits + "+/"
+    return "".join(rng.choices(alphabet, k=rng.randint(8, 48)))
+
+
+def make_files(literals: int, files: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    per_file = max(1, literals // files)
+    return [
+        {
+            "filePath": f"bench/file_{f}.py",
+            "functions": [],
+            "calls": [],
+            "literals": [
+                {"value": make_literal(rng), "line": i + 1, "function": None}
+                for i in range(per_file)
+            ],
+        }
+        for f in range(files)
+    ]
+
+
+def reference_sensitive(engine: SemanticRuleEngine, value: str) -> bool:
+    """
+    The original check: each regex in turn, then a dict-loop entropy.
+    """
+    for r in engine.SECRET_REGEXES:
+        if r.search(value):
+            return True
+
+    freq: Dict[str, int] = {}
+    for c in value:
+        freq[c] = freq.get(c, 0) + 1
+    result = 0.0
+    for count in freq.values():
+        p = count / len(value)
+        result -= p * math.log2(p)
+    return result >= engine.ENTROPY_THRESHOLD
+
+
+def run(literals: int, files: int) -> Dict:
+    engine = SemanticRuleEngine([{"type": "semantic", "min_string_length": 6}])
+    parsed = make_files(literals, files)
+    total = sum(len(f["literals"]) for f in parsed)
+
+    start = time.perf_counter()
+    expected = [
+        [len(l["value"]) >= 6 and reference_sensitive(engine, l["value"]) for l in f["literals"]]
+        for f in parsed
+    ]
+    reference = time.perf_counter() - start
+
+    def classify() -> float:
+        start = time.perf_counter()
+        actual = [[c[0] for c in engine._classify_literals(f)] for f in parsed]
+        elapsed = time.perf_counter() - start
+        if actual != expected:
+            raise AssertionError("fused classification disagrees with the reference")
+        return elapsed
+
+    # the literal cache starts empty, then holds every value
+    cold = classify()
+    warm = classify()
+
+    # the shipped pack, end to end on a cold cache
+    from backend.rules.loader import load_all_rules
+    pack = SemanticRuleEngine(load_all_rules(RULES_DIR), LiteralCache())
+    start = time.perf_counter()
+    pack_findings = sum(len(pack.analyze_file(f)) for f in parsed)
+    shipped = time.perf_counter() - start
+
+    return {
+        "literals": total,
+        "numpy": entropy.np is not None,
+        "referencePerSec": round(total / reference),
+        "fusedPerSec": round(total / cold),
+        "cachedPerSec": round(total / warm),
+        "speedup": round(reference / cold, 2),
+        "literalCache": engine.literal_cache.metrics(),
+        "packRules": len(pack.literal_rules),
+        "packFindings": pack_findings,
+        "packPerSec": round(total / shipped),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--literals", type=int, default=200_000)
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+
+    for key, value in run(args.literals, args.files).items():
+        print(f"{key:16} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cold-start benchmark for the scanner CLI.
+
+    python -m backend.bench.startup [TARGET] [--runs N] [--budget SECONDS]
+
+Reports, each measured in a fresh interpreter:
+  - the slowest imports (python -X importtime)
+  - import, orchestrator setup and time-to-first-file inside the process
+  - wall time of the whole scan, interpreter start included
+
+TARGET defaults to a small generated project. Exits 1 when the median
+wall time exceeds the budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from backend.core.orchestrator import Orchestrator
+imported = time.perf_counter()
+orchestrator = Orchestrator(sys.argv[1], output_dir=sys.argv[3])
+ready = time.perf_counter()
+paths = orchestrator.parser.discover(sys.argv[2])
+next(orchestrator.parser.iter_paths(paths[:1]), None)
+first = time.perf_counter()
+result = orchestrator.run(sys.argv[2])
+done = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "setup": ready - imported,
+    "firstFile": first - start,
+    "scan": done - start,
+    "files": len(paths),
+    "ok": "error" not in result,
+    "llmLoaded": "openai" in sys.modules,
+}))
+"""
+
+SAMPLE = '''import os
+import subprocess
+
+
+def handler_{n}(request):
+    name = request.args.get("name")
+    os.system("echo " + name)
+    return subprocess.run(["ls", name], check=False)
+'''
+
+
+def make_sample(directory: str, files: int = 20) -> str:
+    for n in range(files):
+        with open(os.path.join(directory, f"module_{n}.py"), "w", encoding="utf-8") as f:
+            f.write(SAMPLE.format(n=n))
+    return directory
+
+
+def import_profile(top: int = 10) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    (total seconds, [(module, cumulative seconds)]) for importing the CLI
+    and the orchestrator.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import backend.main, backend.core.orchestrator"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+
+    modules = []
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        seconds = int(cumulative) / 1e6
+        modules.append((name.strip(), seconds))
+        if not name.startswith("  "):  # top-level import
+            total += seconds
+
+    modules.sort(key=lambda m: m[1], reverse=True)
+    return total, modules[:top]
+
+
+def probe(rules_dir: str, target: str) -> Dict:
+    with tempfile.TemporaryDirectory() as out:
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE, rules_dir, target, out],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        wall = time.perf_counter() - start
+
+    stats = json.loads(proc.stdout.strip().splitlines()[-1])
+    stats["wall"] = wall
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("target", nargs="?")
+    parser.add_argument("--rules-dir", default=os.path.join(REPO_ROOT, "backend", "rules"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0)
+    args = parser.parse_args()
+
+    total, slowest = import_profile()
+    print(f"imports          {total * 1000:.1f} ms")
+    for name, seconds in slowest:
+        print(f"  {name:40} {seconds * 1000:7.1f} ms")
+
+    with tempfile.TemporaryDirectory() as sample:
+        target = os.path.abspath(args.target) if args.target else make_sample(sample)
+        runs = [probe(args.rules_dir, target) for _ in range(args.runs)]
+
+    if not all(r["ok"] for r in runs):
+        print("ERROR: scan failed", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"files            {runs[0]['files']}")
+    print(f"llm loaded       {runs[0]['llmLoaded']}")
+    for key in ("import", "setup", "firstFile", "scan", "wall"):
+        median = statistics.median(r[key] for r in runs)
+        print(f"{key:16} {median * 1000:.1f} ms")
+
+    wall = statistics.median(r["wall"] for r in runs)
+    if wall > args.budget:
+        print(f"FAIL: cold scan {wall:.2f}s exceeds {args.budget:.2f}s budget")
+        sys.exit(1)
+    print(f"OK: cold scan {wall:.2f}s within {args.budget:.2f}s budget")
+
+
+if __name__ == "__main__":
+    main()
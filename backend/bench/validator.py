@@ -0,0 +1,162 @@
+"""
+Throughput benchmark for ReasoningAgent3A.validate_store.
+
+    python -m backend.bench.validator [--findings N] [--rules R]
+
+Fills a FindingStore with synthetic findings over every CWE the policy
+table knows (and some it does not), checks that batched scoring agrees
+with the original per-finding implementation, and reports findings per
+second for the reference, the memoized column pass and, when NumPy is
+installed, the vectorized pass.
+"""
+
+import argparse
+import hashlib
+import random
+import time
+from typing import Dict, List
+
+from backend.agents import agent3a_validator
+from backend.agents.agent3a_validator import ReasoningAgent3A
+from backend.core.finding_store import FindingStore
+
+CWES = ["CWE-77", "CWE-89", "CWE-22", "CWE-79", "CWE-798", "CWE-502", None]
+
+
+def make_rules(count: int, rng: random.Random) -> List[Dict]:
+    return [
+        {
+            "rule_id": f"bench.rule.{i}",
+            "title": f"Bench rule {i}",
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "cwe": CWES[i % len(CWES)],
+            "category": "bench",
+            "description": rng.choice(["Hardcoded secret", "Secret from env var", "Unsafe call"]),
+            "remediation": None,
+            "confidence": rng.choice([0.7, 0.8, 0.85, 0.9, 0.95]),
+        }
+        for i in range(count)
+    ]
+
+
+def make_store(findings: int, rules: int, seed: int = 0) -> FindingStore:
+    rng = random.Random(seed)
+    rule_set = make_rules(rules, rng)
+    store = FindingStore(findings)
+    for i in range(findings):
+        rule = rule_set[i % rules]
+        store.add({
+            **rule,
+            "file": f"bench/file_{i % 500}.py",
+            "line": i // 500 + 1,
+            "function": rng.choice([None, "handler", "main"]),
+            "confidence": rule["confidence"] - rng.choice([0.0, 0.05]),
+        })
+    return store
+
+
+def reference_validate(v: Dict) -> Dict:
+    """
+    The original check: a CWE if/elif chain and a SHA-1 fingerprint.
+    """
+    hashlib.sha1(
+        (v.get("rule_id", "") + v.get("file", "") + str(v.get("line", ""))
+         + str(v.get("cwe", ""))).encode()
+    ).hexdigest()
+
+    confidence = float(v.get("confidence", 0.9))
+    validated = False
+    trace = []
+    cwe = v.get("cwe")
+
+    if cwe == "CWE-77":
+        confidence += 0.05
+        validated = True
+        trace.append("Command execution sink → high exploitability")
+    elif cwe == "CWE-89":
+        confidence += 0.03
+        validated = True
+        trace.append("SQL injection pattern detected")
+    elif cwe == "CWE-22":
+        confidence += 0.02
+        validated = True
+        trace.append("Filesystem path traversal risk")
+    elif cwe == "CWE-79":
+        confidence -= 0.05
+        validated = confidence >= 0.85
+        trace.append("XSS context-sensitive → reduced certainty")
+    elif cwe == "CWE-798":
+        if "env" in v.get("description", "").lower():
+            confidence = 0.4
+            validated = False
+            trace.append("Secret appears environment-based")
+        else:
+            validated = True
+
+    if v.get("function"):
+        confidence += 0.02
+        trace.append("Reachable via function scope")
+    if v.get("line", 0) < 5:
+        confidence -= 0.03
+        trace.append("Likely initialization code")
+
+    confidence = round(max(0.0, min(1.0, confidence)), 2)
+    return {
+        **v,
+        "validated": validated,
+        "confidence": confidence,
+        "decisionSource": "deterministic",
+        "decisionTrace": trace,
+    }
+
+
+def run(findings: int, rules: int) -> Dict:
+    store = make_store(findings, rules)
+    originals = list(store)
+
+    start = time.perf_counter()
+    expected = [reference_validate(v) for v in originals]
+    reference = time.perf_counter() - start
+
+    def validate(numpy: bool) -> float:
+        batch = make_store(findings, rules)
+        saved = agent3a_validator.np
+        if not numpy:
+            agent3a_validator.np = None
+        try:
+            start = time.perf_counter()
+            ReasoningAgent3A().validate_store(batch)
+            elapsed = time.perf_counter() - start
+        finally:
+            agent3a_validator.np = saved
+        if list(batch) != expected:
+            raise AssertionError("batched validation disagrees with the reference")
+        return elapsed
+
+    result = {
+        "findings": len(store),
+        "numpy": agent3a_validator.np is not None,
+        "referencePerSec": round(len(store) / reference),
+    }
+    columns = validate(numpy=False)
+    result["columnsPerSec"] = round(len(store) / columns)
+    result["columnsSpeedup"] = round(reference / columns, 2)
+    if agent3a_validator.np is not None:
+        vectorized = validate(numpy=True)
+        result["numpyPerSec"] = round(len(store) / vectorized)
+        result["numpySpeedup"] = round(reference / vectorized, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    parser.add_argument("--rules", type=int, default=120)
+    args = parser.parse_args()
+
+    for key, value in run(args.findings, args.rules).items():
+        print(f"{key:16} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, IO, Iterable, List, Optional, Tuple
+
+from backend.core.repo_fetcher import RepoFetcher
+
+# Multi-repository scan scheduler.
+#
+# Clones (I/O bound) run in a thread pool, scans (CPU bound) in a
+# process pool, each with its own limit. A clone only starts when a
+# slot is free, so at most `max_pending` checkouts sit on disk waiting
+# for a scanner. Every repository ends in exactly one JSON line on the
+# combined output, written as soon as it finishes; a failed clone or
+# scan only affects its own line.
+
+DEFAULT_CLONE_TIMEOUT = 600
+
+# a scan that kills its worker twice is reported as failed
+MAX_SCAN_ATTEMPTS = 2
+
+# how often a clone waiting for a slot checks whether the run stopped
+SLOT_POLL_SECONDS = 0.2
+
+
+def read_repo_list(lines: Iterable[str]) -> List[Tuple[str, Optional[str]]]:
+    """
+    "url [ref]" per line; blank lines and # comments are skipped.
+    """
+    repos = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        repos.append((parts[0], parts[1] if len(parts) > 1 else None))
+    return repos
+
+
+# =====================================================
+# SCAN WORKERS
+# =====================================================
+_ORCHESTRATOR = None
+
+
+def _init_worker(rules_dir: str):
+    global _ORCHESTRATOR
+    from backend.core.orchestrator import Orchestrator
+    _ORCHESTRATOR = Orchestrator(rules_dir, output_dir=None)
+
+
+def _scan_worker(path: str) -> Dict:
+    start = time.perf_counter()
+    result = _ORCHESTRATOR.run(path)
+    seconds = round(time.perf_counter() - start, 3)
+
+    if "error" in result:
+        return {"status": "scan_failed", "error": result["error"],
+                "details": result.get("details", []), "scanSeconds": seconds}
+
+    return {
+        "status": "ok",
+        "scanSeconds": seconds,
+        "summary": result["dashboard"],
+        "findings": list(result["report"]["findings"]),
+    }
+
+
+# =====================================================
+# SCHEDULER
+# =====================================================
+class BatchScanner:
+    def __init__(
+        self,
+        rules_dir: str,
+        clone_jobs: int = 4,
+        scan_jobs: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        clone_timeout: float = DEFAULT_CLONE_TIMEOUT,
+    ):
+        self.rules_dir = os.path.abspath(rules_dir)
+        self.clone_jobs = clone_jobs
+        self.scan_jobs = scan_jobs or os.cpu_count() or 1
+        self.max_pending = max_pending or self.scan_jobs * 2
+        self.clone_timeout = clone_timeout
+
+    def run(self, repos: List[Tuple[str, Optional[str]]], out: IO[str]) -> Dict:
+        """
+        Scan every (url, ref), writing one JSON line per repository
+        to `out` as it completes. Returns run statistics.
+        """
+        slots = threading.Semaphore(self.max_pending)
+        # set when run() exits; clones still waiting for a slot give up
+        stopped = threading.Event()
+        stats = {"repos": len(repos), "ok": 0, "clone_failed": 0, "scan_failed": 0}
+        started = time.perf_counter()
+
+        def clone(index: int) -> Optional[Tuple[RepoFetcher, str, float]]:
+            while not slots.acquire(timeout=SLOT_POLL_SECONDS):
+                if stopped.is_set():
+                    return None
+            if stopped.is_set():
+                slots.release()
+                return None
+            url, ref = repos[index]
+            fetcher = RepoFetcher()
+            start = time.perf_counter()
+            try:
+                path = fetcher.clone(url, ref, timeout=self.clone_timeout)
+            except BaseException:
+                fetcher.cleanup()
+                slots.release()
+                raise
+            return fetcher, path, round(time.perf_counter() - start, 3)
+
+        def emit(index: int, record: Dict):
+            url, ref = repos[index]
+            stats[record["status"]] += 1
+            out.write(json.dumps({"repo": url, "ref": ref, **record}) + "\n")
+            out.flush()
+
+        clone_pool = ThreadPoolExecutor(max_workers=self.clone_jobs)
+        scan_pool = self._scan_pool()
+        clones = {clone_pool.submit(clone, i): i for i in range(len(repos))}
+        # scan future -> (index, fetcher, path, clone seconds, attempts, pool)
+        scans: Dict = {}
+
+        try:
+            while clones or scans:
+                done, _ = wait(list(clones) + list(scans), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future in clones:
+                        index = clones.pop(future)
+                        try:
+                            fetcher, path, clone_seconds = future.result()
+                        except Exception as e:
+                            emit(index, {"status": "clone_failed", "error": _describe(e)})
+                            continue
+                        job = (index, fetcher, path, clone_seconds, 1)
+                        scan_pool = self._submit(scans, scan_pool, job)
+                        continue
+
+                    index, fetcher, path, clone_seconds, attempts, pool = scans.pop(future)
+                    try:
+                        record = future.result()
+                    except BrokenProcessPool as e:
+                        # a worker died (e.g. OOM) and took every scan in
+                        # flight with it; retry those once on a new pool
+                        if attempts < MAX_SCAN_ATTEMPTS:
+                            if pool is scan_pool:
+                                scan_pool.shutdown(wait=True, cancel_futures=True)
+                                scan_pool = self._scan_pool()
+                            job = (index, fetcher, path, clone_seconds, attempts + 1)
+                            scan_pool = self._submit(scans, scan_pool, job)
+                            continue
+                        record = {"status": "scan_failed", "error": _describe(e)}
+                    except Exception as e:
+                        record = {"status": "scan_failed", "error": _describe(e)}
+
+                    fetcher.cleanup()
+                    slots.release()
+                    emit(index, {**record, "cloneSeconds": clone_seconds})
+        finally:
+            stopped.set()
+            clone_pool.shutdown(wait=True, cancel_futures=True)
+            scan_pool.shutdown(wait=True, cancel_futures=True)
+            for _, fetcher, *_ in scans.values():
+                fetcher.cleanup()
+            # clones that finished but were never scanned
+            for future in clones:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    cloned = future.result()
+                    if cloned is not None:
+                        cloned[0].cleanup()
+
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _scan_pool(self) -> ProcessPoolExecutor:
+        # not fork: clone threads may hold locks at fork time
+        return ProcessPoolExecutor(
+            max_workers=self.scan_jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.rules_dir,),
+        )
+
+    def _submit(self, scans: Dict, pool: ProcessPoolExecutor, job: Tuple) -> ProcessPoolExecutor:
+        """
+        Queue a scan, replacing the pool if it broke in the meantime.
+        Returns the pool in use.
+        """
+        try:
+            future = pool.submit(_scan_worker, job[2])
+        except BrokenProcessPool:
+            pool.shutdown(wait=True, cancel_futures=True)
+            pool = self._scan_pool()
+            future = pool.submit(_scan_worker, job[2])
+        scans[future] = (*job, pool)
+        return pool
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, subprocess.CalledProcessError):
+        message = (error.stderr or "").strip().splitlines()
+        return message[-1] if message else f"git exited with {error.returncode}"
+    if isinstance(error, subprocess.TimeoutExpired):
+        return f"timed out after {error.timeout}s"
+    return f"{type(error).__name__}: {error}"
@@ -2,6 +2,7 @@ import tempfile
 import shutil
 import os
 from git import Repo
+from backend.agents.agent4_report import ReportingAgent
 from backend.core.orchestrator import Orchestrator
 
 
@@ -15,9 +16,9 @@ def run_cloud_scan(repo_url: str, commit: str, out: str):
         result = orch.run(tmp_dir)
 
         if out == "json":
-            print(result["report"])
+            print({**result["report"], "findings": list(result["report"]["findings"])})
         else:
-            print(result["sarif"])
+            print(ReportingAgent().generate_sarif(list(result["report"]["findings"])))
 
     finally:
         shutil.rmtree(tmp_dir, ignore_errors=True)
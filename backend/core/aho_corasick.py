@@ -0,0 +1,60 @@
+from collections import deque
+from typing import Dict, List, Set
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring automaton.
+
+    find(text) returns the ids (positions in `patterns`) of every
+    pattern occurring in text, in one pass over text.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Set[int]] = [set()]
+
+        for pid, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(set())
+                state = nxt
+            self.out[state].add(pid)
+
+        # breadth-first failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] |= self.out[self.fail[nxt]]
+
+        # the empty pattern matches every text
+        self.always = set(self.out[0])
+
+    def find(self, text: str) -> Set[int]:
+        found = set(self.always)
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+
+        return found
@@ -5,24 +5,30 @@ def match_call(call: Dict, pattern: Dict) -> bool:
     Semgrep-style call matcher.
 
     Supported:
-      - callee
+      - callee                    (name or list of names)
       - callee_contains
       - arg_contains
       - any_arg_contains
       - argument_count
+      - arg_value                 (positional argument with a literal value)
+      - argument: {name, value}   (keyword argument with a literal value)
     """
 
     if not pattern:
         return False
 
     callee = call.get("callee", "")
-    args: List[str] = call.get("args", [])
+    args: List = call.get("args", [])
 
     # --------------------
     # CALLEE MATCHING
     # --------------------
-    if "callee" in pattern and callee != pattern["callee"]:
-        return False
+    if "callee" in pattern:
+        expected = pattern["callee"]
+        if isinstance(expected, str):
+            expected = [expected]
+        if callee not in expected:
+            return False
 
     if "callee_contains" in pattern and pattern["callee_contains"] not in callee:
         return False
@@ -30,17 +36,73 @@ def match_call(call: Dict, pattern: Dict) -> bool:
     # --------------------
     # ARGUMENT MATCHING
     # --------------------
-    if "arg_contains" in pattern:
-        if not any(pattern["arg_contains"] in a for a in args):
+    if "argument" in pattern:
+        if not match_keyword(call, pattern["argument"]):
             return False
 
-    if "any_arg_contains" in pattern:
-        needles = pattern["any_arg_contains"]
-        if not any(n in a for n in needles for a in args):
-            return False
+    if "arg_value" in pattern and not match_arg_value(call, pattern["arg_value"]):
+        return False
+
+    if "arg_contains" in pattern or "any_arg_contains" in pattern:
+        texts = arg_texts(call)
+
+        if "arg_contains" in pattern:
+            if not any(pattern["arg_contains"] in a for a in texts):
+                return False
+
+        if "any_arg_contains" in pattern:
+            needles = pattern["any_arg_contains"]
+            if not any(n in a for n in needles for a in texts):
+                return False
 
     if "argument_count" in pattern:
         if len(args) != pattern["argument_count"]:
             return False
 
     return True
+
+
+def match_keyword(call: Dict, argument: Dict) -> bool:
+    """
+    True if the call passes keyword `name` with literal `value`.
+    """
+    name = argument.get("name")
+    for kw_name, kind, value in call.get("keywords", []):
+        if kw_name != name:
+            continue
+        if "value" not in argument:
+            return True
+        if kind == "const" and value == argument["value"]:
+            return True
+    return False
+
+
+def match_arg_value(call: Dict, value) -> bool:
+    """
+    True if some positional argument is the literal `value`.
+    """
+    return any(
+        kind == "const" and type(v) is type(value) and v == value
+        for kind, v in call.get("args", [])
+    )
+
+
+def arg_texts(call: Dict) -> List[str]:
+    """
+    Source-like text of each argument record, for substring predicates.
+    Keywords render as "name=value", e.g. "verify=False".
+    """
+    texts = [_render(kind, value) for kind, value in call.get("args", [])]
+    texts.extend(
+        f"{name}={_render(kind, value)}" if name else _render(kind, value)
+        for name, kind, value in call.get("keywords", [])
+    )
+    return texts
+
+
+def _render(kind: str, value) -> str:
+    if kind == "const":
+        return value if isinstance(value, str) else repr(value)
+    if kind == "call":
+        return f"{value}()"
+    return str(value)
@@ -0,0 +1,242 @@
+import json
+import os
+import select
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+# Warm scan daemon.
+#
+# `serve` keeps one Orchestrator alive between scans - compiled rules,
+# parsed IR (in memory, on top of any --cache-dir), the validator's
+# resolved per-rule policies and the literal cache - and the CLI sends
+# each scan to it over a Unix socket, scanning in-process only when no
+# daemon answers.
+#
+# Protocol: one JSON request line in, one JSON response line out, per
+# connection. Scans run one at a time; function summaries are
+# process-global. A client that hangs up (e.g. after its read timeout,
+# to scan locally) cancels its scan: no new files are started and no
+# report is written over the ones its local scan writes.
+
+SOCKET_ENV = "TURING_OWL_SOCKET"
+
+# parsed files kept in memory by the daemon
+MEMORY_CACHE_ENTRIES = 50_000
+
+# client: seconds to reach the daemon, and to wait for its answer,
+# before the caller scans in-process instead
+CONNECT_TIMEOUT = 1.0
+READ_TIMEOUT = 600.0
+
+# server: how often a scan checks that its client is still connected
+CLIENT_POLL_SECONDS = 0.2
+
+
+def default_socket_path() -> str:
+    # not tempfile.gettempdir(): the client should import next to nothing
+    return os.environ.get(SOCKET_ENV) or os.path.join(
+        os.environ.get("TMPDIR", "/tmp"), f"turing-owl-{os.getuid()}.sock"
+    )
+
+
+# =====================================================
+# SERVER
+# =====================================================
+class ScanDaemon:
+    """
+    Request handler state. The orchestrator is rebuilt when the rule
+    pack changes on disk; everything else stays warm.
+    """
+
+    def __init__(self, rules_dir: str, jobs: int = 1, cache_dir: Optional[str] = None):
+        self.rules_dir = os.path.abspath(rules_dir)
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.orchestrator = None
+        self.signature = None
+        self.scans = 0
+        self.started = time.time()
+        self.stopping = False
+
+    def _orchestrator(self):
+        from backend.core.orchestrator import Orchestrator
+        from backend.core.rule_bundle import rules_signature
+
+        signature = rules_signature(self.rules_dir)
+        if self.orchestrator is None or signature != self.signature:
+            self.orchestrator = Orchestrator(
+                self.rules_dir,
+                jobs=self.jobs,
+                cache_dir=self.cache_dir,
+                memory_cache_entries=MEMORY_CACHE_ENTRIES,
+            )
+            self.signature = signature
+        return self.orchestrator
+
+    def handle(self, request: Dict, cancel: Optional[threading.Event] = None) -> Dict:
+        command = request.get("command", "scan")
+
+        if command == "ping":
+            return {
+                "pid": os.getpid(),
+                "scans": self.scans,
+                "uptime": round(time.time() - self.started, 1),
+            }
+
+        if command == "shutdown":
+            self.stopping = True
+            return {"stopping": True}
+
+        if command != "scan":
+            return {"error": f"unknown command '{command}'"}
+
+        from backend.core.limits import FILE_TIMEOUT, MAX_FILES, MAX_FINDINGS
+        from backend.core.orchestrator import OUTPUT_DIR
+
+        # relative paths resolve as they would in the client
+        cwd = request.get("cwd") or os.getcwd()
+
+        def resolve(path: Optional[str]) -> Optional[str]:
+            return os.path.join(cwd, path) if path else path
+
+        # every option is set on every request, from the request or its
+        # default, so nothing carries over from the previous client
+        options = {
+            "stream": bool(request.get("stream")),
+            "trace_path": resolve(request.get("trace")),
+            "rule_profile": bool(request.get("rule_profile")),
+            "file_timeout": request.get("file_timeout", FILE_TIMEOUT),
+            "stage_timeout": request.get("stage_timeout"),
+            "max_files": request.get("max_files", MAX_FILES),
+            "max_findings": request.get("max_findings", MAX_FINDINGS),
+            "output_dir": resolve(request.get("output_dir", OUTPUT_DIR)),
+            "sarif_path": resolve(request.get("sarif_path")),
+            "compact": bool(request.get("compact")),
+            "compress": bool(request.get("compress")),
+        }
+        orchestrator = self._orchestrator()
+        for name, value in options.items():
+            setattr(orchestrator, name, value)
+        orchestrator.parser.file_timeout = options["file_timeout"]
+
+        files = request.get("files")
+        if files is not None:
+            files = [resolve(p) for p in files]
+
+        self.scans += 1
+        result = orchestrator.run(resolve(request["target"]), files=files, cancel=cancel)
+
+        # the client reads findings from the written reports
+        if request.get("summary_only") and "report" in result:
+            result = {
+                "dashboard": result["dashboard"],
+                "report": {"metadata": result["report"]["metadata"]},
+            }
+        elif "report" in result:
+            findings = list(result["report"]["findings"])
+            result["report"] = {**result["report"], "findings": findings}
+        return result
+
+
+def watch_client(sock: socket.socket, cancel: threading.Event, done: threading.Event):
+    """
+    Set `cancel` if the client closes `sock` before `done` is set. The
+    client sends nothing after its request, so readable means EOF.
+    """
+    while not done.is_set():
+        try:
+            readable, _, _ = select.select([sock], [], [], CLIENT_POLL_SECONDS)
+            if readable and not sock.recv(1, socket.MSG_PEEK):
+                cancel.set()
+                return
+        except OSError:
+            cancel.set()
+            return
+        if readable:
+            return  # unexpected bytes: not a hang-up
+
+
+def serve(daemon: ScanDaemon, socket_path: Optional[str] = None):
+    """
+    Serve requests until a shutdown request (or KeyboardInterrupt).
+    """
+    import socketserver
+
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        if request({"command": "ping"}, socket_path, read_timeout=CONNECT_TIMEOUT) is not None:
+            raise RuntimeError(f"a daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale, from a daemon that died
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            cancel, done = threading.Event(), threading.Event()
+            watcher = threading.Thread(
+                target=watch_client, args=(self.connection, cancel, done), daemon=True
+            )
+            try:
+                line = self.rfile.readline()
+                watcher.start()
+                response = daemon.handle(json.loads(line), cancel)
+            except Exception as e:
+                response = {"error": "Daemon request failed", "details": [str(e)]}
+            finally:
+                done.set()
+                if watcher.is_alive():
+                    watcher.join()
+
+            if cancel.is_set():
+                return  # nobody is listening
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    # owner-only socket: requests can read any file the daemon can
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(umask)
+
+    try:
+        while not daemon.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# =====================================================
+# CLIENT
+# =====================================================
+def request(
+    payload: Dict,
+    socket_path: Optional[str] = None,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    read_timeout: Optional[float] = READ_TIMEOUT,
+) -> Optional[Dict]:
+    """
+    Send one request to the daemon. None when no daemon is listening,
+    it went away or it did not answer within the timeouts, so the
+    caller can do the work itself.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(connect_timeout)
+            sock.connect(socket_path)
+            sock.settimeout(read_timeout)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:  # includes socket.timeout
+        return None
+
+    try:
+        return json.loads(line) if line else None
+    except ValueError:
+        return None
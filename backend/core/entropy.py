@@ -0,0 +1,75 @@
+import math
+from collections import Counter
+from typing import List, Sequence
+
+# NumPy is optional: batches are vectorized when it is installed and
+# fall back to a per-string Counter otherwise.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# below this many strings the NumPy setup costs more than it saves
+NUMPY_MIN_BATCH = 64
+
+# code points fit in 21 bits; the string index goes above them
+_CODE_BITS = 21
+
+
+# short strings count each distinct character with str.count (C speed);
+# longer ones use one Counter pass
+COUNT_MAX_LENGTH = 256
+
+# c * log2(c) for every count a short string can have
+_C_LOG_C = [0.0] + [c * math.log2(c) for c in range(1, COUNT_MAX_LENGTH + 1)]
+
+
+def shannon_entropy(s: str) -> float:
+    """
+    Shannon entropy of s, in bits per character, computed as
+    log2(n) - sum(c * log2(c)) / n over the character counts c.
+    """
+    n = len(s)
+    if not n:
+        return 0.0
+    if n <= COUNT_MAX_LENGTH:
+        return math.log2(n) - sum(map(_C_LOG_C.__getitem__, map(s.count, set(s)))) / n
+    return math.log2(n) - sum(c * math.log2(c) for c in Counter(s).values()) / n
+
+
+def entropy_floor(length: int, distinct: int) -> float:
+    """
+    Lowest Shannon entropy a string of `length` characters with
+    `distinct` distinct ones can have: one character repeated, every
+    other one once (entropy is Schur-concave in the counts).
+    """
+    rest = length - distinct + 1
+    return math.log2(length) - rest * math.log2(rest) / length
+
+
+def batch_entropy(values: Sequence[str]) -> List[float]:
+    """
+    shannon_entropy for every string in values, vectorized over the
+    whole batch when NumPy is available.
+    """
+    if np is None or len(values) < NUMPY_MIN_BATCH:
+        return [shannon_entropy(v) for v in values]
+    return _batch_entropy_numpy(values)
+
+
+def _batch_entropy_numpy(values: Sequence[str]) -> List[float]:
+    n = len(values)
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=n)
+
+    # one flat array of code points, tagged with the index of its string
+    codes = np.frombuffer(
+        "".join(values).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+    ).astype(np.uint64)
+    owner = np.repeat(np.arange(n, dtype=np.uint64), lengths)
+
+    # occurrences of each (string, character) pair
+    pairs, counts = np.unique((owner << _CODE_BITS) | codes, return_counts=True)
+    owner = (pairs >> _CODE_BITS).astype(np.int64)
+
+    p = counts / lengths[owner]
+    return np.bincount(owner, weights=-p * np.log2(p), minlength=n).tolist()
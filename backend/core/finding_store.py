@@ -0,0 +1,240 @@
+import heapq
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from backend.core.limits import MAX_FINDINGS, SEVERITY_RANK
+
+# Columnar findings of one scan.
+#
+# Engines emit small per-file finding dicts; the store keeps one row per
+# finding in parallel columns (rule, file, line, function, confidence)
+# and each rule's metadata (title, severity, cwe, ...) once, referenced
+# by index. Rows are deduped on insert by (rule, file, line, function)
+# and bounded by the finding budget: once full, a better-ranked finding
+# takes over the slot of the worst kept one. Finding dicts are built
+# again only when something iterates the store - the report writers,
+# one finding at a time.
+
+# per-rule fields, in report order around the per-row ones
+RULE_FIELDS = ("rule_id", "title", "severity", "cwe", "category", "description", "remediation")
+
+
+def drop_superseded(findings: List[Dict], superseded_by: Dict[str, Set[str]]) -> List[Dict]:
+    """
+    Findings minus those whose rule is superseded (`supersedes:` in the
+    rule pack) by a rule that reported the same line of the same file.
+    """
+    hits = {(f["rule_id"], f["file"], f["line"]) for f in findings}
+    return [
+        f for f in findings
+        if not any(
+            (rule_id, f["file"], f["line"]) in hits
+            for rule_id in superseded_by.get(f["rule_id"], ())
+        )
+    ]
+
+
+class FindingStore:
+    """
+    Top-K findings by (severity, confidence), fed while detection runs.
+    Ties keep the earlier finding. A repeat of a kept finding is
+    ignored; a repeat of a dropped or evicted one is ranked again.
+    Iterates finding dicts in arrival order; validation and fixes are
+    added as columns later.
+    """
+
+    def __init__(self, max_findings: int = MAX_FINDINGS):
+        self.max_findings = max_findings
+        self.dropped = 0
+        # findings replaced by a superseding rule's (drop_superseded)
+        self.superseded = 0
+
+        # interned per scan
+        self.rules: List[Dict] = []
+        self.rule_index: Dict[str, int] = {}
+        self.files: List[str] = []
+        self.file_index: Dict[str, int] = {}
+
+        # one entry per slot
+        self.rule = array("i")
+        self.file = array("i")
+        self.line = array("i")
+        self.function: List[Optional[str]] = []
+        self.confidence = array("d")
+        self.seq = array("q")
+
+        # filled by the validator (ReasoningAgent3A.validate_store)
+        self.validated: Optional[bytearray] = None
+        # trace code per slot, decoded through trace_table on output
+        self.trace_codes: Optional[array] = None
+        self.trace_table: List[List[str]] = []
+        self.decision_source: Optional[str] = None
+        # slot -> fields added after validation (generated fixes)
+        self.extra: Dict[int, Dict] = {}
+
+        # min-heap of ((severity, confidence, -seq), slot), built only
+        # once the budget is full
+        self.heap: List[Tuple[Tuple, int]] = []
+        self.rule_rank: List[int] = []
+        # dedupe key -> slot, for occupied slots only, so memory is
+        # bounded by max_findings however many findings are offered
+        self.slots: Dict[Tuple, int] = {}
+        self.next_seq = 0
+        self._order: Optional[List[int]] = None
+
+    # ======================
+    # INSERT
+    # ======================
+    def add(self, finding: Dict):
+        key = (
+            finding.get("rule_id"),
+            finding.get("file"),
+            finding.get("line"),
+            finding.get("function"),
+        )
+        if key in self.slots:
+            return
+
+        rule = self._intern_rule(finding)
+        confidence = finding.get("confidence") or 0.0
+        seq = self.next_seq
+        self.next_seq += 1
+
+        if len(self.line) < self.max_findings:
+            self.rule.append(rule)
+            self.file.append(self._intern_file(finding["file"]))
+            self.line.append(finding["line"])
+            self.function.append(finding.get("function"))
+            self.confidence.append(confidence)
+            self.seq.append(seq)
+            self.slots[key] = len(self.line) - 1
+            self._order = None
+            return
+
+        self.dropped += 1
+        if not self.line:
+            return
+        if not self.heap:
+            self.heap = [(self._rank(slot), slot) for slot in range(len(self.line))]
+            heapq.heapify(self.heap)
+
+        rank = (self.rule_rank[rule], confidence, -seq)
+        if rank > self.heap[0][0]:
+            # reuse the evicted row's slot
+            slot = self.heap[0][1]
+            del self.slots[self._key(slot)]
+            self.slots[key] = slot
+            self.rule[slot] = rule
+            self.file[slot] = self._intern_file(finding["file"])
+            self.line[slot] = finding["line"]
+            self.function[slot] = finding.get("function")
+            self.confidence[slot] = confidence
+            self.seq[slot] = seq
+            heapq.heapreplace(self.heap, (rank, slot))
+            self._order = None
+
+    def extend(self, findings: Iterable[Dict]):
+        for finding in findings:
+            self.add(finding)
+
+    def _intern_rule(self, finding: Dict) -> int:
+        index = self.rule_index.get(finding["rule_id"])
+        if index is None:
+            # engines copy these from the rule, so any finding will do
+            index = self.rule_index[finding["rule_id"]] = len(self.rules)
+            self.rules.append({k: finding.get(k) for k in RULE_FIELDS})
+            self.rule_rank.append(
+                SEVERITY_RANK.get(str(finding.get("severity", "")).lower(), -1)
+            )
+        return index
+
+    def _key(self, slot: int) -> Tuple:
+        return (
+            self.rules[self.rule[slot]]["rule_id"],
+            self.files[self.file[slot]],
+            self.line[slot],
+            self.function[slot],
+        )
+
+    def _rank(self, slot: int) -> Tuple:
+        return (self.rule_rank[self.rule[slot]], self.confidence[slot], -self.seq[slot])
+
+    def _intern_file(self, path: str) -> int:
+        index = self.file_index.get(path)
+        if index is None:
+            index = self.file_index[path] = len(self.files)
+            self.files.append(path)
+        return index
+
+    # ======================
+    # READ
+    # ======================
+    def order(self) -> List[int]:
+        """
+        Kept slots, in arrival order.
+        """
+        if self._order is None:
+            seq = self.seq
+            self._order = sorted(range(len(self.line)), key=seq.__getitem__)
+        return self._order
+
+    def location_order(self) -> List[int]:
+        """
+        Kept slots by (file, line, rule id), as SARIF lists them.
+        """
+        files, lines, rules = self.files, self.line, self.rules
+        return sorted(
+            self.order(),
+            key=lambda s: (files[self.file[s]], lines[s], rules[self.rule[s]]["rule_id"]),
+        )
+
+    def rule_of(self, slot: int) -> Dict:
+        return self.rules[self.rule[slot]]
+
+    def finding(self, slot: int) -> Dict:
+        rule = self.rules[self.rule[slot]]
+        f = {
+            "rule_id": rule["rule_id"],
+            "title": rule["title"],
+            "severity": rule["severity"],
+            "cwe": rule["cwe"],
+            "category": rule["category"],
+            "file": self.files[self.file[slot]],
+            "line": self.line[slot],
+            "function": self.function[slot],
+            "description": rule["description"],
+            "confidence": self.confidence[slot],
+            "remediation": rule["remediation"],
+        }
+        if self.validated is not None:
+            f["validated"] = bool(self.validated[slot])
+            f["decisionSource"] = self.decision_source
+            f["decisionTrace"] = list(self.trace_table[self.trace_codes[slot]])
+        extra = self.extra.get(slot)
+        if extra:
+            f.update(extra)
+        return f
+
+    def rule_ids(self) -> Iterator[str]:
+        rules, rule = self.rules, self.rule
+        return (rules[rule[s]]["rule_id"] for s in self.order())
+
+    def severities(self) -> List[str]:
+        rules, rule = self.rules, self.rule
+        return [rules[rule[s]]["severity"] for s in self.order()]
+
+    def __len__(self) -> int:
+        return len(self.line)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.finding(s) for s in self.order())
+
+    def __getitem__(self, index: int) -> Dict:
+        return self.finding(self.order()[index])
+
+    def metrics(self) -> Dict:
+        return {
+            "maxFindings": self.max_findings,
+            "kept": len(self.line),
+            "dropped": self.dropped,
+        }
@@ -1,8 +1,17 @@
 # Global function return taint summaries
 # MUST be reset once per scan
+#
+# Summaries may reference other functions ("@callee"). They are merged
+# from every parsed file first; solve() then computes the concrete
+# return taints over the call graph, one strongly connected component
+# at a time, so the result does not depend on file order.
+
+from typing import Dict, List, Set, Tuple
 
 FUNCTION_RETURNS = {}
 
+REF_PREFIX = "@"
+
 def reset():
     """
     Reset all recorded function summaries.
@@ -14,5 +23,162 @@ def record(function_name, taints):
     if taints:
         FUNCTION_RETURNS.setdefault(function_name, set()).update(taints)
 
+def merge(summaries):
+    """
+    Merge one file's {function: taints} summaries.
+    """
+    for name, taints in summaries.items():
+        record(name, taints)
+
 def get(function_name):
     return FUNCTION_RETURNS.get(function_name, set())
+
+def ref(function_name):
+    return REF_PREFIX + function_name
+
+def is_ref(taint):
+    return taint.startswith(REF_PREFIX)
+
+# =====================================================
+# CALL GRAPH
+# =====================================================
+def call_graph() -> Dict[str, List[str]]:
+    """
+    function -> summarized callees whose return flows into its return.
+    """
+    return {
+        name: sorted(
+            t[1:] for t in taints
+            if is_ref(t) and t[1:] in FUNCTION_RETURNS
+        )
+        for name, taints in sorted(FUNCTION_RETURNS.items())
+    }
+
+def strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Iterative Tarjan. Components come out callees-first
+    (reverse topological order of the condensed graph).
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+
+            edges = graph[node]
+            if i < len(edges):
+                work.append((node, i + 1))
+                callee = edges[i]
+                if callee not in index:
+                    work.append((callee, 0))
+                elif callee in on_stack:
+                    low[node] = min(low[node], index[callee])
+                continue
+
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+    return components
+
+# =====================================================
+# SOLVER
+# =====================================================
+def solve() -> Tuple[Dict[str, Set[str]], Dict[str, int]]:
+    """
+    Compute concrete return taints for every summarized function.
+
+    Components are solved callees-first, in the order Tarjan emits
+    them, so every callee outside a component is already resolved.
+    Inside a component a worklist iterates to a fixpoint. The solve is
+    pure-Python set work and runs in one thread: a thread pool only
+    contends for the GIL, and a process pool would pickle every level.
+
+    Returns (resolved, stats).
+    """
+    graph = call_graph()
+    components = strongly_connected_components(graph)
+
+    resolved: Dict[str, Set[str]] = {}
+    iterations = 0
+
+    for members in components:
+        local = {
+            m: {t for t in FUNCTION_RETURNS[m] if not is_ref(t)}
+            for m in members
+        }
+        callers: Dict[str, List[str]] = {m: [] for m in members}
+        for m in members:
+            for callee in graph[m]:
+                if callee in local:
+                    callers[callee].append(m)
+                else:
+                    local[m] |= resolved[callee]
+
+        worklist = list(members)
+        queued = set(members)
+        while worklist:
+            m = worklist.pop()
+            queued.discard(m)
+            iterations += 1
+
+            taints = set(local[m])
+            for callee in graph[m]:
+                if callee in callers:
+                    taints |= local[callee]
+
+            if taints != local[m]:
+                local[m] = taints
+                for caller in callers[m]:
+                    if caller not in queued:
+                        queued.add(caller)
+                        worklist.append(caller)
+
+        resolved.update(local)
+
+    stats = {
+        "functions": len(graph),
+        "components": len(components),
+        "largestComponent": max((len(c) for c in components), default=0),
+        "iterations": iterations,
+    }
+    return resolved, stats
+
+def resolve_pending(files: List[Dict], resolved: Dict[str, Set[str]]):
+    """
+    Append concrete flows for each file's pending summary references.
+    """
+    for file in files:
+        taint = file["taint"]
+        for p in taint.get("pending", []):
+            for src in sorted(resolved.get(p["ref"], ())):
+                taint["flows"].append({
+                    "source": src,
+                    "sink": p["sink"],
+                    "callee": p["callee"],
+                    "line": p["line"],
+                    "function": p["function"],
+                    "path": [src, p["callee"]],
+                })
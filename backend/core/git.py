@@ -1,3 +1,4 @@
+import os
 import subprocess
 
 
@@ -27,3 +28,62 @@ def git_info():
         }
     except Exception:
         return {}
+
+
+def changed_files(cwd, since=None, staged=False, rev_range=None):
+    """
+    Python files changed since a ref (working tree included, with
+    untracked files that are not ignored), in the index, or across a
+    commit range "a..b". Paths are absolute. Deleted files are left out.
+    """
+    cmd = ["git", "diff", "--name-only", "--relative", "--diff-filter=ACMR"]
+
+    if staged:
+        cmd.append("--cached")
+    elif rev_range:
+        cmd.append(rev_range)
+    elif since:
+        cmd.append(since)
+
+    out = subprocess.check_output(
+        cmd + ["--", "*.py"],
+        cwd=cwd,
+        stderr=subprocess.DEVNULL
+    ).decode()
+    paths = set(out.splitlines())
+
+    # new files are not in any diff until they are added
+    if since and not staged and not rev_range:
+        out = subprocess.check_output(
+            ["git", "ls-files", "--others", "--exclude-standard", "--", "*.py"],
+            cwd=cwd,
+            stderr=subprocess.DEVNULL
+        ).decode()
+        paths.update(out.splitlines())
+
+    base = os.path.abspath(cwd)
+    return sorted(
+        os.path.join(base, p) for p in paths if p.endswith(".py")
+    )
+
+
+def grep_files(cwd, pattern):
+    """
+    Tracked and untracked (not ignored) Python files with a whole-word
+    match of an extended regex. Absolute paths.
+    """
+    proc = subprocess.run(
+        ["git", "grep", "--untracked", "-l", "-w", "-E", "-e", pattern, "--", "*.py"],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    # exit status 1 means "no matches"
+    if proc.returncode not in (0, 1):
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+    base = os.path.abspath(cwd)
+    return sorted(
+        os.path.join(base, p) for p in proc.stdout.decode().splitlines()
+    )
@@ -1,9 +1,14 @@
 MAX_FILES = 5000
 MAX_FINDINGS = 10000
 
-def enforce_limits(files, findings):
-    if len(files) > MAX_FILES:
-        raise RuntimeError("File scan limit exceeded")
+# seconds one file may spend in parsing, and again in detection
+FILE_TIMEOUT = 10.0
+
+# higher is kept first when the finding budget is full
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+# Budgets degrade a scan instead of failing it: discovery stops at
+# MAX_FILES (the rest is never walked or parsed), and findings beyond
+# MAX_FINDINGS are dropped as they arrive, keeping the most severe and
+# confident ones (core.finding_store). The report says what was cut.
 
-    if len(findings) > MAX_FINDINGS:
-        raise RuntimeError("Finding limit exceeded")
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# longer literals are rarely repeated and would dominate the memory bound
+MAX_CACHED_LENGTH = 1024
+
+# (looks sensitive, matched keywords)
+Classification = Tuple[bool, FrozenSet[str]]
+
+
+class LiteralCache:
+    """
+    Bounded LRU memo of string literal -> classification, shared by
+    every file of a scan.
+
+    When `path` is given the memo is loaded from / saved to that file,
+    so repeated literals stay classified across scans. The caller puts
+    a classifier version in the path; a changed classifier starts empty.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries: "OrderedDict[str, Classification]" = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # ======================
+    # LOOKUP
+    # ======================
+    def get(self, value: str) -> Optional[Classification]:
+        result = self.entries.get(value)
+        if result is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self.entries.move_to_end(value)
+        return result
+
+    def get_many(self, values: Iterable[str]) -> List[Optional[Classification]]:
+        """
+        get() for each value, with one stats update for the batch.
+        """
+        entries = self.entries
+        touch = entries.move_to_end
+        results = []
+        hits = 0
+        for value in values:
+            result = entries.get(value)
+            if result is not None:
+                touch(value)
+                hits += 1
+            results.append(result)
+
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(results) - hits
+        return results
+
+    def put_many(self, results: Dict[str, Classification]):
+        """
+        put() for values that get_many() just missed.
+        """
+        entries = self.entries
+        for value, result in results.items():
+            if len(value) <= MAX_CACHED_LENGTH:
+                entries[value] = result
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def put(self, value: str, result: Classification):
+        if len(value) > MAX_CACHED_LENGTH:
+            return
+
+        self.entries[value] = result
+        self.entries.move_to_end(value)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def metrics(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self.entries),
+            "hitRate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "persisted": self.path is not None,
+        }
+
+    # ======================
+    # PERSISTENCE
+    # ======================
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # stored least-recently-used first
+        for value, sensitive, keywords in rows[-self.max_entries:]:
+            self.entries[value] = (sensitive, frozenset(keywords))
+
+    def save(self):
+        if not self.path or not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        rows = [
+            [value, sensitive, sorted(keywords)]
+            for value, (sensitive, keywords) in self.entries.items()
+        ]
+
+        # atomic, like ParseCache.put
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
@@ -0,0 +1,44 @@
+from typing import Dict, Iterable, Optional
+
+
+class DottedNameTrie:
+    """
+    Trie over dotted-name components ("os.path.join" -> os/path/join).
+
+    Forward tries answer "which entry is a prefix of this name"
+    (request.args.get -> request.args); reversed tries answer "which
+    entry is a suffix of it" (db.cursor.execute -> execute). Matches
+    only end on component boundaries; the longest match wins.
+    Each lookup costs O(depth of the name).
+    """
+
+    _END = None  # never a name component
+
+    def __init__(self, names: Iterable[str], reverse: bool = False):
+        self.reverse = reverse
+        self.root: Dict = {}
+
+        for name in names:
+            node = self.root
+            for part in self._parts(name):
+                node = node.setdefault(part, {})
+            node[self._END] = name
+
+    def _parts(self, name: str):
+        parts = name.split(".")
+        return reversed(parts) if self.reverse else parts
+
+    def match(self, name: str) -> Optional[str]:
+        node = self.root
+        best = None
+
+        for part in self._parts(name):
+            node = node.get(part)
+            if node is None:
+                break
+            best = node.get(self._END, best)
+
+        return best
+
+    def __contains__(self, name: str) -> bool:
+        return self.match(name) is not None
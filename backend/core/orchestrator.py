@@ -1,51 +1,129 @@
-from backend.core.repo_fetcher import RepoFetcher
 import os
-import json
-import traceback
-from typing import Dict
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from backend.agents.agent1_parser import CodeParsingAgent
-from backend.agents.agent2_rules import RuleEngineAgent
-from backend.agents.agent2_semantic_ast import SemanticASTEngine
+from backend.agents.agent1_parser import (
+    CodeParsingAgent,
+    ir_version,
+    is_ignored,
+    load_ignore_patterns,
+)
 from backend.agents.agent3a_validator import ReasoningAgent3A
 from backend.agents.agent3b_AI import FixGenerationAgent3B
 from backend.agents.agent4_report import ReportingAgent
 from backend.core.context import ScanContext
-from backend.rules.loader import load_all_rules
-from backend.core.dedupe import dedupe_findings
+from backend.core.finding_store import FindingStore, drop_superseded
+from backend.core.limits import FILE_TIMEOUT, MAX_FILES, MAX_FINDINGS
+from backend.core.literal_cache import LiteralCache
+from backend.core.parse_cache import ParseCache
+from backend.core.report_writer import (
+    ITEMS,
+    artifact_path,
+    open_artifact,
+    write_document,
+    write_json,
+)
+from backend.core.rule_bundle import compile_pack, load_bundle
+from backend.core.rule_profile import RuleProfile
+from backend.core.timeout import CANCELLED, Deadline, DeadlineExceeded
+from backend.core.tracing import NULL_TRACER, Tracer
+from backend.core import function_summaries
+from backend.core.function_summaries import is_ref
 
+# reports, relative to the working directory
+OUTPUT_DIR = "backend/output"
 
-class Orchestrator:
-    def _merge(self, taint, semantic):
-
-        merged = { (f["rule_id"], f["file"], f["line"]): f for f in semantic }
-
-        for f in taint:
-
-            key = (f["rule_id"], f["file"], f["line"])
-
-            merged[key] = f
-
-        return list(merged.values())
 
+class Orchestrator:
     """
     SINGLE source of execution order.
     """
 
-    def __init__(self, rules_dir: str, output_dir: str = "backend/output"):
+    def __init__(
+        self,
+        rules_dir: str,
+        output_dir: Optional[str] = OUTPUT_DIR,
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        stream: bool = False,
+        memory_cache_entries: int = 0,
+        trace_path: Optional[str] = None,
+        rule_profile: bool = False,
+        file_timeout: Optional[float] = FILE_TIMEOUT,
+        stage_timeout: Optional[float] = None,
+        max_files: Optional[int] = MAX_FILES,
+        max_findings: int = MAX_FINDINGS,
+        sarif_path: Optional[str] = None,
+        compact: bool = False,
+        compress: bool = False,
+    ):
         self.rules_dir = rules_dir
         self.output_dir = output_dir
+        self.jobs = jobs
+        self.stream = stream
+        # Chrome trace of each run's stages, files and engines
+        self.trace_path = trace_path
+        # per-rule evaluations, matches, time and findings in the report
+        self.rule_profile = rule_profile
+        # files over a deadline are skipped and reported, the scan goes on;
+        # stage_timeout bounds parsing and detection as a whole
+        self.file_timeout = file_timeout
+        self.stage_timeout = stage_timeout
+        # budgets: scan the first max_files files, keep the top findings
+        self.max_files = max_files
+        self.max_findings = max_findings
+        # artifacts are streamed to disk; SARIF goes to sarif_path when
+        # set (instead of <output_dir>/report.sarif)
+        self.sarif_path = sarif_path
+        self.compact = compact
+        self.compress = compress
 
         # ---------- LOAD RULES ----------
-        all_rules = load_all_rules(rules_dir)
-
-        taint_rules = [r for r in all_rules if r.get("type") == "taint"]
-        semantic_rules = [r for r in all_rules if r.get("type") == "semantic"]
+        # a fresh `compile-rules` bundle skips YAML parsing and compiling
+        pack = load_bundle(rules_dir)
+        self.rule_pack_source = "bundle" if pack else "yaml"
+        if pack is None:
+            from backend.rules.loader import load_all_rules
+            pack = compile_pack(load_all_rules(rules_dir))
+        self.rule_count = len(pack["rules"])
 
         # ---------- AGENTS ----------
-        self.parser = CodeParsingAgent()
-        self.rule_engine = RuleEngineAgent(taint_rules)
-        self.semantic_engine = SemanticASTEngine(semantic_rules)
+        # the parser tracks exactly the sources/sinks the taint rules use
+        # and matches structural patterns while it still has the AST
+        sources, sinks, patterns = pack["sources"], pack["sinks"], pack["patterns"]
+        self.rule_warnings = list(pack["warnings"])
+        self.superseded_by = pack["superseded_by"]
+
+        # long-running processes also keep parsed IR in memory
+        cache = (
+            ParseCache(
+                cache_dir,
+                ir_version(sources, sinks, patterns),
+                memory_entries=memory_cache_entries,
+            )
+            if cache_dir or memory_cache_entries else None
+        )
+        self.parser = CodeParsingAgent(
+            jobs=jobs,
+            cache=cache,
+            sources=sources,
+            sinks=sinks,
+            patterns=patterns,
+            file_timeout=file_timeout,
+        )
+        self.rule_engine = pack["rule_engine"]
+        self.semantic_engine = pack["semantic_engine"]
+        self.sequence_engine = pack["sequence_engine"]
+
+        # literal classifications are shared by all files and, with a
+        # cache dir, persisted next to the parse cache
+        self.secrets_engine = pack["secrets_engine"]
+        if cache_dir:
+            version = self.secrets_engine.classifier_version
+            self.secrets_engine.literal_cache = LiteralCache(
+                path=os.path.join(cache_dir, "literals", f"{version}.json")
+            )
+            self.secrets_engine.literal_cache.load()
         self.validator = ReasoningAgent3A()
         self.fix_generator = FixGenerationAgent3B()
         self.reporter = ReportingAgent()
@@ -53,78 +131,455 @@ class Orchestrator:
     # ======================
     # PIPELINE
     # ======================
-    def run(self, target_path: str) -> Dict:
+    def run(
+        self,
+        target_path: str,
+        files: Optional[List[str]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict:
+        """
+        Scan target_path. When `files` is given (e.g. from git diff),
+        only those files and the files their summaries affect are scanned.
+        Once `cancel` is set no new file is started and nothing is
+        written; the result is an error.
+        """
         context = ScanContext(target_path)
+        for warning in self.rule_warnings:
+            context.add_warning(warning)
+        context.add_metadata("rulePack", {
+            "source": self.rule_pack_source,
+            "rules": self.rule_count,
+        })
+        literal_cache = self.secrets_engine.literal_cache
+        literal_cache.reset_stats()
+
+        tracer = Tracer(enabled=bool(self.trace_path))
+        self.parser.tracer = tracer
+        profile = RuleProfile() if self.rule_profile else None
+        self._set_profile(profile)
 
         try:
-            # 1️⃣ PARSE
-            parsed_files = self.parser.parse(target_path)
-            context.add_metadata("filesParsed", len(parsed_files))
+            # 1️⃣ PARSE + 2️⃣ DETECT
+            scope = None
+            parsed: Dict[str, Dict] = {}
+            with tracer.stage("discover"):
+                if files is None:
+                    paths = self.parser.discover(target_path, limit=self.max_files)
+                else:
+                    scope, support, parsed = self._incremental_scope(target_path, files)
+                    # budget order: changed files, their callers, then
+                    # the support files only parsed for summaries
+                    changed = set(files)
+                    paths = sorted(scope, key=lambda p: (p not in changed, p)) + sorted(support)
+                    context.add_metadata("incremental", {
+                        "changedFiles": len(files),
+                        "scannedFiles": len(scope),
+                        "summaryFiles": len(support),
+                    })
+
+            truncated = self.max_files is not None and len(paths) > self.max_files
+            if truncated:
+                paths = paths[:self.max_files]
+                context.add_warning(f"File budget of {self.max_files} reached; remaining files not scanned")
+            if scope is not None:
+                paths.sort()
+            context.add_metadata("fileBudget", {
+                "maxFiles": self.max_files,
+                "truncated": truncated,
+            })
+
+            store = FindingStore(self.max_findings)
+            if self.stream:
+                scanned, skipped = self._detect_streaming(
+                    paths, scope, parsed, context, tracer, store, cancel
+                )
+            else:
+                scanned, skipped = self._detect_batch(
+                    paths, scope, parsed, context, tracer, store, cancel
+                )
+
+            context.add_metadata("filesParsed", scanned)
+            if skipped:
+                context.add_warning(f"{len(skipped)} file(s) skipped after a deadline")
+            context.add_metadata("skippedFiles", skipped)
+            if self.parser.cache:
+                context.add_metadata("parseCache", dict(self.parser.cache_stats))
 
-            # 2️⃣ DETECT
-            taint_findings = self.rule_engine.analyze(parsed_files)
-            from backend.core.timeout import time_limit
-            with time_limit(10):
-                semantic_findings = self.semantic_engine.analyze(parsed_files)
+            literal_cache.save()
+            context.add_metadata("literalCache", literal_cache.metrics())
 
-            findings = dedupe_findings(self._merge(taint_findings, semantic_findings))
-            from backend.core.limits import enforce_limits
-            enforce_limits(parsed_files, findings)
-            context.add_metadata("findingsDetected", len(findings))
+            taint_stats = self.parser.taint_stats
+            lookups = taint_stats["hits"] + taint_stats["misses"]
+            context.add_metadata("taintCache", {
+                **taint_stats,
+                "hitRate": round(taint_stats["hits"] / lookups, 3) if lookups else 0.0,
+            })
 
-            # 3️⃣ VALIDATE
-            validated = self.validator.validate(findings)
-            context.add_metadata("findingsValidated", len(validated))
+            if store.dropped:
+                context.add_warning(
+                    f"Finding budget of {self.max_findings} reached; "
+                    f"{store.dropped} lower-ranked finding(s) dropped"
+                )
+            context.add_metadata("findingBudget", store.metrics())
+            context.add_metadata("supersededFindings", store.superseded)
+            context.add_metadata("findingsDetected", len(store))
+
+            # 3️⃣ VALIDATE (in place, on the store's columns)
+            with tracer.stage("validate"):
+                validated = self.validator.validate_store(store)
+            context.add_metadata("findingsValidated", validated)
 
             # 4️⃣ FIXES
-            enriched = self.fix_generator.generate_fixes(validated)
+            with tracer.stage("fixes"):
+                self.fix_generator.generate_store_fixes(store)
 
             # 5️⃣ REPORT
-            sarif = self.reporter.generate_sarif(enriched)
-            dashboard = self.reporter.generate_dashboard_summary(enriched)
+            with tracer.stage("report"):
+                dashboard = self.reporter.dashboard_summary(store.severities())
+            # writing the files below is only in the trace
+            context.add_metadata("timings", tracer.summary())
+            if profile is not None:
+                profile.count_findings(store.rule_ids())
+                context.add_metadata("ruleProfile", profile.rows())
 
             report_json = {
                 "metadata": {
                     "tool": "Turing-Owl",
                     "version": "2.4.0",
                     **context.get_metadata(),
+                    "warnings": list(context.warnings),
                 },
                 "summary": dashboard,
-                "findings": enriched,
+                # a FindingStore: finding dicts are built as it is iterated
+                "findings": store,
             }
 
-            self._write_outputs(sarif, report_json, dashboard)
+            # whoever cancelled owns the outputs now (the daemon's client
+            # scans locally); partial reports must not replace theirs
+            if cancel is not None and cancel.is_set():
+                return {"error": "Scan cancelled", "details": [CANCELLED]}
+
+            # output_dir=None: the caller handles the returned result
+            if self.output_dir or self.sarif_path:
+                with tracer.stage("write"):
+                    self._write_outputs(report_json, dashboard)
 
             return {
-                "sarif": sarif,
                 "report": report_json,
                 "dashboard": dashboard,
             }
 
         except Exception as e:
             context.add_error(str(e))
+            import traceback
             context.add_error(traceback.format_exc())
             return {
                 "error": "Internal scanner failure",
                 "details": context.errors,
             }
 
+        finally:
+            self.parser.tracer = NULL_TRACER
+            self._set_profile(None)
+            if self.trace_path and not (cancel is not None and cancel.is_set()):
+                tracer.write(self.trace_path)
+
+    # ======================
+    # DETECTION MODES
+    # ======================
+    def _detect_batch(
+        self,
+        paths: List[str],
+        scope: Optional[Set[str]],
+        parsed: Dict[str, Dict],
+        context: ScanContext,
+        tracer: Tracer,
+        store: FindingStore,
+        cancel: Optional[threading.Event] = None,
+    ):
+        with tracer.stage("parse"):
+            parsed_files = list(self._iter_parsed(
+                paths, parsed, self._stage_deadline("parse", cancel)
+            ))
+        skipped = list(self.parser.skipped)
+
+        with tracer.stage("summaries"):
+            function_summaries.reset()
+            for file in parsed_files:
+                function_summaries.merge(file.get("summaries", {}))
+
+            parsed_files = [
+                f for f in parsed_files
+                if scope is None or f["filePath"] in scope
+            ]
+            function_summaries.resolve_pending(
+                parsed_files, self._solve_summaries(context)
+            )
+
+        stage = self._stage_deadline("detect", cancel)
+        with tracer.stage("detect"):
+            for file in parsed_files:
+                skip = self._detect_file(file, stage, tracer, store)
+                if skip:
+                    skipped.append(skip)
+
+        return len(parsed_files), skipped
+
+    def _detect_streaming(
+        self,
+        paths: List[str],
+        scope: Optional[Set[str]],
+        parsed: Dict[str, Dict],
+        context: ScanContext,
+        tracer: Tracer,
+        store: FindingStore,
+        cancel: Optional[threading.Event] = None,
+    ):
+        """
+        Detect on each file as soon as it is parsed, then drop its IR.
+        Only findings, return summaries and pending flows are retained;
+        pending flows are resolved and matched once all files are seen.
+        """
+        scanned = 0
+        pending: List[Dict] = []
+        skipped: List[Dict] = []
+
+        # parsing and detection interleave, so they share one deadline
+        stage = self._stage_deadline("parse/detect", cancel)
+        function_summaries.reset()
+        files = self._iter_parsed(paths, parsed, stage)
+        while True:
+            with tracer.stage("parse"):
+                file = next(files, None)
+            if file is None:
+                break
+            function_summaries.merge(file.get("summaries", {}))
+
+            if scope is not None and file["filePath"] not in scope:
+                continue
+            scanned += 1
+
+            if file["taint"].get("pending"):
+                pending.append({
+                    "filePath": file["filePath"],
+                    "taint": {"flows": [], "pending": file["taint"]["pending"]},
+                })
+
+            with tracer.stage("detect", file=file["filePath"]):
+                skip = self._detect_file(file, stage, tracer, store)
+            if skip:
+                skipped.append(skip)
+
+        skipped[:0] = self.parser.skipped
+
+        with tracer.stage("summaries"):
+            function_summaries.resolve_pending(
+                pending, self._solve_summaries(context)
+            )
+        with tracer.stage("detect"):
+            for file in pending:
+                store.extend(self.rule_engine.analyze_file(file))
+
+        return scanned, skipped
+
+    def _iter_parsed(
+        self, paths: List[str], parsed: Dict[str, Dict], deadline: Deadline
+    ) -> Iterator[Dict]:
+        """
+        IR of each path, in path order: taken from `parsed` (what the
+        incremental scope already parsed) when there, parsed otherwise.
+        """
+        fresh = self.parser.iter_paths([p for p in paths if p not in parsed], deadline)
+        ir = next(fresh, None)
+        for path in paths:
+            if path in parsed:
+                yield parsed.pop(path)
+            elif ir is not None and ir["filePath"] == path:
+                yield ir
+                ir = next(fresh, None)
+
+    def _detect_file(
+        self,
+        file: Dict,
+        stage: Deadline,
+        tracer: Tracer,
+        store: FindingStore,
+    ) -> Optional[Dict]:
+        """
+        Run every engine on one file and add its findings to the store.
+        On a deadline the engines that finished keep their findings and
+        a skip record is returned.
+        """
+        taint_findings: List[Dict] = []
+        semantic_findings: List[Dict] = []
+        deadline = Deadline(
+            self.file_timeout,
+            f"detection exceeded {self.file_timeout}s",
+            parent=stage,
+        )
+        engine = None
+        try:
+            deadline.check()
+            for engine, agent, out in (
+                ("taint", self.rule_engine, taint_findings),
+                ("semantic", self.semantic_engine, semantic_findings),
+                ("sequence", self.sequence_engine, semantic_findings),
+                ("secrets", self.secrets_engine, semantic_findings),
+            ):
+                with tracer.span(engine, "engine", file=file["filePath"]):
+                    out.extend(agent.analyze_file(file, deadline))
+        except DeadlineExceeded as e:
+            reason = f"{e} (in {engine})" if engine else str(e)
+            return {"file": file["filePath"], "stage": "detect", "reason": reason}
+        finally:
+            # the store dedupes; the first of a repeated key is kept
+            findings = semantic_findings + taint_findings
+            if self.superseded_by:
+                kept = drop_superseded(findings, self.superseded_by)
+                store.superseded += len(findings) - len(kept)
+                findings = kept
+            store.extend(findings)
+        return None
+
+    def _stage_deadline(
+        self, stage: str, cancel: Optional[threading.Event] = None
+    ) -> Deadline:
+        return Deadline(
+            self.stage_timeout,
+            f"{stage} stage exceeded {self.stage_timeout}s",
+            cancel=cancel,
+        )
+
+    def _set_profile(self, profile: Optional[RuleProfile]):
+        for engine in (
+            self.rule_engine, self.semantic_engine,
+            self.sequence_engine, self.secrets_engine,
+        ):
+            engine.profile = profile
+
+    def _solve_summaries(self, context: ScanContext):
+        """
+        Whole-program summary phase over everything merged so far.
+        """
+        resolved, stats = function_summaries.solve()
+        context.add_metadata("summaries", stats)
+        return resolved
+
+    # ======================
+    # INCREMENTAL SCOPE
+    # ======================
+    def _incremental_scope(
+        self, target_path: str, changed: List[str]
+    ) -> Tuple[Set[str], Set[str], Dict[str, Dict]]:
+        """
+        Returns (scope, support, parsed):
+          scope   - changed files plus, transitively, files calling a
+                    function whose return summary lives in scope
+          support - files defining functions that scope calls; parsed
+                    for their summaries only, never reported on
+          parsed  - path -> IR of every file parsed on the way, so
+                    detection does not parse them again
+        """
+        from backend.core.git import grep_files
+
+        base = os.path.abspath(target_path)
+        ignores = load_ignore_patterns(base)
+        changed = [
+            p for p in changed
+            if os.path.exists(p)
+            and not is_ignored(os.path.relpath(p, base), ignores)
+        ]
+
+        scope: Set[str] = set(changed)
+        frontier = list(changed)
+        refs: Set[str] = set()
+        parsed: Dict[str, Dict] = {}
+
+        while frontier:
+            names = set()
+            for file in self.parser.parse_paths(frontier):
+                parsed[file["filePath"]] = file
+                summaries = file.get("summaries", {})
+                names.update(summaries)
+                refs.update(
+                    t[1:] for taints in summaries.values()
+                    for t in taints if is_ref(t)
+                )
+                refs.update(p["ref"] for p in file["taint"].get("pending", []))
+
+            if not names:
+                break
+            callers = grep_files(base, self._alternation(names))
+            frontier = [p for p in callers if p not in scope]
+            scope.update(frontier)
+
+        support: Set[str] = set()
+        pending = {r for r in refs if r.isidentifier()}
+        seen = set()
+
+        while pending:
+            seen |= pending
+            pattern = "def[[:space:]]+" + self._alternation(pending)
+            found = [
+                p for p in grep_files(base, pattern)
+                if p not in scope and p not in support
+            ]
+            support.update(found)
+
+            pending = set()
+            for file in self.parser.parse_paths(found):
+                parsed[file["filePath"]] = file
+                for taints in file.get("summaries", {}).values():
+                    pending.update(
+                        t[1:] for t in taints
+                        if is_ref(t) and t[1:].isidentifier()
+                    )
+            pending -= seen
+
+        return scope, support, parsed
+
+    def _alternation(self, names: Set[str]) -> str:
+        return "(" + "|".join(sorted(names)) + ")"
+
     # ======================
     # OUTPUT
     # ======================
-    def _write_outputs(self, sarif: dict, report: dict, dashboard: dict):
-        os.makedirs(self.output_dir, exist_ok=True)
+    def _write_outputs(self, report: dict, dashboard: dict):
+        """
+        Stream the artifacts to disk one result / finding at a time;
+        the SARIF document is never built in memory.
+        """
+        compact, compress = self.compact, self.compress
+        store = report["findings"]
+
+        # an explicit --output is written as named, uncompressed
+        if self.sarif_path:
+            sarif_path, sarif_gz = self.sarif_path, False
+        else:
+            sarif_path = artifact_path(self.output_dir, "report.sarif", compress)
+            sarif_gz = compress
+        ordered = store.location_order()
+        rules = self.reporter.sarif_rules(store.rule_of(slot) for slot in ordered)
+        with open_artifact(sarif_path, sarif_gz) as f:
+            write_document(
+                f,
+                self.reporter.sarif_document(rules, ITEMS),
+                (self.reporter.sarif_result(store.finding(slot)) for slot in ordered),
+                compact,
+            )
 
-        with open(os.path.join(self.output_dir, "report.sarif"), "w", encoding="utf-8") as f:
-            json.dump(sarif, f, indent=2)
+        if not self.output_dir:
+            return
 
-        with open(os.path.join(self.output_dir, "report.json"), "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2)
+        path = artifact_path(self.output_dir, "report.json", compress)
+        with open_artifact(path, compress) as f:
+            write_document(f, {**report, "findings": ITEMS}, store, compact)
 
-        with open(os.path.join(self.output_dir, "dashboard.json"), "w", encoding="utf-8") as f:
-            json.dump(dashboard, f, indent=2)
+        path = artifact_path(self.output_dir, "dashboard.json", compress)
+        write_json(path, dashboard, compact, compress)
 
     def scan_repo(self, repo_url: str, ref: str | None = None):
+        from backend.core.repo_fetcher import RepoFetcher
         fetcher = RepoFetcher()
         try:
             local_path = fetcher.clone(repo_url, ref)
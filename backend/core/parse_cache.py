@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# running total of entry bytes, next to the entry directories
+SIZE_FILE = "size"
+
+
+class ParseCache:
+    """
+    Content-addressed on-disk cache of per-file parser IR.
+
+    Entries are keyed by sha256(parser version + file bytes), so a file
+    is re-parsed only when its contents or the parser change.
+    Least-recently-used entries are evicted past max_bytes; the total
+    is tracked in SIZE_FILE, so checking it does not walk the cache.
+
+    Long-running processes (the scan daemon) can also keep up to
+    `memory_entries` serialized entries in memory; with no cache_dir
+    the cache is memory-only. Entries are stored serialized so every
+    hit is a fresh copy the caller may mutate.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str],
+        version: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_entries: int = 0,
+    ):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory: "OrderedDict[str, str]" = OrderedDict()
+
+    def __getstate__(self):
+        # pool workers get the settings, not the in-memory entries
+        state = dict(self.__dict__)
+        state["memory"] = OrderedDict()
+        return state
+
+    # ======================
+    # KEYS
+    # ======================
+    def key(self, source: bytes) -> str:
+        h = hashlib.sha256()
+        h.update(self.version.encode())
+        h.update(b"\0")
+        h.update(source)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    # ======================
+    # READ / WRITE
+    # ======================
+    def get(self, key: str) -> Optional[Dict]:
+        text = self.memory.get(key)
+        if text is not None:
+            self.memory.move_to_end(key)
+            return json.loads(text)
+
+        if not self.cache_dir:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            entry = json.loads(text)
+            os.utime(path)  # LRU: refresh on hit
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, text)
+        return entry
+
+    def put(self, key: str, entry: Dict) -> int:
+        """
+        Store entry; returns the bytes written to disk.
+        """
+        text = json.dumps(entry, separators=(",", ":"))
+        self._remember(key, text)
+
+        if not self.cache_dir:
+            return 0
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # atomic: concurrent workers may write the same key
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            return 0
+        # ensure_ascii: one byte per character
+        return len(text)
+
+    def _remember(self, key: str, text: str):
+        if not self.memory_entries:
+            return
+        self.memory[key] = text
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    # ======================
+    # EVICTION
+    # ======================
+    def evict(self, written: int = 0):
+        """
+        Account for `written` new bytes and, once the total passes
+        max_bytes, drop least-recently-used entries until it fits.
+
+        Only that case (or a missing size file) walks the cache; the
+        walk then rewrites the size file with the measured total, which
+        corrects any drift from rewritten or externally removed entries.
+        """
+        if not self.cache_dir:
+            return
+
+        total = self._read_size()
+        if total is not None:
+            total += written
+            if total <= self.max_bytes:
+                self._write_size(total)
+                return
+
+        self._write_size(self._evict_walk())
+
+    def _evict_walk(self) -> int:
+        entries = []
+        total = 0
+
+        for root, _, files in os.walk(self.cache_dir):
+            for file in files:
+                if not file.endswith(".json"):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if total <= self.max_bytes:
+            return total
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+        return total
+
+    def _read_size(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.cache_dir, SIZE_FILE), encoding="utf-8") as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, total: int):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(total))
+            os.replace(tmp, os.path.join(self.cache_dir, SIZE_FILE))
+        except OSError:
+            pass
@@ -0,0 +1,346 @@
+import ast
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+# Semgrep-style structural patterns, compiled once into Python AST
+# matchers:
+#
+#   $X            metavariable; binds any expression (or a def name),
+#                 repeated uses must bind the same code
+#   ...           any argument list / statement sequence / expression
+#   "prefix..."   any string literal starting with "prefix"
+#   def $F(...):  any function, whatever its parameters
+#
+# Every compiled pattern has a cheap prefilter - the node type, an
+# anchor (e.g. the called function's last name) and the keyword
+# arguments it requires - so structural matching only runs on the few
+# nodes that can possibly match.
+
+PATTERN_KEYS = ("pattern", "pattern-either", "pattern-inside")
+
+MV_PREFIX = "__mv_"
+ELLIPSIS_PARAMS = "__ellipsis_params"
+
+IGNORED_FIELDS = {
+    "ctx", "type_comment", "kind",
+    "lineno", "col_offset", "end_lineno", "end_col_offset",
+}
+
+_METAVAR = re.compile(r"\$([A-Z_][A-Z0-9_]*)")
+_DEF_ANY_PARAMS = re.compile(r"(def\s+[\w$]+\s*)\(\s*\.\.\.\s*\)")
+
+
+def has_patterns(rule: Dict) -> bool:
+    return any(k in rule for k in PATTERN_KEYS)
+
+
+class Pattern:
+    """
+    One compiled pattern and its prefilter.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+
+        text = _DEF_ANY_PARAMS.sub(rf"\1(*{ELLIPSIS_PARAMS})", source.strip())
+        text = _METAVAR.sub(rf"{MV_PREFIX}\1", text)
+        body = ast.parse(text).body
+        if len(body) != 1:
+            raise ValueError("pattern must be a single statement or expression")
+
+        node = body[0]
+        self.node = node.value if isinstance(node, ast.Expr) else node
+        self.type = type(self.node)
+        self.anchor = _anchor(self.node)
+        self.keywords: Set[str] = (
+            {k.arg for k in self.node.keywords if k.arg}
+            if isinstance(self.node, ast.Call) else set()
+        )
+
+    def prefilter(self, node: ast.AST) -> bool:
+        if self.keywords:
+            # an either-alternative is tried on whatever the required
+            # pattern matched, which need not be a call
+            if not isinstance(node, ast.Call):
+                return False
+            present = {k.arg for k in node.keywords}
+            if not self.keywords <= present:
+                return False
+        return True
+
+    def match(self, node: ast.AST, bindings: Dict) -> bool:
+        return self.prefilter(node) and _match(self.node, node, bindings)
+
+
+class PatternSet:
+    """
+    All pattern rules of a scan, indexed by (node type, anchor).
+    Picklable, so pool workers receive it compiled.
+    """
+
+    def __init__(self, rules: List[Dict]):
+        self.rules: List[Tuple[str, Optional[Pattern], List[Pattern], List[Pattern]]] = []
+        self.index: Dict[Tuple[type, Optional[str]], List[Tuple[int, Pattern]]] = {}
+        self.errors: List[str] = []
+
+        for rule in rules:
+            if not has_patterns(rule):
+                continue
+            try:
+                compiled = self._compile(rule)
+            except (SyntaxError, ValueError) as e:
+                self.errors.append(f"{rule.get('id')}: invalid pattern ({e})")
+                continue
+            if compiled:
+                self.rules.append(compiled)
+
+        for i, (_, required, either, _) in enumerate(self.rules):
+            for p in ([required] if required else either):
+                self.index.setdefault((p.type, p.anchor), []).append((i, p))
+
+        self.types = {t for t, _ in self.index}
+        self.inside_types = {
+            p.type for _, _, _, inside in self.rules for p in inside
+        }
+        self.hooked = self.types | self.inside_types
+        self.fingerprint = hashlib.sha1(json.dumps(
+            [[r[0]] + [p.source for p in self._patterns(r)] for r in self.rules]
+        ).encode()).hexdigest()[:12]
+
+    def _compile(self, rule: Dict):
+        def patterns(value):
+            values = value if isinstance(value, list) else [value]
+            out = []
+            for v in values:
+                if isinstance(v, dict):
+                    v = v.get("pattern")
+                if not v:
+                    continue
+                try:
+                    out.append(Pattern(v))
+                except SyntaxError as e:
+                    # keep the rule alive if only some alternatives are bad
+                    self.errors.append(f"{rule.get('id')}: skipped pattern {v!r} ({e.msg})")
+            return out
+
+        required = patterns(rule["pattern"]) if "pattern" in rule else []
+        either = patterns(rule.get("pattern-either", []))
+        inside = patterns(rule.get("pattern-inside", []))
+
+        if "pattern" in rule and not required:
+            return None
+        if "pattern-either" in rule and not either:
+            return None
+        if not required and not either:
+            return None
+
+        return (rule["id"], required[0] if required else None, either, inside)
+
+    def _patterns(self, compiled) -> List[Pattern]:
+        _, required, either, inside = compiled
+        return ([required] if required else []) + either + inside
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    # ======================
+    # MATCHING
+    # ======================
+    def match(self, node: ast.AST, ancestors: List[ast.AST]) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        (rule id, bindings) for every rule matching `node`.
+        `ancestors` holds the enclosing nodes of pattern-inside types,
+        outermost first, including node itself when it is one.
+        """
+        if type(node) not in self.types:
+            return []
+
+        t = type(node)
+        candidates = self.index.get((t, _anchor(node)), [])
+        wildcard = self.index.get((t, None), [])
+        if not candidates and not wildcard:
+            return []
+
+        results = []
+        done = set()
+        for i, p in candidates + wildcard:
+            if i in done:
+                continue
+
+            bindings: Dict = {}
+            if not p.match(node, bindings):
+                continue
+
+            rule_id, required, either, inside = self.rules[i]
+            if required and either:
+                if not any(alt.match(node, dict(bindings)) for alt in either):
+                    continue
+
+            if inside and not all(
+                any(ip.match(a, dict(bindings)) for a in reversed(ancestors)
+                    if isinstance(a, ip.type))
+                for ip in inside
+            ):
+                continue
+
+            done.add(i)
+            results.append((rule_id, _render_bindings(bindings)))
+
+        return results
+
+
+# =====================================================
+# STRUCTURAL MATCHING
+# =====================================================
+def _anchor(node: ast.AST) -> Optional[str]:
+    """
+    Cheap discriminator shared by patterns and code:
+    called name, assigned value type, asserted name. None for a
+    metavariable: such patterns go to the (type, None) bucket, which
+    is checked for every node of the type.
+    """
+    if isinstance(node, ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            return None if _is_metavar(func.attr) else func.attr
+        if isinstance(func, ast.Name):
+            return None if _is_metavar(func.id) else func.id
+        return None
+
+    if isinstance(node, ast.Assign):
+        if isinstance(node.value, ast.Name) and _is_metavar(node.value.id):
+            return None
+        return type(node.value).__name__
+
+    if isinstance(node, ast.Assert):
+        test = node.test
+        if isinstance(test, ast.Name):
+            return None if _is_metavar(test.id) else test.id
+        return type(test).__name__
+
+    return None
+
+
+def _is_metavar(name) -> bool:
+    return isinstance(name, str) and name.startswith(MV_PREFIX)
+
+
+def _is_ellipsis(node) -> bool:
+    if isinstance(node, ast.Expr):
+        node = node.value
+    return isinstance(node, ast.Constant) and node.value is Ellipsis
+
+
+def _bind(bindings: Dict, name: str, value) -> bool:
+    if name in bindings:
+        bound = bindings[name]
+        if isinstance(bound, ast.AST) and isinstance(value, ast.AST):
+            return ast.dump(bound) == ast.dump(value)
+        return bound == value
+    bindings[name] = value
+    return True
+
+
+def _match(p, n, bindings: Dict) -> bool:
+    if isinstance(p, ast.Name) and _is_metavar(p.id):
+        return isinstance(n, ast.expr) and _bind(bindings, p.id, n)
+
+    if _is_ellipsis(p) and isinstance(n, ast.expr):
+        return True
+
+    if type(p) is not type(n):
+        return False
+
+    if isinstance(p, ast.Constant):
+        if isinstance(p.value, str) and isinstance(n.value, str):
+            if p.value.endswith("..."):
+                return n.value.startswith(p.value[:-3])
+            return p.value == n.value
+        return type(p.value) is type(n.value) and p.value == n.value
+
+    if isinstance(p, ast.Call):
+        return _match_call(p, n, bindings)
+
+    if isinstance(p, ast.FunctionDef):
+        if _is_metavar(p.name):
+            if not _bind(bindings, p.name, n.name):
+                return False
+        elif p.name != n.name:
+            return False
+        if not (p.args.vararg and p.args.vararg.arg == ELLIPSIS_PARAMS):
+            if not _match(p.args, n.args, bindings):
+                return False
+        return _match_seq(p.body, n.body, bindings)
+
+    for field in p._fields:
+        if field in IGNORED_FIELDS:
+            continue
+        pv, nv = getattr(p, field, None), getattr(n, field, None)
+
+        if isinstance(pv, list):
+            if not isinstance(nv, list) or not _match_seq(pv, nv, bindings):
+                return False
+        elif isinstance(pv, ast.AST):
+            if not isinstance(nv, ast.AST) or not _match(pv, nv, bindings):
+                return False
+        elif _is_metavar(pv):
+            if not _bind(bindings, pv, nv):
+                return False
+        elif pv != nv:
+            return False
+
+    return True
+
+
+def _match_call(p: ast.Call, n: ast.Call, bindings: Dict) -> bool:
+    if not _match(p.func, n.func, bindings):
+        return False
+
+    if not _match_seq(p.args, n.args, bindings):
+        return False
+
+    # keywords are unordered; extra ones are fine only after "..."
+    actual = {k.arg: k.value for k in n.keywords}
+    for kw in p.keywords:
+        if kw.arg not in actual or not _match(kw.value, actual[kw.arg], bindings):
+            return False
+
+    if len(n.keywords) > len(p.keywords):
+        return any(_is_ellipsis(a) for a in p.args)
+
+    return True
+
+
+def _match_seq(ps: List, ns: List, bindings: Dict, i: int = 0, j: int = 0) -> bool:
+    if i == len(ps):
+        return j == len(ns)
+
+    if _is_ellipsis(ps[i]):
+        for k in range(j, len(ns) + 1):
+            snapshot = dict(bindings)
+            if _match_seq(ps, ns, bindings, i + 1, k):
+                return True
+            bindings.clear()
+            bindings.update(snapshot)
+        return False
+
+    if j == len(ns):
+        return False
+
+    snapshot = dict(bindings)
+    if _match(ps[i], ns[j], bindings) and _match_seq(ps, ns, bindings, i + 1, j + 1):
+        return True
+    bindings.clear()
+    bindings.update(snapshot)
+    return False
+
+
+def _render_bindings(bindings: Dict) -> Dict[str, str]:
+    return {
+        "$" + name[len(MV_PREFIX):]: (
+            ast.unparse(value) if isinstance(value, ast.AST) else str(value)
+        )
+        for name, value in sorted(bindings.items())
+    }
@@ -13,27 +13,42 @@ class RepoFetcher:
     def __init__(self):
         self.base_dir = tempfile.mkdtemp(prefix="turing-owl-")
 
-    def clone(self, repo_url: str, ref: Optional[str] = None) -> str:
+    def clone(
+        self, repo_url: str, ref: Optional[str] = None, timeout: Optional[float] = None
+    ) -> str:
+        """
+        Shallow clone of repo_url at ref (branch, tag or commit).
+        Raises subprocess.CalledProcessError / TimeoutExpired; the
+        error's stderr holds git's message.
+        """
         repo_name = repo_url.rstrip("/").split("/")[-1].replace(".git", "")
         target_path = os.path.join(self.base_dir, repo_name)
 
+        if ref:
+            try:
+                # branches and tags clone shallow directly
+                self._git(["clone", "--depth", "1", "--branch", ref, repo_url, target_path], timeout=timeout)
+                return target_path
+            except subprocess.CalledProcessError:
+                # a commit: needs history to check out
+                shutil.rmtree(target_path, ignore_errors=True)
+                self._git(["clone", "--no-checkout", repo_url, target_path], timeout=timeout)
+                self._git(["checkout", "--detach", ref, "--"], cwd=target_path, timeout=timeout)
+                return target_path
+
+        self._git(["clone", "--depth", "1", repo_url, target_path], timeout=timeout)
+        return target_path
+
+    def _git(self, args, cwd: Optional[str] = None, timeout: Optional[float] = None):
         subprocess.run(
-            ["git", "clone", "--depth", "1", repo_url, target_path],
+            ["git", *args],
+            cwd=cwd,
             stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout,
             check=True,
         )
 
-        if ref:
-            subprocess.run(
-                ["git", "checkout", ref],
-                cwd=target_path,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-
-        return target_path
-
     def cleanup(self):
         shutil.rmtree(self.base_dir, ignore_errors=True)
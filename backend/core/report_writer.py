@@ -0,0 +1,79 @@
+import gzip
+import io
+import json
+import os
+from typing import Dict, IO, Iterable
+
+# Incremental JSON writers for scan artifacts.
+#
+# A document is dumped around one placeholder list (SARIF results,
+# report findings) whose items are serialised and written one at a
+# time, so no full document or output string is ever built. Pretty
+# output is byte-for-byte what json.dump(document, indent=2) writes.
+
+ITEMS = "\x00items\x00"
+
+INDENT = 2
+
+
+def artifact_path(output_dir: str, name: str, compress: bool = False) -> str:
+    return os.path.join(output_dir, name + (".gz" if compress else ""))
+
+
+def open_artifact(path: str, compress: bool = False) -> IO[str]:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if compress:
+        # mtime=0: identical scans give identical archives
+        raw = gzip.GzipFile(path, "wb", compresslevel=6, mtime=0)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def write_document(
+    fp: IO[str], document: Dict, items: Iterable, compact: bool = False
+):
+    """
+    Write `document` with the ITEMS placeholder replaced by `items`.
+    """
+    indent = None if compact else INDENT
+    separators = (",", ":") if compact else None
+
+    text = json.dumps(document, indent=indent, separators=separators)
+    head, tail = text.split(json.dumps(ITEMS), 1)
+    fp.write(head)
+
+    if compact:
+        fp.write("[")
+        first = True
+        for item in items:
+            if not first:
+                fp.write(",")
+            fp.write(json.dumps(item, separators=separators))
+            first = False
+        fp.write("]")
+    else:
+        # the placeholder's line holds the list's indentation level
+        line = head[head.rfind("\n") + 1:]
+        level = len(line) - len(line.lstrip(" "))
+        pad = "\n" + " " * (level + INDENT)
+
+        fp.write("[")
+        first = True
+        for item in items:
+            if not first:
+                fp.write(",")
+            fp.write(pad + json.dumps(item, indent=INDENT).replace("\n", pad))
+            first = False
+        fp.write("]" if first else "\n" + " " * level + "]")
+
+    fp.write(tail)
+
+
+def write_json(path: str, document: Dict, compact: bool = False, compress: bool = False):
+    with open_artifact(path, compress) as fp:
+        if compact:
+            json.dump(document, fp, separators=(",", ":"))
+        else:
+            json.dump(document, fp, indent=INDENT)
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.agents.agent1_parser import taint_vocabulary
+from backend.agents.agent2_rules import RuleEngineAgent
+from backend.agents.agent2_semantic import SemanticRuleEngine
+from backend.agents.agent2_semantic_ast import SemanticASTEngine
+from backend.agents.semantic_sequence_engine import SemanticSequenceEngine
+from backend.core.pattern_matcher import PatternSet
+from backend.core.rule_validator import check_rule
+
+# Precompiled rule pack.
+#
+# `compile-rules` validates the YAML pack once and pickles the rules
+# together with every compiled index built from them. The scanner loads
+# the bundle instead of parsing YAML as long as it is fresh: same rule
+# files and same compiler code, compared by (mtime, size) and, when
+# those differ, by content hash.
+#
+# The bundle is a pickle: only load bundles you compiled yourself.
+
+# Bump whenever the bundle layout changes.
+BUNDLE_FORMAT = 2
+
+BUNDLE_NAME = "rules.bundle"
+
+# modules whose objects are pickled into the bundle
+COMPILER_MODULES = (
+    "backend.agents.agent1_parser",
+    "backend.agents.agent2_rules",
+    "backend.agents.agent2_semantic",
+    "backend.agents.agent2_semantic_ast",
+    "backend.agents.semantic_sequence_engine",
+    "backend.core.aho_corasick",
+    "backend.core.ast_matcher",
+    "backend.core.literal_cache",
+    "backend.core.pattern_matcher",
+    "backend.core.rule_bundle",
+)
+
+
+def default_bundle_path(rules_dir: str) -> str:
+    return os.path.join(rules_dir, BUNDLE_NAME)
+
+
+# =====================================================
+# COMPILE
+# =====================================================
+def compile_pack(rules: List[Dict]) -> Dict:
+    """
+    Every index the scanner builds from a rule pack.
+    """
+    taint_rules = [r for r in rules if r.get("type") == "taint"]
+    semantic_rules = [r for r in rules if r.get("type") == "semantic"]
+
+    sources, sinks = taint_vocabulary(taint_rules)
+    patterns = PatternSet(semantic_rules)
+
+    # rule id -> ids of the rules whose hit on the same line replaces it
+    superseded_by: Dict[str, Set[str]] = {}
+    for rule in rules:
+        for target in rule.get("supersedes", []):
+            superseded_by.setdefault(target, set()).add(rule["id"])
+
+    return {
+        "rules": rules,
+        "sources": sources,
+        "sinks": sinks,
+        "patterns": patterns,
+        "warnings": list(patterns.errors),
+        "superseded_by": superseded_by,
+        "rule_engine": RuleEngineAgent(taint_rules),
+        "semantic_engine": SemanticASTEngine(semantic_rules),
+        "sequence_engine": SemanticSequenceEngine(semantic_rules),
+        "secrets_engine": SemanticRuleEngine(semantic_rules),
+    }
+
+
+def compile_rules(
+    rules_dir: str, bundle_path: Optional[str] = None
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Validate the YAML pack and write its bundle.
+    Returns (bundle path, errors); nothing is written on errors.
+    """
+    import yaml
+
+    bundle_path = bundle_path or default_bundle_path(rules_dir)
+
+    rules: List[Dict] = []
+    errors: List[str] = []
+    seen_ids: set = set()
+
+    for rel in _rule_files(rules_dir):
+        try:
+            with open(os.path.join(rules_dir, rel), encoding="utf-8") as f:
+                rule = yaml.safe_load(f)
+        except Exception as e:
+            errors.append(f"{rel}: invalid YAML ({e})")
+            continue
+
+        problems = check_rule(rel, rule, seen_ids)
+        errors.extend(problems)
+        if not problems:
+            rules.append(rule)
+
+    ids = {rule["id"] for rule in rules}
+    for rule in rules:
+        for target in rule.get("supersedes", []):
+            if target not in ids:
+                errors.append(f"{rule['id']}: supersedes unknown rule '{target}'")
+
+    if errors:
+        return None, errors
+
+    # a pattern that does not parse would be skipped on every scan
+    pack = compile_pack(rules)
+    if pack["warnings"]:
+        return None, pack["warnings"]
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "manifest": _manifest(rules_dir),
+        "pack": pack,
+    }
+
+    directory = os.path.dirname(os.path.abspath(bundle_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, bundle_path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+    return bundle_path, []
+
+
+# =====================================================
+# LOAD
+# =====================================================
+def load_bundle(rules_dir: str, bundle_path: Optional[str] = None) -> Optional[Dict]:
+    """
+    The compiled pack, or None when there is no usable bundle or it is
+    stale (the caller then falls back to YAML).
+    """
+    bundle_path = bundle_path or default_bundle_path(rules_dir)
+
+    try:
+        with open(bundle_path, "rb") as f:
+            bundle = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # corrupt, or pickled by incompatible code
+        return None
+
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        return None
+    if not _is_fresh(bundle["manifest"], rules_dir):
+        return None
+
+    return bundle["pack"]
+
+
+# =====================================================
+# FRESHNESS
+# =====================================================
+def _rule_files(rules_dir: str) -> List[str]:
+    found = []
+    for root, dirs, files in os.walk(rules_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".yaml"):
+                found.append(os.path.relpath(os.path.join(root, file), rules_dir))
+    return found
+
+
+def rules_signature(rules_dir: str) -> Tuple:
+    """
+    Cheap change detector for long-running processes: (name, mtime,
+    size) of every rule file and of the bundle.
+    """
+    signature = []
+    for rel in _rule_files(rules_dir) + [BUNDLE_NAME]:
+        try:
+            st = os.stat(os.path.join(rules_dir, rel))
+        except OSError:
+            continue
+        signature.append((rel, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _tracked_files(rules_dir: str) -> Dict[str, str]:
+    """
+    Manifest key -> path: every rule file and compiler module.
+    """
+    tracked = {
+        "rules/" + rel: os.path.join(rules_dir, rel)
+        for rel in _rule_files(rules_dir)
+    }
+    for name in COMPILER_MODULES:
+        module = sys.modules.get(name)
+        if module is not None and getattr(module, "__file__", None):
+            tracked["code/" + name] = module.__file__
+    return tracked
+
+
+def _manifest(rules_dir: str) -> Dict[str, Tuple[int, int, str]]:
+    manifest = {}
+    for key, path in _tracked_files(rules_dir).items():
+        st = os.stat(path)
+        manifest[key] = (st.st_mtime_ns, st.st_size, _digest(path))
+    return manifest
+
+
+def _is_fresh(manifest: Dict[str, Tuple[int, int, str]], rules_dir: str) -> bool:
+    tracked = _tracked_files(rules_dir)
+    if set(tracked) != set(manifest):
+        return False
+
+    for key, path in tracked.items():
+        mtime, size, digest = manifest[key]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == (mtime, size):
+            continue
+        # touched (e.g. by a checkout) - fresh if the content is the same
+        if st.st_size != size or _digest(path) != digest:
+            return False
+
+    return True
+
+
+def _digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, List, Optional
+
+# Per-rule cost accounting, opt-in (`--rule-profile`).
+#
+# Engines hold `profile = None` and only pay for accounting when the
+# orchestrator hands them a RuleProfile for a run. An evaluation is one
+# rule checked against one candidate (a taint flow, a call, a file);
+# a match is a hit before dedupe and confidence filtering; findings are
+# counted on the deduplicated result.
+#
+# `pattern` rules are matched inside the parser's AST walk and
+# `sequence` rules share one automaton, so those only report matches
+# and findings, not evaluations or time.
+
+
+class RuleProfile:
+    def __init__(self):
+        # rule id -> [engine, evaluations, matches, nanoseconds, findings]
+        self.stats: Dict[str, List] = {}
+
+    def record(
+        self,
+        rule_id: str,
+        engine: str,
+        elapsed: int = 0,
+        matches: int = 0,
+        evaluations: int = 1,
+    ):
+        entry = self.stats.get(rule_id)
+        if entry is None:
+            entry = self.stats[rule_id] = [engine, 0, 0, 0, 0]
+        entry[1] += evaluations
+        entry[2] += matches
+        entry[3] += elapsed
+
+    def count_findings(self, rule_ids: Iterable[str]):
+        """
+        One finding per rule id given.
+        """
+        for rule_id in rule_ids:
+            entry = self.stats.get(rule_id)
+            if entry is not None:
+                entry[4] += 1
+
+    def rows(self) -> List[Dict]:
+        """
+        One row per rule, most expensive first.
+        """
+        rows = [
+            {
+                "rule": rule_id,
+                "engine": engine,
+                "evaluations": evaluations,
+                "matches": matches,
+                "findings": findings,
+                "seconds": round(elapsed / 1e9, 6),
+            }
+            for rule_id, (engine, evaluations, matches, elapsed, findings)
+            in self.stats.items()
+        ]
+        rows.sort(key=lambda r: (-r["seconds"], -r["matches"], r["rule"]))
+        return rows
+
+
+def format_profile(rows: List[Dict], top: Optional[int] = None) -> str:
+    """
+    Ranked text table of RuleProfile.rows().
+    """
+    # shares are of every rule's time, not just the rows shown
+    total = sum(r["seconds"] for r in rows) or 1.0
+    rows = rows[:top] if top else rows
+    width = max([len("rule")] + [len(r["rule"]) for r in rows])
+
+    lines = [
+        f"{'rule':<{width}}  {'engine':<8} {'evals':>8} {'matches':>8} "
+        f"{'findings':>8} {'ms':>9} {'%':>5}"
+    ]
+    for r in rows:
+        lines.append(
+            f"{r['rule']:<{width}}  {r['engine']:<8} {r['evaluations']:>8} "
+            f"{r['matches']:>8} {r['findings']:>8} {r['seconds'] * 1000:>9.2f} "
+            f"{r['seconds'] / total * 100:>5.1f}"
+        )
+    return "\n".join(lines)
@@ -1,5 +1,23 @@
 import os
-import yaml
+
+# Rule schema (one YAML object per file, schema_version 1).
+#
+# Required: REQUIRED_FIELDS below. Optional: cwe, category, remediation,
+# and what the engines match on:
+#   taint rules      sources / sinks
+#   semantic rules   match: (callee index), pattern / pattern-either /
+#                    pattern-inside (structural), sequence: (ordered
+#                    events), string_contains / min_string_length /
+#                    function_name_contains / call_name_contains
+#                    (literal and name heuristics)
+#
+#   supersedes       list of rule ids. When this rule and a listed rule
+#                    report the same line of the same file, only this
+#                    rule's finding is kept; use it for a more specific
+#                    rule that always overlaps a general one. The
+#                    number of findings dropped this way is reported
+#                    as `supersededFindings` in the report metadata.
+#                    compile-rules rejects unknown ids.
 
 ALLOWED_TYPES = {"taint", "semantic"}
 ALLOWED_SEVERITIES = {"low", "medium", "high", "critical"}
@@ -16,6 +34,8 @@ REQUIRED_FIELDS = {
 
 
 def validate_rules(path: str):
+    import yaml
+
     errors = []
     seen_ids = set()
 
@@ -33,38 +53,54 @@ def validate_rules(path: str):
                 errors.append(f"{file}: invalid YAML ({e})")
                 continue
 
-            if not isinstance(rule, dict):
-                errors.append(f"{file}: rule must be a YAML object")
-                continue
+            errors.extend(check_rule(file, rule, seen_ids))
+
+    return errors
+
+
+def check_rule(file: str, rule, seen_ids: set):
+    """
+    Schema errors of one parsed rule. `seen_ids` collects rule ids
+    across calls to catch duplicates.
+    """
+    errors = []
+
+    if not isinstance(rule, dict):
+        return [f"{file}: rule must be a YAML object"]
+
+    # ---------- required fields ----------
+    missing = REQUIRED_FIELDS - rule.keys()
+    if missing:
+        errors.append(f"{file}: missing fields {sorted(missing)}")
+
+    # ---------- schema ----------
+    if rule.get("schema_version") != 1:
+        errors.append(f"{file}: invalid schema_version")
+
+    # ---------- id ----------
+    rid = rule.get("id")
+    if rid in seen_ids:
+        errors.append(f"{file}: duplicate rule id '{rid}'")
+    seen_ids.add(rid)
+
+    # ---------- type ----------
+    rtype = rule.get("type")
+    if rtype not in ALLOWED_TYPES:
+        errors.append(f"{file}: invalid type '{rtype}'")
+
+    # ---------- severity ----------
+    severity = rule.get("severity")
+    if severity not in ALLOWED_SEVERITIES:
+        errors.append(f"{file}: invalid severity '{severity}'")
+
+    # ---------- confidence ----------
+    conf = rule.get("confidence")
+    if not isinstance(conf, (int, float)) or not (0 <= conf <= 1):
+        errors.append(f"{file}: confidence must be between 0 and 1")
 
-            # ---------- required fields ----------
-            missing = REQUIRED_FIELDS - rule.keys()
-            if missing:
-                errors.append(f"{file}: missing fields {sorted(missing)}")
-
-            # ---------- schema ----------
-            if rule.get("schema_version") != 1:
-                errors.append(f"{file}: invalid schema_version")
-
-            # ---------- id ----------
-            rid = rule.get("id")
-            if rid in seen_ids:
-                errors.append(f"{file}: duplicate rule id '{rid}'")
-            seen_ids.add(rid)
-
-            # ---------- type ----------
-            rtype = rule.get("type")
-            if rtype not in ALLOWED_TYPES:
-                errors.append(f"{file}: invalid type '{rtype}'")
-
-            # ---------- severity ----------
-            severity = rule.get("severity")
-            if severity not in ALLOWED_SEVERITIES:
-                errors.append(f"{file}: invalid severity '{severity}'")
-
-            # ---------- confidence ----------
-            conf = rule.get("confidence")
-            if not isinstance(conf, (int, float)) or not (0 <= conf <= 1):
-                errors.append(f"{file}: confidence must be between 0 and 1")
+    # ---------- supersedes ----------
+    supersedes = rule.get("supersedes", [])
+    if not isinstance(supersedes, list) or not all(isinstance(s, str) for s in supersedes):
+        errors.append(f"{file}: supersedes must be a list of rule ids")
 
     return errors
@@ -1,35 +1,65 @@
-import sys
 import threading
-from contextlib import contextmanager
+import time
+from typing import Optional
 
-class TimeoutError(Exception):
+# Cooperative deadlines.
+#
+# Work that may run long polls `Deadline.check()` at safe points (per
+# call, per function, between engines) and stops by raising
+# DeadlineExceeded. Unlike SIGALRM this works in any thread and in
+# worker processes, and the caller decides what to keep: the
+# orchestrator records the file as skipped and carries on. A deadline
+# can also carry a cancel event, set from another thread (e.g. when the
+# daemon's client hangs up), that expires it and every child at once.
+
+
+class DeadlineExceeded(TimeoutError):
     pass
 
-@contextmanager
-def time_limit(seconds):
-    if sys.platform != "win32":
-        # Unix-safe SIGALRM
-        import signal
-
-        def signal_handler(signum, frame):
-            raise TimeoutError("Operation timed out")
-
-        old_handler = signal.signal(signal.SIGALRM, signal_handler)
-        signal.alarm(seconds)
-        try:
-            yield
-        finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
-
-    else:
-        # Windows-safe timer
-        timer = threading.Timer(
-            seconds,
-            lambda: (_ for _ in ()).throw(TimeoutError("Operation timed out"))
-        )
-        timer.start()
-        try:
-            yield
-        finally:
-            timer.cancel()
+
+CANCELLED = "scan cancelled"
+
+
+class Deadline:
+    """
+    Expires `seconds` from now (never when None), with `parent`, or
+    once `cancel` is set, whichever comes first - e.g. a file deadline
+    inside a stage one.
+    """
+
+    __slots__ = ("expires", "reason", "cancel")
+
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        reason: str = "",
+        parent: Optional["Deadline"] = None,
+        cancel: Optional[threading.Event] = None,
+    ):
+        self.expires = time.monotonic() + seconds if seconds is not None else None
+        self.reason = reason or f"exceeded {seconds}s"
+        self.cancel = cancel
+
+        if parent is not None:
+            if parent.expires is not None:
+                if self.expires is None or parent.expires < self.expires:
+                    self.expires = parent.expires
+                    self.reason = parent.reason
+            if self.cancel is None:
+                self.cancel = parent.cancel
+
+    def expired(self) -> bool:
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = CANCELLED
+            return True
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self):
+        if self.expires is not None and time.monotonic() >= self.expires:
+            raise DeadlineExceeded(self.reason)
+        if self.cancel is not None and self.cancel.is_set():
+            raise DeadlineExceeded(CANCELLED)
+
+
+# never expires
+NO_DEADLINE = Deadline()
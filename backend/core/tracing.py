@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Scan tracing.
+#
+# Stages (parse, detect, validate, ...) are always timed - there are a
+# handful per scan - and summarised in the report metadata. Spans for
+# individual files and engines are only recorded when tracing is
+# enabled; otherwise `span()` hands back a shared no-op.
+#
+# Timestamps come from perf_counter_ns, which is system-wide on the
+# platforms we run on, so spans recorded in parser worker processes
+# line up with the main process.
+
+# (name, category, start ns, duration ns, pid, tid, args)
+Span = Tuple[str, str, int, int, int, int, Optional[Dict]]
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        if self.cat == "stage":
+            stages = self.tracer.stages
+            stages[self.name] = stages.get(self.name, 0) + duration
+        if self.tracer.enabled:
+            self.tracer.add(self.name, self.cat, self.start, duration, args=self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.origin = time.perf_counter_ns()
+        self.stages: Dict[str, int] = {}
+        self.spans: List[Span] = []
+
+    # ======================
+    # RECORDING
+    # ======================
+    def stage(self, name: str, **args) -> _Span:
+        """
+        Time a pipeline stage. Repeated stages (e.g. per-file detection
+        when streaming) add up in the summary.
+        """
+        return _Span(self, name, "stage", args or None)
+
+    def span(self, name: str, cat: str = "file", **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def add(
+        self,
+        name: str,
+        cat: str,
+        start: int,
+        duration: int,
+        pid: Optional[int] = None,
+        tid: Optional[int] = None,
+        args: Optional[Dict] = None,
+    ):
+        """
+        Record a finished span; `pid` for spans timed in another process.
+        """
+        self.spans.append((
+            name, cat, start, duration,
+            pid if pid is not None else os.getpid(),
+            tid if tid is not None else threading.get_ident(),
+            args,
+        ))
+
+    # ======================
+    # EXPORT
+    # ======================
+    def summary(self) -> Dict:
+        total = time.perf_counter_ns() - self.origin
+        return {
+            "totalSeconds": round(total / 1e9, 4),
+            "stages": {
+                name: round(duration / 1e9, 4)
+                for name, duration in self.stages.items()
+            },
+        }
+
+    def chrome_trace(self) -> Dict:
+        """
+        Chrome trace event format (chrome://tracing, Perfetto).
+        """
+        events = []
+        threads: Dict[Tuple[int, int], int] = {}
+
+        for name, cat, start, duration, pid, tid, args in self.spans:
+            # small stable thread ids read better than get_ident() values
+            tid = threads.setdefault((pid, tid), len(threads))
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# parser and engines default to this; never enabled, nothing recorded
+NULL_TRACER = Tracer()
@@ -1,29 +1,279 @@
+import os
 import sys
-import json
 import argparse
-from backend.core.orchestrator import Orchestrator
+
+from backend.core.limits import FILE_TIMEOUT, MAX_FILES, MAX_FINDINGS
+
+# The orchestrator, git helpers and rule compiler are imported where
+# they are used, so `--help` and argument errors return immediately.
+
+RULES_DIR = "backend/rules"
+OUTPUT_DIR = "backend/output"
+
+# rows of the --rule-profile table; report.json has every rule
+RULE_PROFILE_TOP = 20
+
+
+def compile_rules_main(argv):
+    """
+    compile-rules: validate the rule pack and write its bundle, which
+    scans then load instead of the YAML files while it is fresh.
+    """
+    parser = argparse.ArgumentParser(prog="compile-rules")
+    parser.add_argument("--rules-dir", default=RULES_DIR)
+    args = parser.parse_args(argv)
+
+    from backend.core.rule_bundle import compile_rules
+    path, errors = compile_rules(args.rules_dir)
+    if errors:
+        for error in errors:
+            print(f"ERROR: {error}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Rule bundle written to {path}")
+
+
+def serve_main(argv):
+    """
+    serve: keep rules, parsed files and caches warm between scans;
+    scans from this CLI are sent to it while it runs.
+    """
+    parser = argparse.ArgumentParser(prog="serve")
+    parser.add_argument("--rules-dir", default=RULES_DIR)
+    parser.add_argument("--socket", default=None,
+                        help="Unix socket path (default: $TURING_OWL_SOCKET or a per-user temp path)")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="parse in N worker processes; parsed files are only kept "
+             "in memory with 1 (use --cache-dir otherwise)",
+    )
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args(argv)
+
+    from backend.core.daemon import ScanDaemon, default_socket_path, serve
+    socket_path = args.socket or default_socket_path()
+    daemon = ScanDaemon(args.rules_dir, jobs=args.jobs, cache_dir=args.cache_dir)
+
+    print(f"Serving scans on {socket_path}")
+    try:
+        serve(daemon, socket_path)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def scan_repos_main(argv):
+    """
+    scan-repos: clone and scan many repositories concurrently, writing
+    one JSON line per repository as each one finishes.
+    """
+    parser = argparse.ArgumentParser(prog="scan-repos")
+    parser.add_argument("repos_file", help='one "URL [REF]" per line; "-" reads stdin')
+    parser.add_argument("--out", default="-", help="JSON lines output (default: stdout)")
+    parser.add_argument("--rules-dir", default=RULES_DIR)
+    parser.add_argument("--clone-jobs", type=int, default=4)
+    parser.add_argument("--scan-jobs", type=int, default=None,
+                        help="scanner processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="cloned repositories waiting for a scanner (default: 2 x scan jobs)")
+    parser.add_argument("--clone-timeout", type=float, default=600)
+    args = parser.parse_args(argv)
+
+    from backend.cloud.batch import BatchScanner, read_repo_list
+
+    if args.repos_file == "-":
+        repos = read_repo_list(sys.stdin)
+    else:
+        with open(args.repos_file, encoding="utf-8") as f:
+            repos = read_repo_list(f)
+
+    scanner = BatchScanner(
+        args.rules_dir,
+        clone_jobs=args.clone_jobs,
+        scan_jobs=args.scan_jobs,
+        max_pending=args.max_pending,
+        clone_timeout=args.clone_timeout,
+    )
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        stats = scanner.run(repos, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(
+        f"Scanned {stats['ok']}/{stats['repos']} repositories in {stats['seconds']}s "
+        f"({stats['clone_failed']} clone failures, {stats['scan_failed']} scan failures)",
+        file=sys.stderr,
+    )
+    if stats["ok"] < stats["repos"]:
+        sys.exit(1)
 
 
 def main():
+    if sys.argv[1:2] == ["compile-rules"]:
+        return compile_rules_main(sys.argv[2:])
+    if sys.argv[1:2] == ["serve"]:
+        return serve_main(sys.argv[2:])
+    if sys.argv[1:2] == ["scan-repos"]:
+        return scan_repos_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser()
     parser.add_argument("target_path")
     parser.add_argument("--sarif", action="store_true")
     parser.add_argument("--output", default="result.sarif")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="parse files in N worker processes",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help="reuse parsed file IR across scans from this directory",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="detect per file as it is parsed (bounded memory)",
+    )
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--since", metavar="REF",
+                       help="scan only files changed since REF, and untracked files")
+    scope.add_argument("--staged", action="store_true",
+                       help="scan only staged files")
+    scope.add_argument("--range", dest="rev_range", metavar="A..B",
+                       help="scan only files changed in a commit range")
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="scan in this process even if `serve` is running "
+             "(the daemon uses its own --jobs / --cache-dir)",
+    )
+    parser.add_argument("--socket", default=None, help="daemon socket path")
+    parser.add_argument(
+        "--daemon-timeout", type=float, default=600.0, metavar="SECONDS",
+        help="scan in this process if the daemon has not answered "
+             "within this long (default: 600)",
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE", default=None,
+        help="write stage, file and engine timings as a Chrome trace "
+             "(open in chrome://tracing or Perfetto)",
+    )
+    parser.add_argument(
+        "--rule-profile", action="store_true",
+        help="count evaluations, matches, time and findings per rule "
+             "and print the most expensive rules",
+    )
+    parser.add_argument(
+        "--file-timeout", type=float, default=FILE_TIMEOUT, metavar="SECONDS",
+        help=f"skip a file that takes longer to parse, or to check (default: {FILE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--stage-timeout", type=float, default=None, metavar="SECONDS",
+        help="stop starting new files once parsing or detection has run this long",
+    )
+    parser.add_argument(
+        "--max-files", type=int, default=MAX_FILES,
+        help=f"scan at most N files, in walk order (default: {MAX_FILES})",
+    )
+    parser.add_argument(
+        "--max-findings", type=int, default=MAX_FINDINGS,
+        help=f"keep the N most severe findings (default: {MAX_FINDINGS})",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="write reports without indentation (smaller, faster)",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true",
+        help="gzip the reports in backend/output and add .gz to their names; "
+             "a --sarif --output file is written as named, uncompressed",
+    )
     args = parser.parse_args()
 
-    orchestrator = Orchestrator(rules_dir="backend/rules")
-    result = orchestrator.run(args.target_path)
+    # with --sarif the SARIF is written straight to --output, once
+    sarif_path = args.output if args.sarif else None
+
+    files = None
+    if args.since or args.staged or args.rev_range:
+        from backend.core.git import changed_files
+        try:
+            files = changed_files(
+                args.target_path,
+                since=args.since,
+                staged=args.staged,
+                rev_range=args.rev_range,
+            )
+        except Exception as e:
+            print(f"ERROR: git diff failed ({e})", file=sys.stderr)
+            sys.exit(1)
+
+    result = None
+    if not args.no_daemon:
+        from backend.core.daemon import request
+        result = request({
+            "command": "scan",
+            "cwd": os.getcwd(),
+            "target": args.target_path,
+            "files": files,
+            "stream": args.stream,
+            "output_dir": OUTPUT_DIR,
+            "trace": args.trace,
+            "rule_profile": args.rule_profile,
+            "file_timeout": args.file_timeout,
+            "stage_timeout": args.stage_timeout,
+            "max_files": args.max_files,
+            "max_findings": args.max_findings,
+            "sarif_path": sarif_path,
+            "compact": args.compact,
+            "compress": args.gzip,
+            # findings are on disk; only the summary comes back
+            "summary_only": True,
+        }, args.socket, read_timeout=args.daemon_timeout)
+
+        # a scan that failed in the daemon is retried in this process
+        if result is not None and "error" in result:
+            print(
+                f"WARNING: daemon scan failed ({result['error']}); scanning locally",
+                file=sys.stderr,
+            )
+            result = None
+
+    if result is None:
+        from backend.core.orchestrator import Orchestrator
+        orchestrator = Orchestrator(
+            rules_dir=RULES_DIR,
+            output_dir=OUTPUT_DIR,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            stream=args.stream,
+            trace_path=args.trace,
+            rule_profile=args.rule_profile,
+            file_timeout=args.file_timeout,
+            stage_timeout=args.stage_timeout,
+            max_files=args.max_files,
+            max_findings=args.max_findings,
+            sarif_path=sarif_path,
+            compact=args.compact,
+            compress=args.gzip,
+        )
+        result = orchestrator.run(args.target_path, files=files)
+
+    if args.trace:
+        print(f"Trace written to {args.trace}", file=sys.stderr)
+
+    if args.rule_profile and "report" in result:
+        from backend.core.rule_profile import format_profile
+        rows = result["report"]["metadata"].get("ruleProfile", [])
+        print(format_profile(rows, top=RULE_PROFILE_TOP), file=sys.stderr)
 
     # SARIF output (machine-readable ONLY)
     if args.sarif:
-        sarif = result.get("sarif")
-        if not sarif:
+        if "error" in result:
             print("ERROR: SARIF data not generated", file=sys.stderr)
             sys.exit(1)
 
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(sarif, f, indent=2)
-
         print(f"SARIF written to {args.output}")
         return
 
@@ -40,6 +290,16 @@ def main():
         f"Low: {by_sev.get('low', 0)}"
     )
 
+    metadata = result.get("report", {}).get("metadata", {})
+    skipped = metadata.get("skippedFiles", [])
+    if skipped:
+        print(f"Skipped {len(skipped)} file(s) past a deadline (see skippedFiles in report.json)")
+    if metadata.get("fileBudget", {}).get("truncated"):
+        print(f"File budget reached: only the first {args.max_files} files were scanned")
+    dropped = metadata.get("findingBudget", {}).get("dropped", 0)
+    if dropped:
+        print(f"Finding budget reached: {dropped} lower-ranked finding(s) dropped")
+
 
 if __name__ == "__main__":
     main()
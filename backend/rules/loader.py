@@ -6,8 +6,10 @@ from typing import List, Dict
 def load_all_rules(rules_dir: str) -> List[Dict]:
     rules: List[Dict] = []
 
-    for root, _, files in os.walk(rules_dir):
-        for file in files:
+    # sorted, so rule order does not depend on the filesystem
+    for root, dirs, files in os.walk(rules_dir):
+        dirs.sort()
+        for file in sorted(files):
             if not file.endswith(".yaml"):
                 continue
 
@@ -0,0 +1,80 @@
+import io
+import json
+
+from backend.cloud.batch import BatchScanner, read_repo_list
+from backend.tests.conftest import RULES_DIR, git
+
+
+def bare_repo(tmp_path, files):
+    work = tmp_path / "work"
+    work.mkdir()
+    for rel, text in files.items():
+        (work / rel).write_text(text)
+    git("init", "-q", "-b", "main", cwd=work)
+    git("add", ".", cwd=work)
+    git("commit", "-q", "-m", "init", cwd=work)
+    bare = tmp_path / "repo.git"
+    git("clone", "-q", "--bare", str(work), str(bare))
+    return bare
+
+
+def test_read_repo_list():
+    lines = ["# repos", "", "https://x/a.git", "https://x/b.git v1  # pinned"]
+
+    assert read_repo_list(lines) == [("https://x/a.git", None), ("https://x/b.git", "v1")]
+
+
+def test_batch_scan_of_local_bare_repositories(tmp_path):
+    bare = bare_repo(tmp_path, {"app.py": "import os\n\ndef f(cmd):\n    os.system(cmd)\n    eval(cmd)\n"})
+    repos = [
+        (str(bare), None),
+        (str(bare), "main"),
+        (str(bare), "no-such-ref"),
+        (str(tmp_path / "missing.git"), None),
+    ]
+    out = io.StringIO()
+
+    stats = BatchScanner(RULES_DIR, clone_jobs=2, scan_jobs=1).run(repos, out)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    by_repo = {(r["repo"], r["ref"]): r for r in records}
+    assert len(records) == 4
+
+    for ref in (None, "main"):
+        ok = by_repo[(str(bare), ref)]
+        assert ok["status"] == "ok"
+        assert ok["summary"]["totalVulnerabilities"] == len(ok["findings"]) > 0
+
+    assert by_repo[(str(bare), "no-such-ref")]["status"] == "clone_failed"
+    assert by_repo[(str(tmp_path / "missing.git"), None)]["status"] == "clone_failed"
+    assert {k: stats[k] for k in ("repos", "ok", "clone_failed", "scan_failed")} == {
+        "repos": 4, "ok": 2, "clone_failed": 2, "scan_failed": 0,
+    }
+
+
+def test_failing_run_does_not_wait_for_blocked_clones(tmp_path):
+    import threading
+
+    import pytest
+
+    class FullDisk(io.StringIO):
+        def write(self, text):
+            raise OSError("disk full")
+
+    bare = bare_repo(tmp_path, {"app.py": "x = 1\n"})
+    scanner = BatchScanner(RULES_DIR, clone_jobs=4, scan_jobs=1, max_pending=1)
+    errors = []
+
+    def run():
+        try:
+            scanner.run([(str(bare), None)] * 4, FullDisk())
+        except OSError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(60)
+
+    if thread.is_alive():
+        pytest.fail("run() hung on clones waiting for a slot")
+    assert [str(e) for e in errors] == ["disk full"]
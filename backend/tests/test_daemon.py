@@ -0,0 +1,127 @@
+import json
+import socket
+import sys
+import threading
+import time
+
+from backend import main as cli
+from backend.core.daemon import ScanDaemon, request, watch_client
+from backend.tests.conftest import RULES_DIR
+
+
+def fake_daemon(path, response):
+    """
+    Accept one connection and read its request; answer with `response`,
+    or never answer when it is None. Returns a stop callback.
+    """
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    done = threading.Event()
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            if response is not None:
+                conn.sendall(json.dumps(response).encode() + b"\n")
+            done.wait()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+
+    def stop():
+        done.set()
+        thread.join()
+        server.close()
+    return stop
+
+
+def test_no_daemon(tmp_path):
+    assert request({"command": "ping"}, str(tmp_path / "none.sock")) is None
+
+
+def test_silent_daemon_times_out(tmp_path):
+    path = str(tmp_path / "d.sock")
+    stop = fake_daemon(path, None)
+    try:
+        start = time.monotonic()
+        assert request({"command": "ping"}, path, read_timeout=0.2) is None
+        assert time.monotonic() - start < 5
+    finally:
+        stop()
+
+
+def test_scan_falls_back_to_local_when_the_daemon_fails(project, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "d.sock")
+    output = tmp_path / "output"
+    monkeypatch.setattr(cli, "RULES_DIR", RULES_DIR)
+    monkeypatch.setattr(cli, "OUTPUT_DIR", str(output))
+    monkeypatch.setattr(sys, "argv", ["main", str(project), "--socket", path])
+
+    stop = fake_daemon(path, {"error": "Internal scanner failure", "details": []})
+    try:
+        cli.main()
+    finally:
+        stop()
+
+    captured = capsys.readouterr()
+    assert "daemon scan failed (Internal scanner failure); scanning locally" in captured.err
+    assert "Scan completed." in captured.out
+    assert (output / "report.json").exists()
+
+
+def test_hang_up_cancels_the_scan():
+    client, server = socket.socketpair()
+    cancel, done = threading.Event(), threading.Event()
+    watcher = threading.Thread(target=watch_client, args=(server, cancel, done))
+    watcher.start()
+
+    client.close()
+    watcher.join(timeout=5)
+
+    assert cancel.is_set()
+    done.set()
+    server.close()
+
+
+def test_cancelled_scan_writes_nothing(project, tmp_path):
+    output = tmp_path / "output"
+    cancel = threading.Event()
+    cancel.set()
+
+    result = ScanDaemon(RULES_DIR).handle({
+        "target": str(project),
+        "output_dir": str(output),
+        "trace": str(tmp_path / "trace.json"),
+    }, cancel)
+
+    assert result["error"] == "Scan cancelled"
+    assert not output.exists()
+    assert not (tmp_path / "trace.json").exists()
+
+
+def test_requests_do_not_inherit_options(project, tmp_path):
+    import os
+
+    daemon = ScanDaemon(RULES_DIR)
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    cwd = os.getcwd()
+
+    daemon.handle({
+        "cwd": str(first),
+        "target": str(project),
+        "output_dir": "out",
+        "compact": True,
+        "max_findings": 1,
+    })
+    result = daemon.handle({"cwd": str(second), "target": os.path.relpath(project, second)})
+
+    assert os.getcwd() == cwd
+    assert (first / "out" / "report.json").exists()
+    # no output_dir: the default, relative to this request's cwd
+    report = second / "backend" / "output" / "report.json"
+    assert report.read_text().startswith("{\n")
+    assert len(result["report"]["findings"]) > 1
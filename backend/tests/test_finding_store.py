@@ -0,0 +1,53 @@
+from backend.core.finding_store import FindingStore
+
+
+def finding(severity="high", line=1, function=None, confidence=0.9, file="a.py"):
+    # one rule per severity: rules carry it, not findings
+    return {
+        "rule_id": severity,
+        "title": severity,
+        "severity": severity,
+        "cwe": None,
+        "category": None,
+        "file": file,
+        "line": line,
+        "function": function,
+        "description": "d",
+        "confidence": confidence,
+        "remediation": None,
+    }
+
+
+def test_dedupes_on_the_stable_key():
+    store = FindingStore()
+    store.extend([finding(), finding(), finding(function="f"), finding(line=2)])
+
+    assert [(f["line"], f["function"]) for f in store] == [(1, None), (1, "f"), (2, None)]
+
+
+def test_keeps_the_top_findings_in_arrival_order():
+    store = FindingStore(max_findings=2)
+    store.extend([
+        finding(line=1, severity="low"),
+        finding(line=2, severity="critical"),
+        finding(line=3, severity="medium"),
+        finding(line=4, severity="low"),
+    ])
+
+    assert [f["line"] for f in store] == [2, 3]
+    assert store.metrics() == {"maxFindings": 2, "kept": 2, "dropped": 2}
+
+
+def test_dedupe_keys_are_bounded_by_the_budget():
+    store = FindingStore(max_findings=10)
+    for line in range(1000):
+        store.add(finding(line=line, confidence=line / 2000))
+
+    assert len(store.slots) == 10
+    assert sorted(f["line"] for f in store) == list(range(990, 1000))
+
+    # an evicted finding is ranked again, a kept one is still a repeat
+    store.add(finding(line=0, severity="critical"))
+    store.add(finding(line=999))
+    assert len(store.slots) == 10
+    assert [f["line"] for f in store][-1] == 0
@@ -0,0 +1,25 @@
+from backend.core import function_summaries as fs
+
+
+def test_solve_resolves_cycles_callees_first():
+    fs.reset()
+    fs.merge({
+        "leaf": {"argv"},
+        # a <-> b cycle fed by leaf, c only reads the cycle
+        "a": {fs.ref("b"), fs.ref("leaf")},
+        "b": {fs.ref("a"), "env"},
+        "c": {fs.ref("a"), fs.ref("unknown")},
+    })
+
+    resolved, stats = fs.solve()
+
+    assert resolved == {
+        "leaf": {"argv"},
+        "a": {"argv", "env"},
+        "b": {"argv", "env"},
+        "c": {"argv", "env"},
+    }
+    assert stats["functions"] == 4
+    assert stats["components"] == 3
+    assert stats["largestComponent"] == 2
+    fs.reset()
@@ -0,0 +1,27 @@
+from backend.core.git import changed_files
+from backend.tests.conftest import git
+
+
+def test_changed_files_since_includes_untracked(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / ".gitignore").write_text("build/\n")
+    (repo / "old.py").write_text("x = 1\n")
+    (repo / "gone.py").write_text("y = 1\n")
+    git("init", "-q", cwd=repo)
+    git("add", ".", cwd=repo)
+    git("commit", "-q", "-m", "init", cwd=repo)
+
+    (repo / "old.py").write_text("x = 2\n")
+    (repo / "gone.py").unlink()
+    (repo / "new.py").write_text("z = 1\n")
+    (repo / "notes.txt").write_text("not python\n")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.py").write_text("ignored = 1\n")
+
+    since = changed_files(str(repo), since="HEAD")
+    assert since == [str(repo / "new.py"), str(repo / "old.py")]
+
+    # untracked files are never staged
+    git("add", "old.py", cwd=repo)
+    assert changed_files(str(repo), staged=True) == [str(repo / "old.py")]
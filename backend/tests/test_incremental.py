@@ -0,0 +1,71 @@
+from backend.agents.agent1_parser import CodeParsingAgent
+from backend.tests.conftest import USE, git, scan
+
+
+def relative(project, report):
+    prefix = str(project) + "/"
+    return [
+        {**f, "file": f["file"][len(prefix):]} for f in report["findings"]
+    ]
+
+
+def commit_all(project):
+    git("init", "-q", cwd=project)
+    git("add", ".", cwd=project)
+    git("commit", "-q", "-m", "init", cwd=project)
+
+
+def test_incremental_scope_follows_callers(project):
+    commit_all(project)
+    full = relative(project, scan(project))
+
+    # get_cmd / wrap are called from app.py and use.py
+    report = scan(project, files=[str(project / "pkg/helpers.py")])
+    assert report["metadata"]["incremental"] == {
+        "changedFiles": 1, "scannedFiles": 3, "summaryFiles": 0,
+    }
+    assert relative(project, report) == [
+        f for f in full if f["file"] in ("pkg/app.py", "pkg/use.py")
+    ]
+
+    report = scan(project, files=[str(project / "views/view_0.py")])
+    assert report["metadata"]["incremental"]["scannedFiles"] == 1
+    assert relative(project, report) == [
+        f for f in full if f["file"] == "views/view_0.py"
+    ]
+
+
+def test_incremental_scope_sees_untracked_callers(project):
+    commit_all(project)
+    (project / "pkg/extra.py").write_text(USE.replace("wrap", "get_cmd"))
+
+    report = scan(project, files=[str(project / "pkg/helpers.py")])
+
+    assert report["metadata"]["incremental"]["scannedFiles"] == 4
+    assert {f["file"] for f in relative(project, report)} >= {"pkg/extra.py"}
+
+
+def test_file_budget_drops_support_files_first(project):
+    commit_all(project)
+
+    # use.py calls wrap(), so helpers.py is parsed for its summary
+    report = scan(project, files=[str(project / "pkg/use.py")], max_files=1)
+
+    assert report["metadata"]["incremental"]["summaryFiles"] == 1
+    assert report["metadata"]["filesParsed"] == 1
+
+
+def test_incremental_scan_parses_each_file_once(project, monkeypatch):
+    commit_all(project)
+    parsed = []
+    parse_file = CodeParsingAgent.parse_file
+
+    def counting(self, path):
+        parsed.append(path)
+        return parse_file(self, path)
+
+    monkeypatch.setattr(CodeParsingAgent, "parse_file", counting)
+    scan(project, files=[str(project / "pkg/helpers.py")])
+
+    assert sorted(parsed) == sorted(set(parsed))
+    assert len(parsed) == 3
@@ -0,0 +1,56 @@
+from backend.agents.agent1_parser import CodeParsingAgent, ir_version, taint_vocabulary
+from backend.core.name_trie import DottedNameTrie
+
+SQL = '''\
+import os
+from flask import request
+
+def handler():
+    db.cursor.execute(request.args.get("q"))
+    os.system(request.form["cmd"])
+'''
+
+
+def test_forward_trie_takes_the_longest_prefix():
+    trie = DottedNameTrie(["request", "request.args", "os.environ"])
+
+    assert trie.match("request.args.get") == "request.args"
+    assert trie.match("request.form") == "request"
+    assert trie.match("os.environ") == "os.environ"
+    # matches end on component boundaries
+    assert trie.match("requests.get") is None
+    assert "os" not in trie
+
+
+def test_reverse_trie_takes_the_longest_suffix():
+    trie = DottedNameTrie(["execute", "cursor.execute", "os.system"], reverse=True)
+
+    assert trie.match("db.cursor.execute") == "cursor.execute"
+    assert trie.match("conn.execute") == "execute"
+    assert trie.match("x.os.system") == "os.system"
+    assert trie.match("system") is None
+    assert "executemany" not in trie
+
+
+def test_parser_tracks_the_sources_and_sinks_rules_declare(tmp_path):
+    rules = [
+        {"type": "taint", "sources": ["request.args"], "sinks": ["cursor.execute"]},
+        {"type": "semantic", "sinks": ["os.system"]},
+    ]
+    sources, sinks = taint_vocabulary(rules)
+    assert (sources, sinks) == (["request.args"], ["cursor.execute"])
+
+    path = tmp_path / "sql.py"
+    path.write_text(SQL)
+    ir = CodeParsingAgent(sources=sources, sinks=sinks).parse_file(str(path))
+
+    # the flow names the rule's sink; the call target is kept aside
+    assert ir["taint"]["flows"] == [{
+        "source": "request.args",
+        "sink": "cursor.execute",
+        "callee": "db.cursor.execute",
+        "line": 5,
+        "function": "handler",
+        "path": ["request.args", "db.cursor.execute"],
+    }]
+    assert ir_version(sources, sinks) != ir_version(sources, sinks + ["os.system"])
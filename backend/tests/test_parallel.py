@@ -0,0 +1,11 @@
+from backend.tests.conftest import scan
+
+
+def test_parallel_scan_matches_serial(project):
+    serial = scan(project, jobs=1)
+
+    parallel = scan(project, jobs=4)
+
+    assert list(parallel["findings"]) == list(serial["findings"])
+    assert parallel["summary"] == serial["summary"]
+    assert parallel["metadata"]["filesParsed"] == serial["metadata"]["filesParsed"] == 16
@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+from backend.agents.agent1_parser import CodeParsingAgent
+from backend.core.parse_cache import SIZE_FILE, ParseCache
+from backend.tests.conftest import scan
+
+
+def parse(project, cache):
+    parser = CodeParsingAgent(cache=cache)
+    results = parser.parse_paths(parser.discover(str(project)))
+    return results, parser.cache_stats
+
+
+def entry_bytes(cache_dir):
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(cache_dir)
+        for f in files if f.endswith(".json")
+    )
+
+
+def test_warm_scan_is_served_from_the_cache(project, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+
+    cold, stats = parse(project, ParseCache(cache_dir, "v1"))
+    assert stats["hits"] == 0 and stats["misses"] == len(cold)
+
+    warm, stats = parse(project, ParseCache(cache_dir, "v1"))
+    assert stats == {"hits": len(cold), "misses": 0, "bytesWritten": 0}
+    # entries are stored as JSON, so tuples come back as lists
+    assert warm == json.loads(json.dumps(cold))
+
+
+def test_version_change_misses(project, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    parse(project, ParseCache(cache_dir, "v1"))
+
+    _, stats = parse(project, ParseCache(cache_dir, "v2"))
+    assert stats["hits"] == 0
+
+
+def test_size_is_tracked_without_walking(project, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    parse(project, ParseCache(cache_dir, "v1"))
+
+    with open(os.path.join(cache_dir, SIZE_FILE)) as f:
+        assert int(f.read()) == entry_bytes(cache_dir)
+
+    def walk(*args, **kwargs):
+        raise AssertionError("a cache under max_bytes must not be walked")
+
+    monkeypatch.setattr(os, "walk", walk)
+    monkeypatch.setattr(CodeParsingAgent, "discover", lambda self, p: sorted(
+        str(p) + "/" + rel for rel in ("pkg/app.py", "pkg/use.py")
+    ))
+    _, stats = parse(project, ParseCache(cache_dir, "v1"))
+    assert stats["hits"] == 2
+
+
+def test_eviction_keeps_the_cache_under_max_bytes(project, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    _, stats = parse(project, ParseCache(cache_dir, "v1"))
+    limit = stats["bytesWritten"] // 2
+
+    parse(project, ParseCache(cache_dir, "v2", max_bytes=limit))
+
+    assert entry_bytes(cache_dir) <= limit
+    with open(os.path.join(cache_dir, SIZE_FILE)) as f:
+        assert int(f.read()) == entry_bytes(cache_dir)
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_warm_cache_scan_matches_cold(project, tmp_path, jobs):
+    cache_dir = str(tmp_path / "cache")
+
+    cold = scan(project, jobs=jobs, cache_dir=cache_dir)
+    warm = scan(project, jobs=jobs, cache_dir=cache_dir)
+
+    assert cold["metadata"]["parseCache"]["hits"] == 0
+    assert warm["metadata"]["parseCache"] == {"hits": 16, "misses": 0, "bytesWritten": 0}
+    assert list(warm["findings"]) == list(cold["findings"])
@@ -0,0 +1,81 @@
+from backend.agents.agent1_parser import CodeParsingAgent
+from backend.core.ast_matcher import arg_texts
+from backend.tests.conftest import scan
+
+NESTED = '''\
+import os
+from flask import request
+
+def handler():
+    q = request.args.get("q")
+    os.system(wrap(wrap(wrap("ls " + q + f"-{q}"))))
+    os.system(wrap(str(len("a" + "b" + "c"))))
+'''
+
+
+class Forgetful(dict):
+    """A taint memo that never remembers."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class UnmemoizedParser(CodeParsingAgent):
+    def reset(self):
+        super().reset()
+        self.taint_cache = Forgetful()
+
+
+def parse(parser, tmp_path, source):
+    path = tmp_path / "nested.py"
+    path.write_text(source)
+    return parser.parse_file(str(path))
+
+
+def test_taint_memo_keeps_the_ir(tmp_path):
+    parser = CodeParsingAgent()
+    memoized = parse(parser, tmp_path, NESTED)
+
+    assert parse(UnmemoizedParser(), tmp_path, NESTED) == memoized
+    assert memoized["taint"]["flows"]
+    # nested arguments are reached again by generic_visit and served
+    # from the memo
+    stats = parser.taint_stats
+    assert stats["hits"] > 0 and stats["misses"] > 0
+
+
+def test_taint_memo_counters_add_up_across_workers(project):
+    (project / "nested.py").write_text(NESTED)
+
+    serial = scan(project, jobs=1)["metadata"]["taintCache"]
+    parallel = scan(project, jobs=4)["metadata"]["taintCache"]
+
+    assert parallel == serial
+    assert serial["hitRate"] == round(serial["hits"] / (serial["hits"] + serial["misses"]), 3)
+    assert serial["hits"] > 0
+
+
+ARGS = '''\
+import requests
+
+def fetch(url, rest):
+    requests.get(url, "x", 3, b"b", os.sep, quote(url), *rest, verify=False, **opts)
+    requests.get(url, "x" * 2, timeout=None)
+'''
+
+
+def test_call_arguments_are_interned_records(tmp_path):
+    calls = parse(CodeParsingAgent(), tmp_path, ARGS)["calls"]
+    get = next(c for c in calls if c["callee"] == "requests.get")
+
+    assert get["args"] == [
+        ("name", "url"), ("const", "x"), ("const", 3), ("const", "b'b'"),
+        ("attr", "os.sep"), ("call", "quote"), ("starred", "rest"),
+    ]
+    assert get["keywords"] == [("verify", "const", False), (None, "name", "opts")]
+    assert arg_texts(get)[-2:] == ["verify=False", "opts"]
+    # repeated identifiers and callees share one object
+    again = [c for c in calls if c["callee"] == "requests.get"][1]
+    assert again["callee"] is get["callee"]
+    assert again["args"][0][1] is get["args"][0][1]
+    assert again["args"][1] == ("other", "BinOp")
@@ -0,0 +1,33 @@
+import ast
+
+from backend.core.pattern_matcher import PatternSet
+
+
+def matches(rule, source):
+    patterns = PatternSet([{"id": "r", **rule}])
+    assert patterns.errors == []
+    return [
+        (node.lineno, bindings)
+        for node in ast.walk(ast.parse(source))
+        for rule_id, bindings in patterns.match(node, [])
+    ]
+
+
+def test_metavariable_method_callee():
+    source = "obj.run(1)\nrun(2)\nclient.fetch(3)\n"
+
+    assert matches({"pattern": "$X.$M(...)"}, source) == [
+        (1, {"$M": "run", "$X": "obj"}),
+        (3, {"$M": "fetch", "$X": "client"}),
+    ]
+    assert matches({"pattern": "$X.run(...)"}, source) == [(1, {"$X": "obj"})]
+
+
+def test_keyword_alternative_on_a_non_call_match():
+    rule = {
+        "pattern": "$X = $Y",
+        "pattern-either": [{"pattern": "requests.get(..., verify=False)"}],
+    }
+
+    # used to raise AttributeError on the Assign node
+    assert matches(rule, "x = 1\n") == []
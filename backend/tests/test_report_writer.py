@@ -0,0 +1,58 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from backend.core.report_writer import ITEMS, open_artifact, write_document
+from backend.tests.conftest import scan
+
+
+def test_report_json_is_what_json_dump_writes(project, tmp_path):
+    output = tmp_path / "output"
+
+    scan(project, output_dir=str(output))
+
+    text = (output / "report.json").read_text()
+    assert text == json.dumps(json.loads(text), indent=2)
+    sarif = (output / "report.sarif").read_text()
+    assert sarif == json.dumps(json.loads(sarif), indent=2)
+
+
+@pytest.mark.parametrize("items", [[], [{"a": [1, {"b": None}]}, "x", 2.5]])
+def test_write_document_matches_json_dump(items):
+    document = {"head": {"n": 1}, "runs": [{"results": ITEMS, "tail": []}]}
+    expected = {"head": {"n": 1}, "runs": [{"results": items, "tail": []}]}
+
+    pretty, compact = io.StringIO(), io.StringIO()
+    write_document(pretty, document, iter(items))
+    write_document(compact, document, iter(items), compact=True)
+
+    assert pretty.getvalue() == json.dumps(expected, indent=2)
+    assert compact.getvalue() == json.dumps(expected, separators=(",", ":"))
+
+
+def test_compressed_artifact_round_trips(tmp_path):
+    document = {"findings": ITEMS}
+    items = [{"rule_id": "r", "line": n} for n in range(3)]
+    # the archive header holds the file name
+    paths = [str(tmp_path / run / "report.json.gz") for run in ("a", "b")]
+
+    for path in paths:
+        with open_artifact(path, compress=True) as f:
+            write_document(f, document, items)
+
+    with gzip.open(paths[0], "rt", encoding="utf-8") as f:
+        assert f.read() == json.dumps({"findings": items}, indent=2)
+    # mtime=0: the archives are identical
+    assert open(paths[0], "rb").read() == open(paths[1], "rb").read()
+
+
+def test_gzip_leaves_an_explicit_sarif_output_plain(project, tmp_path):
+    output, sarif = tmp_path / "output", tmp_path / "result.sarif"
+
+    scan(project, output_dir=str(output), sarif_path=str(sarif), compress=True)
+
+    assert json.loads(sarif.read_text())["runs"]
+    assert not (tmp_path / "result.sarif.gz").exists()
+    assert sorted(p.name for p in output.iterdir()) == ["dashboard.json.gz", "report.json.gz"]
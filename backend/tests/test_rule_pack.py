@@ -0,0 +1,40 @@
+from backend.core.rule_bundle import compile_rules, load_bundle
+from backend.tests.conftest import RULES_DIR
+
+
+def test_shipped_pack_compiles_without_errors(tmp_path):
+    bundle = str(tmp_path / "rules.bundle")
+
+    path, errors = compile_rules(RULES_DIR, bundle)
+
+    assert errors == []
+    pack = load_bundle(RULES_DIR, path)
+    assert pack is not None and pack["warnings"] == []
+
+
+def test_sequence_rule_supersedes_the_single_call_rule(project):
+    from backend.core.orchestrator import Orchestrator
+
+    result = Orchestrator(RULES_DIR, output_dir=None).run(str(project))
+
+    chmod = [
+        f["rule_id"] for f in result["report"]["findings"]
+        if f["file"].endswith("pkg/app.py") and f["line"] == 22
+    ]
+    assert chmod == ["python.semantic.permissions.world_writable_after_create"]
+    # and python.secret.key_literal on line 5, see test_secrets_engine
+    assert result["report"]["metadata"]["supersededFindings"] == 2
+
+
+def test_supersedes_must_name_a_known_rule(tmp_path):
+    rule = tmp_path / "rules" / "bad.yaml"
+    rule.parent.mkdir()
+    rule.write_text(
+        "schema_version: 1\nid: bad\ntype: semantic\ntitle: t\nseverity: low\n"
+        "description: d\nconfidence: 0.5\nsupersedes: [no.such.rule]\n"
+    )
+
+    path, errors = compile_rules(str(rule.parent), str(tmp_path / "rules.bundle"))
+
+    assert path is None
+    assert errors == ["bad: supersedes unknown rule 'no.such.rule'"]
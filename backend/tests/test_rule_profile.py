@@ -0,0 +1,36 @@
+from collections import Counter
+
+from backend.core.rule_profile import format_profile
+from backend.tests.conftest import scan
+
+
+def row(rule, seconds):
+    return {
+        "rule": rule, "engine": "taint", "evaluations": 1,
+        "matches": 0, "findings": 0, "seconds": seconds,
+    }
+
+
+def test_top_rows_show_their_share_of_all_rules():
+    rows = [row("a", 0.5), row("b", 0.3), row("c", 0.2)]
+
+    lines = format_profile(rows, top=1).splitlines()
+
+    assert len(lines) == 2
+    assert lines[1].split()[0] == "a"
+    assert lines[1].split()[-1] == "50.0"
+
+
+def test_scan_profile_counts_every_reported_finding(project):
+    assert "ruleProfile" not in scan(project)["metadata"]
+
+    report = scan(project, rule_profile=True)
+    rows = report["metadata"]["ruleProfile"]
+
+    reported = Counter(f["rule_id"] for f in report["findings"])
+    assert {r["rule"]: r["findings"] for r in rows if r["findings"]} == reported
+    assert [r["seconds"] for r in rows] == sorted((r["seconds"] for r in rows), reverse=True)
+    for r in rows:
+        assert r["engine"] in ("taint", "semantic", "pattern", "sequence", "secrets")
+        if r["engine"] in ("taint", "semantic", "secrets"):
+            assert r["evaluations"] >= r["matches"]
@@ -0,0 +1,24 @@
+from backend.bench import secrets_engine
+from backend.core.orchestrator import Orchestrator
+from backend.tests.conftest import RULES_DIR
+
+
+def test_fused_classification_matches_the_reference():
+    # run() raises when the fused scan and the reference disagree
+    result = secrets_engine.run(literals=3000, files=10)
+    assert result["packRules"] >= 1
+
+
+def test_key_literal_rule(project):
+    findings = Orchestrator(RULES_DIR, output_dir=None).run(str(project))["report"]["findings"]
+    hits = sorted(
+        (f["line"], f["rule_id"]) for f in findings
+        if f["file"].endswith("pkg/app.py") and f["cwe"] == "CWE-798"
+    )
+
+    # line 5 is an assignment, reported once by python.secret.hardcoded
+    assert hits == [
+        (5, "python.secret.hardcoded"),
+        (6, "python.secret.hardcoded"),
+        (25, "python.secret.key_literal"),
+    ]
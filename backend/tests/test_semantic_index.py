@@ -0,0 +1,49 @@
+import random
+
+from backend.agents.agent1_parser import CodeParsingAgent
+from backend.agents.agent2_semantic_ast import SemanticASTEngine
+from backend.core.aho_corasick import AhoCorasick
+from backend.core.ast_matcher import match_call
+from backend.rules.loader import load_all_rules
+from backend.tests.conftest import RULES_DIR
+
+
+def test_automaton_finds_every_occurrence():
+    # overlapping needles, a needle inside another, and a repeat
+    patterns = ["he", "she", "his", "hers", "e", "rs", "he"]
+    automaton = AhoCorasick(patterns)
+    rng = random.Random(0)
+
+    for _ in range(500):
+        text = "".join(rng.choice("ehirs") for _ in range(rng.randrange(12)))
+        assert automaton.find(text) == {
+            i for i, p in enumerate(patterns) if p in text
+        }
+
+
+def test_empty_needle_matches_every_text():
+    automaton = AhoCorasick(["", "x"])
+
+    assert automaton.find("") == {0}
+    assert automaton.find("axb") == {0, 1}
+
+
+def test_index_matches_like_match_call(project):
+    rules = [
+        r for r in load_all_rules(RULES_DIR)
+        if r.get("type") == "semantic" and r.get("match")
+    ]
+    engine = SemanticASTEngine(rules)
+    parser = CodeParsingAgent()
+    calls = [
+        call
+        for file in parser.parse_paths(parser.discover(str(project)))
+        for call in file["calls"]
+    ]
+
+    matched = 0
+    for call in calls:
+        expected = [i for i, r in enumerate(rules) if match_call(call, r["match"])]
+        assert engine._match(call) == expected
+        matched += bool(expected)
+    assert matched
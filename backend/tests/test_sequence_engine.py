@@ -0,0 +1,49 @@
+from backend.agents.agent1_parser import CodeParsingAgent
+from backend.agents.semantic_sequence_engine import SemanticSequenceEngine
+
+RULE = {
+    "id": "test.open_then_chmod",
+    "title": "t",
+    "severity": "high",
+    "description": "d",
+    "confidence": 0.9,
+    "sequence": [
+        {"callee": "open"},
+        "...",
+        {"callee": "os.chmod", "arg_value": 511},
+    ],
+}
+
+SAME_NAMES = '''\
+import os
+
+class Reader:
+    def save(self):
+        f = open("a")
+
+class Writer:
+    def save(self):
+        os.chmod("a", 0o777)
+
+def outer():
+    f = open("b")
+    def outer():
+        os.chmod("b", 0o777)
+
+def both():
+    f = open("c", "w")
+    os.chmod("c", 0o777)
+'''
+
+
+def findings(tmp_path, source):
+    path = tmp_path / "mod.py"
+    path.write_text(source)
+    parsed = CodeParsingAgent().parse_paths([str(path)])
+    return SemanticSequenceEngine([RULE]).analyze(parsed)
+
+
+def test_sequences_do_not_span_same_named_functions(tmp_path):
+    hits = findings(tmp_path, SAME_NAMES)
+
+    assert [(f["function"], f["line"]) for f in hits] == [("both", 18)]
@@ -0,0 +1,12 @@
+from backend.tests.conftest import scan
+
+
+def test_streaming_scan_matches_batch(project):
+    batch = scan(project)
+
+    for jobs in (1, 4):
+        streamed = scan(project, jobs=jobs, stream=True)
+
+        key = lambda f: (f["file"], f["line"], f["rule_id"])
+        assert sorted(streamed["findings"], key=key) == sorted(batch["findings"], key=key)
+        assert streamed["summary"] == batch["summary"]
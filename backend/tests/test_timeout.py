@@ -0,0 +1,34 @@
+import time
+
+from backend.agents.agent2_rules import RuleEngineAgent
+from backend.rules.loader import load_all_rules
+from backend.tests.conftest import RULES_DIR, scan
+
+
+def test_slow_file_is_skipped_with_partial_findings(project, monkeypatch):
+    full = scan(project)
+    taint_rules = {r["id"] for r in load_all_rules(RULES_DIR) if r.get("type") == "taint"}
+    app = str(project / "pkg/app.py")
+
+    analyze_file = RuleEngineAgent.analyze_file
+
+    def slow_on_app(self, file, deadline):
+        findings = analyze_file(self, file, deadline)
+        if file["filePath"] == app:
+            time.sleep(0.5)
+        return findings
+
+    monkeypatch.setattr(RuleEngineAgent, "analyze_file", slow_on_app)
+    report = scan(project, file_timeout=0.25)
+
+    assert report["metadata"]["skippedFiles"] == [{
+        "file": app,
+        "stage": "detect",
+        "reason": "detection exceeded 0.25s (in semantic)",
+    }]
+    assert "1 file(s) skipped after a deadline" in report["metadata"]["warnings"]
+    # the taint engine finished on app.py; every other file is complete
+    assert list(report["findings"]) == [
+        f for f in full["findings"]
+        if f["file"] != app or f["rule_id"] in taint_rules
+    ]
@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+from backend.tests.conftest import project_files, scan
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_trace_is_chrome_trace_json(project, tmp_path, jobs):
+    path = tmp_path / "trace.json"
+
+    scan(project, jobs=jobs, trace_path=str(path))
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    for event in events:
+        assert event["ph"] == "X"
+        assert isinstance(event["name"], str) and isinstance(event["cat"], str)
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        assert isinstance(event["pid"], int) and isinstance(event["tid"], int)
+
+    stages = {e["name"] for e in events if e["cat"] == "stage"}
+    assert {"discover", "parse", "summaries", "detect", "validate", "report"} <= stages
+    assert {e["name"] for e in events if e["cat"] == "engine"} == {
+        "taint", "semantic", "sequence", "secrets",
+    }
+    parsed = {e["args"]["file"] for e in events if e["name"] == "parse" and e["cat"] == "file"}
+    assert parsed == {str(project / rel) for rel in project_files()}
+    if jobs > 1:
+        # files parsed in the pool keep their worker's pid
+        assert os.getpid() not in {
+            e["pid"] for e in events if e["name"] == "parse" and e["cat"] == "file"
+        }
@@ -0,0 +1,50 @@
+import itertools
+
+from backend.agents.agent3a_validator import ReasoningAgent3A
+from backend.bench.validator import reference_validate
+from backend.core.finding_store import FindingStore
+from backend.rules.loader import load_all_rules
+from backend.tests.conftest import RULES_DIR
+
+EXTRA_RULES = [
+    # CWEs with a policy entry no shipped rule uses yet, and none
+    {"id": "x.cmd", "cwe": "CWE-77", "description": "Command", "confidence": 0.9},
+    {"id": "x.sql", "cwe": "CWE-89", "description": "SQL", "confidence": 0.9},
+    {"id": "x.xss", "cwe": "CWE-79", "description": "XSS", "confidence": 0.9},
+    {"id": "x.env", "cwe": "CWE-798", "description": "Secret from ENV var", "confidence": 0.9},
+    {"id": "x.none", "cwe": None, "description": "d", "confidence": 0.5},
+]
+
+
+def findings():
+    rules = load_all_rules(RULES_DIR) + EXTRA_RULES
+    out = []
+    combos = itertools.product(rules, (0.0, -0.05, -0.1), (None, "handler"), (1, 4, 5, 40))
+    for i, (rule, delta, function, line) in enumerate(combos):
+        out.append({
+            "rule_id": rule["id"],
+            "title": rule.get("title"),
+            "severity": rule.get("severity"),
+            "cwe": rule.get("cwe"),
+            "category": rule.get("category"),
+            # one file per finding so the store keeps them all
+            "file": f"app_{i}.py",
+            "line": line,
+            "function": function,
+            "description": rule.get("description"),
+            "confidence": round(rule["confidence"] + delta, 2),
+            "remediation": rule.get("remediation"),
+        })
+    return out
+
+
+def test_policy_table_scores_like_the_original_checks():
+    originals = findings()
+    expected = [reference_validate(f) for f in originals]
+
+    assert ReasoningAgent3A().validate(originals) == expected
+
+    store = FindingStore(len(originals))
+    store.extend(originals)
+    ReasoningAgent3A().validate_store(store)
+    assert list(store) == expected